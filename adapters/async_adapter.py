@@ -0,0 +1,132 @@
+# adapters/async_adapter.py
+
+import asyncio
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from tenacity import AsyncRetrying
+from adapters.common_adapter import (
+    DEFAULT_CONCURRENCY_PER_HOST, RETRY_POLICY, SessionManager, send_request, propagate_context
+)
+
+
+class AsyncRequestEngine:
+    """
+    Asyncio counterpart of `make_request` that runs many requests concurrently while
+    keeping at most `concurrency_per_host` of them in flight against any one host.
+
+    Requests are sent over the same pooled sessions as `make_request` and follow the same
+    retry policy and error mapping (`APIConnectionError`, `APITimeoutError`). The engine's
+    per-host limit keeps waiting requests off the worker threads; the shared limit applied by
+    `send_request` (HTTP_CONCURRENCY_PER_HOST) still caps the total across the whole process.
+    """
+
+    def __init__(self, concurrency_per_host=DEFAULT_CONCURRENCY_PER_HOST, max_workers=32):
+        self.concurrency_per_host = concurrency_per_host
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='async-request')
+        # Semaphores are bound to the event loop they are first used on, so keep one set per loop
+        self._semaphores = weakref.WeakKeyDictionary()
+
+    def _semaphore(self, url):
+        loop = asyncio.get_running_loop()
+        per_host = self._semaphores.setdefault(loop, {})
+        key = SessionManager.host_key(url)
+        if key not in per_host:
+            per_host[key] = asyncio.Semaphore(self.concurrency_per_host)
+        return per_host[key]
+
+    async def _send(self, method, url, headers=None, params=None, data=None):
+        async with self._semaphore(url):
+            loop = asyncio.get_running_loop()
+            # Executor threads do not inherit context variables; carry the job deadline over
+            call = partial(propagate_context(send_request), method, url, headers=headers, params=params, data=data)
+            return await loop.run_in_executor(self._executor, call)
+
+    async def request(self, method, url, headers=None, params=None, data=None):
+        """
+        Makes an HTTP request without blocking the event loop.
+        A host slot is held only while the request is on the wire, not during retry waits.
+        As with `make_request`, the number of attempts used is recorded as `attempts` on the
+        returned response (or on the raised exception).
+
+        Parameters:
+            method (str): HTTP method ('GET', 'POST', etc.)
+            url (str): API endpoint URL.
+            headers (dict): HTTP headers.
+            params (dict): Query parameters.
+            data (dict): Request body for POST/PUT requests.
+
+        Returns:
+            response: The full HTTP response object.
+        """
+        retrying = AsyncRetrying(**RETRY_POLICY)
+        try:
+            response = await retrying(self._send, method, url, headers=headers, params=params, data=data)
+        except Exception as err:
+            err.attempts = retrying.statistics.get('attempt_number', 1)
+            raise
+        response.attempts = retrying.statistics.get('attempt_number', 1)
+        return response
+
+    async def gather(self, request_specs, return_exceptions=True):
+        """
+        Runs a batch of requests concurrently.
+
+        Parameters:
+            request_specs (list): Dicts of `request` keyword arguments (method, url, headers, params, data).
+            return_exceptions (bool): If True, failed requests yield their exception in place of a response.
+
+        Returns:
+            list: Responses (or exceptions) in the same order as `request_specs`.
+        """
+        tasks = [self.request(**spec) for spec in request_specs]
+        return await asyncio.gather(*tasks, return_exceptions=return_exceptions)
+
+    def close(self):
+        """
+        Shuts down the worker threads used to send requests.
+        """
+        self._executor.shutdown(wait=True)
+
+
+# Shared engine used by `make_request_async`
+default_engine = AsyncRequestEngine()
+
+async def make_request_async(method, url, headers=None, params=None, data=None):
+    """
+    Async counterpart of `make_request` using the shared engine.
+
+    Returns:
+        response: The full HTTP response object.
+    """
+    return await default_engine.request(method, url, headers=headers, params=params, data=data)
+
+
+def make_requests(request_specs, concurrency_per_host=None, return_exceptions=True):
+    """
+    Sync wrapper that sends a batch of requests concurrently and waits for all of them.
+    Lets the existing synchronous adapters and orchestrator functions opt in to concurrency
+    without becoming async themselves. Must not be called from inside a running event loop.
+
+    Parameters:
+        request_specs (list): Dicts of `make_request` keyword arguments (method, url, headers, params, data).
+        concurrency_per_host (int): Optional per-host limit. Defaults to HTTP_CONCURRENCY_PER_HOST.
+        return_exceptions (bool): If True, failed requests yield their exception in place of a response.
+            If False, the first failure is raised.
+
+    Returns:
+        list: Responses (or exceptions) in the same order as `request_specs`.
+    """
+    request_specs = list(request_specs)
+    if not request_specs:
+        return []
+
+    if concurrency_per_host is None:
+        return asyncio.run(default_engine.gather(request_specs, return_exceptions=return_exceptions))
+
+    engine = AsyncRequestEngine(concurrency_per_host=concurrency_per_host)
+    try:
+        return asyncio.run(engine.gather(request_specs, return_exceptions=return_exceptions))
+    finally:
+        engine.close()
+
@@ -1,8 +1,33 @@
 # adapters/common_adapter.py
 
+import os
+import threading
+import time
+import contextvars
 import requests
 import logging
-from tenacity import retry, stop_after_attempt, wait_fixed, retry_if_exception_type
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+from requests.adapters import HTTPAdapter
+from tenacity import Retrying, stop_after_attempt, wait_fixed, retry_if_exception_type
+from adapters.rate_limiter import TokenBucket, DEFAULT_RATE, MIN_RATE
+
+# Number of keep-alive connections each per-host session keeps open
+DEFAULT_POOL_SIZE = int(os.getenv('HTTP_POOL_SIZE', '10'))
+
+# Maximum number of requests in flight against a single host, across all threads
+DEFAULT_CONCURRENCY_PER_HOST = int(os.getenv('HTTP_CONCURRENCY_PER_HOST', '8'))
+
+# Seconds to wait for a connection to be established and for the server to send data
+CONNECT_TIMEOUT = float(os.getenv('HTTP_CONNECT_TIMEOUT', '5'))
+READ_TIMEOUT = float(os.getenv('HTTP_READ_TIMEOUT', '30'))
+
+# Hedged requests: a duplicate of a slow idempotent GET is sent once the first one has taken
+# longer than the host's p95 latency (measured over recent requests)
+HEDGE_ENABLED = os.getenv('HTTP_HEDGE_ENABLED', 'false').lower() in ('1', 'true', 'yes')
+HEDGE_MIN_SAMPLES = 20
 
 # Custom exception classes for more granular error handling
 class APIConnectionError(Exception):
@@ -11,35 +36,653 @@ class APIConnectionError(Exception):
 class APITimeoutError(Exception):
     pass
 
-# Generic retry configuration
-@retry(stop=stop_after_attempt(3), wait=wait_fixed(2), retry=retry_if_exception_type((requests.exceptions.ConnectionError, requests.exceptions.Timeout)))
-def make_request(method, url, headers=None, params=None, data=None):
+class APIRateLimitError(Exception):
     """
-    Makes a generic HTTP request with retries and error handling.
-    
+    Raised on HTTP 429. `retry_after` holds the host's Retry-After in seconds, if it sent one.
+    """
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+class CircuitOpenError(APIConnectionError):
+    """
+    Raised without sending the request while the circuit of the target host is open.
+    """
+    pass
+
+class DeadlineExceededError(APITimeoutError):
+    """
+    Raised when the job deadline set with `job_deadline` has passed. Never retried.
+    """
+    pass
+
+
+# Absolute `time.monotonic()` deadline of the current sync job, or None
+_job_deadline = contextvars.ContextVar('job_deadline', default=None)
+
+@contextmanager
+def job_deadline(seconds):
+    """
+    Sets a deadline for every request made inside the block, including requests made from
+    worker threads started with `propagate_context`. Request timeouts are shortened to the
+    time left, and once it is used up requests fail with `DeadlineExceededError` instead of
+    being sent or retried. A nested deadline can only shorten the outer one.
+
+    Parameters:
+        seconds (float): Time budget of the job. None leaves the current deadline unchanged.
+    """
+    if seconds is None:
+        yield
+        return
+    deadline = time.monotonic() + seconds
+    outer = _job_deadline.get()
+    token = _job_deadline.set(min(deadline, outer) if outer is not None else deadline)
+    try:
+        yield
+    finally:
+        _job_deadline.reset(token)
+
+def remaining_time():
+    """
+    Returns the seconds left until the job deadline, or None if no deadline is set.
+    """
+    deadline = _job_deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+def propagate_context(fn):
+    """
+    Wraps `fn` so it runs with the caller's context variables (such as the job deadline) when
+    it is handed to a thread pool. Worker threads do not inherit them otherwise.
+    """
+    context = contextvars.copy_context()
+    def run(*args, **kwargs):
+        return context.copy().run(fn, *args, **kwargs)
+    return run
+
+def request_timeout():
+    """
+    Returns the (connect, read) timeout for the next request, shortened to the job deadline.
+    """
+    remaining = remaining_time()
+    if remaining is None:
+        return (CONNECT_TIMEOUT, READ_TIMEOUT)
+    if remaining <= 0:
+        raise DeadlineExceededError("Job deadline exceeded.")
+    return (min(CONNECT_TIMEOUT, remaining), min(READ_TIMEOUT, remaining))
+
+
+class SessionManager:
+    """
+    Keeps one pooled, keep-alive `requests.Session` per host so that repeated
+    calls to the same API reuse TCP/TLS connections instead of opening a new
+    one for every request.
+    """
+
+    def __init__(self, pool_size=DEFAULT_POOL_SIZE):
+        self.pool_size = pool_size
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def host_key(url):
+        """
+        Returns the scheme and host part of a URL, used as the session key.
+        """
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc}".lower()
+
+    def get_session(self, url):
+        """
+        Returns the pooled session for the host of `url`, creating it on first use.
+
+        Parameters:
+            url (str): Any URL on the target host.
+
+        Returns:
+            requests.Session: Session with a connection pool of `pool_size` connections.
+        """
+        key = self.host_key(url)
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                self._sessions[key] = session
+                logging.debug(f"Created pooled HTTP session for {key} (pool size {self.pool_size}).")
+            return session
+
+    def configure(self, pool_size):
+        """
+        Changes the pool size. Existing sessions are closed so the new size applies to all hosts.
+        """
+        self.close_all()
+        self.pool_size = pool_size
+
+    def close_all(self):
+        """
+        Closes every pooled session and releases their connections.
+        """
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+
+# Shared session manager used by all adapters
+session_manager = SessionManager()
+
+def get_session(url):
+    """
+    Returns the shared pooled session for the host of `url`.
+    """
+    return session_manager.get_session(url)
+
+def configure_pool_size(pool_size):
+    """
+    Sets the number of pooled connections kept per host.
+    """
+    session_manager.configure(pool_size)
+
+def close_sessions():
+    """
+    Closes all pooled sessions.
+    """
+    session_manager.close_all()
+
+
+class HostConcurrencyLimiter:
+    """
+    Caps the number of requests in flight against each host across all threads. Every request
+    sent by `send_request` holds a slot of its host while it is on the wire, so the worker
+    pools of the concurrent fetchers and exporters together never exceed `limit` requests per
+    host. Keep the limit at or below `HTTP_POOL_SIZE` so every request gets a pooled connection.
+    """
+
+    def __init__(self, limit=DEFAULT_CONCURRENCY_PER_HOST):
+        self.limit = limit
+        self._semaphores = {}
+        self._lock = threading.Lock()
+
+    def _semaphore(self, url):
+        key = SessionManager.host_key(url)
+        with self._lock:
+            semaphore = self._semaphores.get(key)
+            if semaphore is None:
+                semaphore = self._semaphores[key] = threading.BoundedSemaphore(self.limit)
+            return semaphore
+
+    @contextmanager
+    def slot(self, url):
+        """
+        Holds one request slot of the host of `url` for the duration of the block. Waiting for
+        a slot stops at the job deadline with `DeadlineExceededError`.
+        """
+        semaphore = self._semaphore(url)
+        remaining = remaining_time()
+        if remaining is None:
+            semaphore.acquire()
+        elif remaining <= 0 or not semaphore.acquire(timeout=remaining):
+            raise DeadlineExceededError("Job deadline exceeded while waiting for a request slot.")
+        try:
+            yield
+        finally:
+            semaphore.release()
+
+    def configure(self, limit):
+        """
+        Changes the per-host limit. Applies to hosts first used after the change.
+        """
+        with self._lock:
+            self.limit = limit
+            self._semaphores.clear()
+
+
+# Shared per-host limit applied to every request sent by `send_request`
+host_limiter = HostConcurrencyLimiter()
+
+def configure_concurrency_per_host(limit):
+    """
+    Sets the maximum number of requests in flight against a single host.
+    """
+    host_limiter.configure(limit)
+
+
+# Circuit breaker: consecutive failures (connection errors, timeouts, 5xx) that open a host's
+# circuit, and seconds it stays open before a single probe request is let through
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv('HTTP_CIRCUIT_FAILURES', '5'))
+CIRCUIT_RESET_SECONDS = float(os.getenv('HTTP_CIRCUIT_RESET_SECONDS', '30'))
+
+# Retry budget: every request earns RETRY_BUDGET_RATIO retries for its host, up to
+# RETRY_BUDGET_MIN banked retries (which is also the starting balance)
+RETRY_BUDGET_RATIO = float(os.getenv('HTTP_RETRY_BUDGET_RATIO', '0.2'))
+RETRY_BUDGET_MIN = float(os.getenv('HTTP_RETRY_BUDGET_MIN', '10'))
+
+
+class CircuitBreaker:
+    """
+    Per-host circuit breaker shared by all adapters.
+
+    After `failure_threshold` consecutive failures the host's circuit opens and requests fail
+    immediately with `CircuitOpenError` instead of waiting on a platform that is down. After
+    `reset_timeout` seconds one probe request is allowed (half-open): success closes the circuit,
+    failure opens it again for another `reset_timeout`.
+    """
+
+    def __init__(self, failure_threshold=CIRCUIT_FAILURE_THRESHOLD, reset_timeout=CIRCUIT_RESET_SECONDS):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._circuits = {}
+        self._lock = threading.Lock()
+
+    def _circuit(self, key):
+        return self._circuits.setdefault(key, {'state': 'closed', 'failures': 0, 'opened_at': 0.0, 'probing': False})
+
+    def before_request(self, url):
+        """
+        Raises `CircuitOpenError` if requests to the host of `url` must not be sent now.
+        """
+        key = SessionManager.host_key(url)
+        with self._lock:
+            circuit = self._circuit(key)
+            if circuit['state'] == 'closed':
+                return
+            retry_in = circuit['opened_at'] + self.reset_timeout - time.monotonic()
+            if circuit['state'] == 'open' and retry_in <= 0:
+                circuit['state'] = 'half_open'
+            if circuit['state'] == 'half_open' and not circuit['probing']:
+                circuit['probing'] = True
+                logging.info(f"Circuit for {key} is half-open. Sending a probe request.")
+                return
+        error = CircuitOpenError(f"Circuit for {key} is open; failing fast" + (f" for another {retry_in:.0f}s." if retry_in > 0 else "."))
+        error.url = url
+        raise error
+
+    def record_success(self, url):
+        key = SessionManager.host_key(url)
+        with self._lock:
+            circuit = self._circuit(key)
+            if circuit['state'] != 'closed':
+                logging.info(f"Circuit for {key} closed again.")
+            circuit.update(state='closed', failures=0, probing=False)
+
+    def record_failure(self, url):
+        key = SessionManager.host_key(url)
+        with self._lock:
+            circuit = self._circuit(key)
+            circuit['failures'] += 1
+            if circuit['state'] == 'half_open' or circuit['failures'] >= self.failure_threshold:
+                if circuit['state'] != 'open':
+                    logging.error(f"Circuit for {key} opened after {circuit['failures']} consecutive failures.")
+                circuit.update(state='open', opened_at=time.monotonic(), probing=False)
+
+    def release_probe(self, url):
+        """
+        Ends a half-open probe that was not sent (e.g. cut off by the job deadline) without
+        counting it as a success or failure, so the next request can probe the host.
+        """
+        key = SessionManager.host_key(url)
+        with self._lock:
+            self._circuit(key)['probing'] = False
+
+    def states(self):
+        """
+        Returns the circuit state ('closed', 'open' or 'half_open') per host.
+        """
+        with self._lock:
+            return {key: circuit['state'] for key, circuit in self._circuits.items()}
+
+    def reset(self):
+        with self._lock:
+            self._circuits.clear()
+
+
+class RetryBudget:
+    """
+    Caps retries per host at a fraction of the requests sent to it. Each request deposits
+    `ratio` tokens and each retry spends one, with at most `min_retries` tokens banked. During
+    an outage retries therefore stop after the banked tokens are used instead of multiplying
+    the load on the failing host.
+    """
+
+    def __init__(self, ratio=RETRY_BUDGET_RATIO, min_retries=RETRY_BUDGET_MIN):
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self._tokens = {}
+        self._exhausted = {}
+        self._lock = threading.Lock()
+
+    def record_request(self, url):
+        key = SessionManager.host_key(url)
+        with self._lock:
+            self._tokens[key] = min(self.min_retries, self._tokens.get(key, self.min_retries) + self.ratio)
+
+    def try_spend(self, url):
+        """
+        Takes one retry from the host's budget.
+
+        Returns:
+            bool: False if the budget is exhausted and the request must not be retried.
+        """
+        key = SessionManager.host_key(url)
+        with self._lock:
+            tokens = self._tokens.get(key, self.min_retries)
+            if tokens < 1:
+                self._exhausted[key] = self._exhausted.get(key, 0) + 1
+                return False
+            self._tokens[key] = tokens - 1
+            return True
+
+    def metrics(self):
+        """
+        Returns the banked retries and the number of denied retries per host.
+        """
+        with self._lock:
+            return {key: {'tokens': round(tokens, 2), 'denied': self._exhausted.get(key, 0)}
+                    for key, tokens in self._tokens.items()}
+
+    def reset(self):
+        with self._lock:
+            self._tokens.clear()
+            self._exhausted.clear()
+
+
+# Shared breaker and retry budget used by `send_request` and the retry policy
+circuit_breaker = CircuitBreaker()
+retry_budget = RetryBudget()
+
+
+class RateLimiter:
+    """
+    Keeps one adaptive `TokenBucket` per host, shared by every adapter that sends requests
+    through `send_request`.
+    """
+
+    def __init__(self, default_rate=DEFAULT_RATE, min_rate=MIN_RATE):
+        self.default_rate = default_rate or None
+        self.min_rate = min_rate
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, url):
+        key = SessionManager.host_key(url)
+        with self._lock:
+            if key not in self._buckets:
+                self._buckets[key] = TokenBucket(self.default_rate, self.min_rate)
+            return self._buckets[key]
+
+    def acquire(self, url):
+        """
+        Waits for a send slot on the host of `url`, but never past the job deadline.
+        Raises `DeadlineExceededError` at once if the host's Retry-After pause or the next
+        token is further away than the time left.
+
+        Returns:
+            float: Seconds spent waiting.
+        """
+        remaining = remaining_time()
+        try:
+            return self.bucket(url).acquire(max_wait=None if remaining is None else max(0, remaining))
+        except TimeoutError as err:
+            raise DeadlineExceededError(
+                f"Job deadline exceeded while rate limited by {SessionManager.host_key(url)}: {err}"
+            ) from err
+
+    def observe(self, url, response):
+        """
+        Feeds a response back into the bucket of its host.
+
+        Returns:
+            float: Retry-After seconds if the host throttled the request, else None.
+        """
+        status_code = getattr(response, 'status_code', None)
+        if not isinstance(status_code, int):
+            return None
+        retry_after = self.bucket(url).observe(status_code, getattr(response, 'headers', None))
+        if status_code == 429:
+            bucket = self.bucket(url)
+            logging.warning(f"Rate limited by {SessionManager.host_key(url)}: slowing down to {bucket.rate:.2f} requests/s"
+                            + (f" after waiting {retry_after:.1f}s." if retry_after is not None else "."))
+        return retry_after
+
+    def metrics(self):
+        """
+        Returns the current rate (requests/s, None if unlimited), request count, number of
+        throttled responses and total wait time per host.
+        """
+        with self._lock:
+            buckets = dict(self._buckets)
+        return {key: bucket.metrics() for key, bucket in buckets.items()}
+
+    def reset(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+# Shared limiter used by `send_request`
+rate_limiter = RateLimiter()
+
+
+# Attempts allowed for rate-limited requests. The rate limiter already paused the host for
+# the Retry-After period, so these retries do not add a wait of their own.
+RATE_LIMIT_ATTEMPTS = int(os.getenv('HTTP_RATE_LIMIT_ATTEMPTS', '5'))
+
+_stop_after_errors = stop_after_attempt(3)
+_stop_after_rate_limits = stop_after_attempt(RATE_LIMIT_ATTEMPTS)
+_wait_after_errors = wait_fixed(2)
+
+def _stop(retry_state):
+    remaining = remaining_time()
+    if remaining is not None and remaining <= 0:
+        return True
+    if isinstance(retry_state.outcome.exception(), APIRateLimitError):
+        return _stop_after_rate_limits(retry_state)
+    return _stop_after_errors(retry_state)
+
+def _wait(retry_state):
+    if isinstance(retry_state.outcome.exception(), APIRateLimitError):
+        return 0
+    remaining = remaining_time()
+    wait_seconds = _wait_after_errors(retry_state)
+    # Do not sleep past the job deadline
+    return wait_seconds if remaining is None else max(0, min(wait_seconds, remaining))
+
+_retryable_error = retry_if_exception_type((APIConnectionError, APITimeoutError, APIRateLimitError))
+
+def _retry(retry_state):
+    """
+    Retries mapped transport errors and 429s, except when the host's circuit is open or its
+    retry budget is exhausted. Rate-limited retries are paced by the rate limiter and do not
+    spend the budget.
+    """
+    if not _retryable_error(retry_state):
+        return False
+    error = retry_state.outcome.exception()
+    if isinstance(error, (CircuitOpenError, DeadlineExceededError)):
+        return False
+    if isinstance(error, APIRateLimitError) or _stop(retry_state):
+        # A stopped retry is re-raised by the stop condition without spending the budget
+        return True
+    url = getattr(error, 'url', None)
+    if url and not retry_budget.try_spend(url):
+        logging.warning(f"Retry budget for {SessionManager.host_key(url)} exhausted. Not retrying.")
+        return False
+    return True
+
+# Generic retry configuration, shared by the sync and async request paths.
+# Retries are keyed on the mapped exceptions raised by `send_request`, and the last
+# error is re-raised as-is once attempts are exhausted.
+RETRY_POLICY = dict(
+    stop=_stop,
+    wait=_wait,
+    retry=_retry,
+    reraise=True,
+)
+
+def get_rate_limit_metrics():
+    """
+    Returns the adaptive rate limiter's metrics per host: current rate in requests/s (None
+    while unlimited), requests sent, throttled responses and seconds spent waiting.
+    """
+    return rate_limiter.metrics()
+
+def get_circuit_states():
+    """
+    Returns the circuit breaker state per host ('closed', 'open' or 'half_open').
+    """
+    return circuit_breaker.states()
+
+class LatencyTracker:
+    """
+    Keeps the latency of the last `window` successful requests per host to estimate the p95
+    used as the hedging delay.
+    """
+
+    def __init__(self, window=200):
+        self.window = window
+        self._latencies = {}
+        self._lock = threading.Lock()
+
+    def record(self, url, seconds):
+        key = SessionManager.host_key(url)
+        with self._lock:
+            self._latencies.setdefault(key, deque(maxlen=self.window)).append(seconds)
+
+    def p95(self, url):
+        """
+        Returns the host's p95 latency in seconds, or None until HEDGE_MIN_SAMPLES requests were seen.
+        """
+        key = SessionManager.host_key(url)
+        with self._lock:
+            samples = sorted(self._latencies.get(key, ()))
+        if len(samples) < HEDGE_MIN_SAMPLES:
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+
+
+latency_tracker = LatencyTracker()
+_hedge_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix='hedged-request')
+
+def _mapped_error(error_class, message, url):
+    error = error_class(message)
+    error.url = url
+    return error
+
+def send_request(method, url, headers=None, params=None, data=None):
+    """
+    Sends a single HTTP request over the pooled session for the target host, without retries.
+    Connect/read timeouts apply, shortened to the job deadline if one is set.
+    At most HTTP_CONCURRENCY_PER_HOST requests are in flight against a host at any time.
+    The request waits for the host's adaptive rate limiter, and the response is fed back to it.
+    While the host's circuit is open, `CircuitOpenError` is raised without sending anything.
+    Transport errors are mapped to `APIConnectionError` and `APITimeoutError`, HTTP 429 to
+    `APIRateLimitError`.
+
     Parameters:
         method (str): HTTP method ('GET', 'POST', etc.)
         url (str): API endpoint URL.
         headers (dict): HTTP headers.
         params (dict): Query parameters.
         data (dict): Request body for POST/PUT requests.
-    
+
     Returns:
         response: The full HTTP response object.
     """
+    circuit_breaker.before_request(url)
+    retry_budget.record_request(url)
     try:
-        response = requests.request(method, url, headers=headers, params=params, json=data)
+        with host_limiter.slot(url):
+            rate_limiter.acquire(url)
+            started = time.monotonic()
+            response = get_session(url).request(method, url, headers=headers, params=params, json=data, timeout=request_timeout())
+        retry_after = rate_limiter.observe(url, response)
+        latency_tracker.record(url, time.monotonic() - started)
+        if isinstance(response.status_code, int) and response.status_code >= 500:
+            circuit_breaker.record_failure(url)
+        else:
+            circuit_breaker.record_success(url)
+        if response.status_code == 429:
+            raise APIRateLimitError(f"Rate limited by {SessionManager.host_key(url)}.", retry_after=retry_after)
         response.raise_for_status()
         return response  # Return the full response object
+    except APIRateLimitError as rate_err:
+        logging.warning(f"Rate limit error occurred: {rate_err}")
+        rate_err.url = url
+        raise
+    except DeadlineExceededError as deadline_err:
+        logging.error(f"Request to {url} not sent: {deadline_err}")
+        # Says nothing about the host's health, but must not leave a half-open probe pending
+        circuit_breaker.release_probe(url)
+        raise
     except requests.exceptions.HTTPError as http_err:
         logging.error(f"HTTP error occurred: {http_err}")
         raise
     except requests.exceptions.ConnectionError as conn_err:
         logging.error(f"Connection error occurred: {conn_err}")
-        raise APIConnectionError("Failed to establish a new connection.")
+        circuit_breaker.record_failure(url)
+        raise _mapped_error(APIConnectionError, "Failed to establish a new connection.", url)
     except requests.exceptions.Timeout as timeout_err:
         logging.error(f"Timeout error occurred: {timeout_err}")
-        raise APITimeoutError("Request timed out.")
+        circuit_breaker.record_failure(url)
+        raise _mapped_error(APITimeoutError, "Request timed out.", url)
     except Exception as err:
         logging.error(f"An unexpected error occurred: {err}")
+        # Also ends a half-open probe that failed in an unexpected way
+        circuit_breaker.record_failure(url)
+        raise
+
+def _send_hedged(method, url, headers=None, params=None, data=None):
+    """
+    Sends a request and, if it has not completed within the host's p95 latency, a duplicate.
+    Returns the first successful response; an error is raised only when both attempts failed.
+    """
+    delay = latency_tracker.p95(url)
+    send = propagate_context(send_request)
+    if delay is None:
+        return send(method, url, headers=headers, params=params, data=data)
+
+    primary = _hedge_executor.submit(send, method, url, headers=headers, params=params, data=data)
+    done, _ = wait([primary], timeout=delay)
+    if done:
+        return primary.result()
+
+    logging.info(f"Request to {url} slower than p95 ({delay:.2f}s). Sending a hedged duplicate.")
+    pending = {primary, _hedge_executor.submit(send, method, url, headers=headers, params=params, data=data)}
+    error = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                return future.result()
+            error = future.exception()
+    raise error
+
+def make_request(method, url, headers=None, params=None, data=None, hedge=False):
+    """
+    Makes a generic HTTP request with retries and error handling.
+    The request is sent over the pooled keep-alive session for the target host.
+    The number of attempts used is recorded as `attempts` on the returned response
+    (or on the raised exception).
+    
+    Parameters:
+        method (str): HTTP method ('GET', 'POST', etc.)
+        url (str): API endpoint URL.
+        headers (dict): HTTP headers.
+        params (dict): Query parameters.
+        data (dict): Request body for POST/PUT requests.
+        hedge (bool): Marks an idempotent GET (e.g. a page fetch) that may be hedged: when
+            HTTP_HEDGE_ENABLED is set, a duplicate is sent if it runs past the host's p95 latency.
+    
+    Returns:
+        response: The full HTTP response object.
+    """
+    sender = _send_hedged if hedge and HEDGE_ENABLED and method.upper() == 'GET' else send_request
+    retrying = Retrying(**RETRY_POLICY)
+    try:
+        response = retrying(sender, method, url, headers=headers, params=params, data=data)
+    except Exception as err:
+        err.attempts = retrying.statistics.get('attempt_number', 1)
         raise
+    response.attempts = retrying.statistics.get('attempt_number', 1)
+    return response
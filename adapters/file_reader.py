@@ -0,0 +1,249 @@
+# adapters/file_reader.py
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import pandas as pd
+from openpyxl import load_workbook
+
+# Directory and size budget of the columnar cache of spreadsheet inputs
+FILE_CACHE_DIR = os.getenv('FILE_CACHE_DIR', '.file_cache')
+FILE_CACHE_MAX_BYTES = int(os.getenv('FILE_CACHE_MAX_BYTES', str(1024 ** 3)))
+
+try:
+    import pyarrow  # noqa: F401  Feather support is optional
+    FEATHER_AVAILABLE = True
+except ImportError:
+    FEATHER_AVAILABLE = False
+
+
+def _read_source(path, **reader_kwargs):
+    """
+    Reads an .xlsx or .csv file with pandas, the slow path the cache sits in front of.
+    """
+    if str(path).lower().endswith('.csv'):
+        return pd.read_csv(path, **reader_kwargs)
+    return pd.read_excel(path, engine='openpyxl', **reader_kwargs)
+
+
+class FileCache:
+    """
+    Read-through cache that stores parsed spreadsheet inputs as columnar files.
+
+    The first read of a file parses it with pandas and saves the result as Feather (when
+    pyarrow is installed) or as a pandas pickle. Later reads of the same content are served
+    from that file. Entries are keyed by path, mtime and a SHA-256 of the content: an unchanged
+    path/mtime/size skips hashing, and a touched but identical file still hits by hash. The
+    least recently used entries are evicted once the cache exceeds `max_bytes`.
+    """
+
+    def __init__(self, cache_dir=FILE_CACHE_DIR, max_bytes=FILE_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.index_file = os.path.join(cache_dir, 'index.json')
+        self._lock = threading.Lock()
+
+    def read(self, path, **reader_kwargs):
+        """
+        Returns the DataFrame for `path`, served from the cache when the content is unchanged.
+
+        Parameters:
+            path (str): Path to the .xlsx or .csv file.
+            **reader_kwargs: Extra arguments for the pandas reader; they are part of the cache key.
+
+        Returns:
+            pandas.DataFrame: Parsed file content.
+        """
+        if not os.path.isfile(path):
+            # Let the reader raise its usual error for missing files
+            return _read_source(path, **reader_kwargs)
+
+        with self._lock:
+            try:
+                index = self._load_index()
+                key = self._entry_key(path, index, reader_kwargs)
+                entry = index.get(key)
+                if entry and os.path.exists(os.path.join(self.cache_dir, entry['file'])):
+                    df = self._load_entry(entry)
+                    entry.update(self._stat_fields(path), last_used=time.time())
+                    self._save_index(index)
+                    logging.info(f"Served '{path}' from the columnar cache.")
+                    return df
+            except Exception as err:
+                logging.warning(f"Columnar cache lookup failed for '{path}', reading the file directly: {err}")
+                return _read_source(path, **reader_kwargs)
+
+            df = _read_source(path, **reader_kwargs)
+            try:
+                index[key] = self._store_entry(key, path, df)
+                self._evict(index)
+                self._save_index(index)
+            except Exception as err:
+                logging.warning(f"Could not cache '{path}': {err}")
+            return df
+
+    def clear(self):
+        """
+        Removes every cached entry.
+        """
+        with self._lock:
+            index = self._load_index()
+            for entry in index.values():
+                self._remove_file(entry['file'])
+            self._save_index({})
+
+    @staticmethod
+    def _stat_fields(path):
+        stat = os.stat(path)
+        return {'path': os.path.abspath(path), 'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+
+    def _entry_key(self, path, index, reader_kwargs):
+        """
+        Returns the cache key (content hash plus reader options), reusing the stored hash when
+        path, mtime and size are unchanged.
+        """
+        options = hashlib.sha256(json.dumps(reader_kwargs, sort_keys=True, default=str).encode('utf-8')).hexdigest()[:12]
+        stat_fields = self._stat_fields(path)
+        for key, entry in index.items():
+            if key.endswith(options) and all(entry.get(name) == value for name, value in stat_fields.items()):
+                return key
+        return f"{self._content_hash(path)}-{options}"
+
+    @staticmethod
+    def _content_hash(path):
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _store_entry(self, key, path, df):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        file_name = None
+        if FEATHER_AVAILABLE:
+            try:
+                file_name = f"{key}.feather"
+                df.reset_index(drop=True).to_feather(os.path.join(self.cache_dir, f"{file_name}.tmp"))
+            except Exception as err:
+                # Mixed-type object columns cannot be written as Arrow; fall back to a pickle
+                logging.debug(f"Feather write failed for '{path}', using pickle: {err}")
+                self._remove_file(f"{file_name}.tmp")
+                file_name = None
+        if file_name is None:
+            file_name = f"{key}.pkl"
+            df.to_pickle(os.path.join(self.cache_dir, f"{file_name}.tmp"), compression=None)
+        os.replace(os.path.join(self.cache_dir, f"{file_name}.tmp"), os.path.join(self.cache_dir, file_name))
+
+        entry = {'file': file_name, 'bytes': os.path.getsize(os.path.join(self.cache_dir, file_name)), 'last_used': time.time()}
+        entry.update(self._stat_fields(path))
+        logging.info(f"Cached '{path}' as {file_name}.")
+        return entry
+
+    def _load_entry(self, entry):
+        file_path = os.path.join(self.cache_dir, entry['file'])
+        if entry['file'].endswith('.feather'):
+            return pd.read_feather(file_path)
+        return pd.read_pickle(file_path, compression=None)
+
+    def _evict(self, index):
+        """
+        Drops least recently used entries until the cache fits in `max_bytes`.
+        """
+        total = sum(entry['bytes'] for entry in index.values())
+        for key in sorted(index, key=lambda k: index[k]['last_used']):
+            if total <= self.max_bytes or len(index) == 1:
+                break
+            total -= index[key]['bytes']
+            self._remove_file(index.pop(key)['file'])
+            logging.info(f"Evicted cache entry {key}.")
+
+    def _remove_file(self, file_name):
+        try:
+            os.remove(os.path.join(self.cache_dir, file_name))
+        except FileNotFoundError:
+            pass
+
+    def _load_index(self):
+        if not os.path.exists(self.index_file):
+            return {}
+        with open(self.index_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _save_index(self, index):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_file = f"{self.index_file}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(index, f)
+        os.replace(tmp_file, self.index_file)
+
+
+# Shared cache used by the file adapters
+file_cache = FileCache()
+
+def read_tabular(path, use_cache=True, **reader_kwargs):
+    """
+    Reads an .xlsx or .csv file, served from the columnar cache when enabled.
+
+    Parameters:
+        path (str): Path to the .xlsx or .csv file.
+        use_cache (bool): If False, always parse the file with pandas.
+        **reader_kwargs: Extra arguments for `pd.read_excel` / `pd.read_csv`.
+
+    Returns:
+        pandas.DataFrame: Parsed file content.
+    """
+    if not use_cache:
+        return _read_source(path, **reader_kwargs)
+    return file_cache.read(path, **reader_kwargs)
+
+
+def iter_excel_chunks(path, columns=None, chunk_size=10000, sheet_name=None, normalize=None):
+    """
+    Streams an Excel worksheet as DataFrame chunks using openpyxl's read-only mode, so the
+    workbook is never fully loaded and memory stays bounded by `chunk_size` rows.
+
+    Parameters:
+        path (str): Path to the .xlsx file.
+        columns (list): Header names to keep, in output order. Cells of other columns are skipped.
+            Requested columns missing from the sheet are logged and left out. Default keeps all columns.
+        chunk_size (int): Number of rows per yielded DataFrame.
+        sheet_name (str): Worksheet to read. Defaults to the active sheet.
+        normalize (callable): Optional function applied to header names before matching and used
+            as the output column names (e.g. `normalize_column_name`).
+
+    Yields:
+        pandas.DataFrame: Up to `chunk_size` rows with the selected columns.
+    """
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        worksheet = workbook[sheet_name] if sheet_name else workbook.active
+        rows = worksheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+
+        names = [normalize(str(name)) if normalize else name for name in header]
+        if columns is None:
+            selected = [(i, name) for i, name in enumerate(names) if name is not None]
+        else:
+            positions = {name: i for i, name in enumerate(names)}
+            missing = [name for name in columns if name not in positions]
+            if missing:
+                logging.warning(f"Columns not found in '{path}': {missing}")
+            selected = [(positions[name], name) for name in columns if name in positions]
+
+        indices = [i for i, _ in selected]
+        output_columns = [name for _, name in selected]
+        buffered = []
+        for row in rows:
+            buffered.append([row[i] if i < len(row) else None for i in indices])
+            if len(buffered) >= chunk_size:
+                yield pd.DataFrame(buffered, columns=output_columns)
+                buffered = []
+        if buffered:
+            yield pd.DataFrame(buffered, columns=output_columns)
+    finally:
+        workbook.close()
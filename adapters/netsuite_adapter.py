@@ -1,24 +1,254 @@
 import pandas as pd
 import logging
 import os
+import json
+import shutil
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from dotenv import load_dotenv
-from tenacity import retry, stop_after_attempt, wait_fixed, retry_if_exception_type
-from adapters.common_adapter import make_request  # Import shared request function
+from adapters.common_adapter import make_request, propagate_context  # Import shared request function
+from adapters.file_reader import read_tabular, iter_excel_chunks
 
 # Load environment variables
 load_dotenv()
 
-@retry(stop=stop_after_attempt(3), wait=wait_fixed(2), retry=retry_if_exception_type(Exception))
-def fetch_netsuite_products(api_url=None):
+# Number of items requested per NetSuite page
+PAGE_SIZE = 1000
+
+# Default number of pages fetched concurrently in parallel pagination mode
+DEFAULT_MAX_IN_FLIGHT = int(os.getenv('NETSUITE_MAX_IN_FLIGHT', '4'))
+
+# Datetime format NetSuite expects in record queries (matches the account's date/time preference)
+NETSUITE_DATETIME_FORMAT = os.getenv('NETSUITE_DATETIME_FORMAT', '%m/%d/%Y %I:%M %p')
+
+class NetSuiteAPIError(Exception):
+    """Raised when NetSuite products cannot be fetched."""
+    pass
+
+
+class NetSuitePageError(NetSuiteAPIError):
+    """Raised when a NetSuite page request returns no usable response."""
+    pass
+
+
+def modified_since_query(modified_since):
+    """
+    Builds the NetSuite record query selecting items modified on or after `modified_since`.
+
+    Parameters:
+        modified_since (datetime): Lower bound for lastModifiedDate. Timezone-aware values are
+            converted to local time before formatting.
+
+    Returns:
+        str: Value for the 'q' query parameter.
+    """
+    if modified_since.tzinfo is not None:
+        modified_since = modified_since.astimezone()
+    return f'lastModifiedDate ON_OR_AFTER "{modified_since.strftime(NETSUITE_DATETIME_FORMAT)}"'
+
+
+def _fetch_page(api_url, headers, offset, limit=PAGE_SIZE, query=None, suiteql=None):
+    """
+    Fetches a single page of the NetSuite item collection, or of a SuiteQL result set.
+
+    Parameters:
+        api_url (str): NetSuite collection endpoint.
+        headers (dict): HTTP headers including authorization.
+        offset (int): Offset of the first item on the page.
+        limit (int): Number of items per page.
+        query (str): Optional NetSuite record query ('q' parameter) filtering the collection.
+        suiteql (str): Optional SuiteQL statement. If set, the page is requested by POSTing the
+            statement to the SuiteQL endpoint `api_url`.
+
+    Returns:
+        dict: Parsed JSON page with 'items' and the paging metadata ('hasMore', 'totalResults', ...).
+    """
+    params = {"limit": limit, "offset": offset}
+    if query:
+        params["q"] = query
+    if suiteql:
+        response = make_request("POST", api_url, headers=headers, params=params, data={"q": suiteql})
+    else:
+        response = make_request("GET", api_url, headers=headers, params=params, hedge=True)
+
+    # Check for NoneType and error response handling
+    if response is None:
+        raise NetSuitePageError(f"Request to NetSuite failed: No response received for {api_url}.")
+
+    # Check if the response status code is a success
+    if response.status_code != 200:
+        raise NetSuitePageError(f"Failed to fetch products from NetSuite. Status code: {response.status_code}, Response: {response.text}")
+
+    return response.json()
+
+
+class PaginationCheckpoint:
+    """
+    Keeps the NetSuite pages fetched so far on disk, one JSON file per page, so that a
+    crashed or failed fetch can continue where it stopped instead of starting from offset 0.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.state_file = os.path.join(directory, 'state.json')
+
+    def _page_file(self, offset):
+        return os.path.join(self.directory, f"page_{offset:010d}.json")
+
+    def open(self, api_url, limit):
+        """
+        Prepares the checkpoint for a fetch of `api_url` with page size `limit`.
+        Pages saved by an earlier run of a different query are discarded.
+
+        Returns:
+            set: Offsets of the pages already on disk.
+        """
+        state = {}
+        if os.path.exists(self.state_file):
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+
+        if state.get('api_url') != api_url or state.get('limit') != limit:
+            self.clear()
+            os.makedirs(self.directory, exist_ok=True)
+            self._write_json(self.state_file, {'api_url': api_url, 'limit': limit})
+            return set()
+
+        offsets = {
+            int(name[len('page_'):-len('.json')])
+            for name in os.listdir(self.directory)
+            if name.startswith('page_') and name.endswith('.json')
+        }
+        if offsets:
+            logging.info(f"Resuming NetSuite fetch from checkpoint with {len(offsets)} saved pages.")
+        return offsets
+
+    def save_page(self, offset, page):
+        """
+        Persists one fetched page (items plus paging metadata).
+        """
+        self._write_json(self._page_file(offset), {
+            'offset': offset,
+            'hasMore': page.get('hasMore'),
+            'totalResults': page.get('totalResults'),
+            'items': page.get('items', []),
+        })
+
+    def load_page(self, offset):
+        """
+        Loads a saved page in the same shape as a NetSuite response page.
+        """
+        with open(self._page_file(offset), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def clear(self):
+        """
+        Removes the checkpoint after a completed fetch.
+        """
+        if os.path.isdir(self.directory):
+            shutil.rmtree(self.directory)
+
+    @staticmethod
+    def _write_json(path, payload):
+        # Write to a temporary file first so a crash never leaves a half-written page behind
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f)
+        os.replace(tmp_path, path)
+
+
+def _iter_pages(api_url, headers, limit=PAGE_SIZE, parallel=False, max_in_flight=DEFAULT_MAX_IN_FLIGHT, checkpoint=None, query=None, suiteql=None):
+    """
+    Yields (offset, items) for every non-empty page of the NetSuite collection (or of the
+    SuiteQL result set if `suiteql` is given), in offset order.
+
+    Each page is requested on its own, so a failure only costs the retries `make_request`
+    spends on that offset. Pages already saved in `checkpoint` are read from disk instead of
+    being fetched again, and newly fetched pages are saved as they arrive.
+    """
+    checkpoint_key = f"{api_url}?q={query or suiteql}" if (query or suiteql) else api_url
+    saved_offsets = checkpoint.open(checkpoint_key, limit) if checkpoint else set()
+
+    def load_or_fetch(offset):
+        if offset in saved_offsets:
+            return checkpoint.load_page(offset)
+        page = _fetch_page(api_url, headers, offset, limit, query, suiteql)
+        if checkpoint and page.get('items'):
+            checkpoint.save_page(offset, page)
+        return page
+
+    offset = 0
+    if parallel:
+        # Carry the caller's job deadline into the worker threads
+        load_or_fetch = propagate_context(load_or_fetch)
+        first_page = load_or_fetch(0)
+        if not first_page.get('items'):
+            return
+        yield 0, first_page['items']
+        offset = limit
+
+        total = first_page.get('totalResults')
+        if not first_page.get('hasMore'):
+            return
+
+        if total is not None:
+            # Fan the remaining offsets out over the worker pool, keeping at most
+            # `max_in_flight` pages outstanding and handing them back in offset order
+            offsets = iter(range(limit, total, limit))
+            last_page = first_page
+            with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+                pending = deque((o, executor.submit(load_or_fetch, o)) for o in islice(offsets, max_in_flight))
+                while pending:
+                    page_offset, future = pending.popleft()
+                    last_page = future.result()
+                    next_offset = next(offsets, None)
+                    if next_offset is not None:
+                        pending.append((next_offset, executor.submit(load_or_fetch, next_offset)))
+                    offset = page_offset + limit
+                    if last_page.get('items'):
+                        yield page_offset, last_page['items']
+
+            # Items added after the first response show up as extra pages; pick them up sequentially
+            if not last_page.get('hasMore'):
+                return
+
+    # Walk the collection one page at a time until an empty page
+    while True:
+        page = load_or_fetch(offset)
+        items = page.get('items', [])
+
+        # If there are no products, break out of the loop (end of pagination)
+        if not items:
+            break
+
+        yield offset, items
+        offset += limit  # Increment the offset for pagination
+
+
+def fetch_netsuite_products(api_url=None, parallel=False, max_in_flight=DEFAULT_MAX_IN_FLIGHT, checkpoint_dir=None, modified_since=None,
+                            raise_errors=False):
     """
     Fetches product information from NetSuite using REST API.
+
+    Pagination is resumable: each page is retried on its own, and with `checkpoint_dir` set the
+    fetched pages are kept on disk so a crashed or failed run continues from the failed offset.
     
     Parameters:
         api_url (str): Optional parameter for specifying a different API endpoint. If not provided, will use default URL.
+        parallel (bool): If True, use the first page's totalResults/hasMore metadata to fetch the
+            remaining pages concurrently instead of one after another.
+        max_in_flight (int): Maximum number of pages fetched at the same time in parallel mode.
+        checkpoint_dir (str): Optional directory for the pagination checkpoint. It is removed once
+            all pages have been fetched.
+        modified_since (datetime): If set, only fetch items whose lastModifiedDate is on or after this time.
+        raise_errors (bool): If True, a failed fetch raises `NetSuiteAPIError` instead of returning an
+            empty DataFrame, so an empty result always means that no item matched.
     
     Returns:
         pandas.DataFrame: DataFrame containing product data from NetSuite.
     """
+    checkpoint = PaginationCheckpoint(checkpoint_dir) if checkpoint_dir else None
     try:
         # Use default API URL if not provided
         if not api_url:
@@ -27,6 +257,8 @@ def fetch_netsuite_products(api_url=None):
         # Retrieve access token from environment variables
         access_token = os.getenv('NETSUITE_ACCESS_TOKEN')
         if not access_token:
+            if raise_errors:
+                raise NetSuiteAPIError("NetSuite access token not found. Please set NETSUITE_ACCESS_TOKEN in .env.")
             logging.error("NetSuite access token not found. Please set NETSUITE_ACCESS_TOKEN in .env.")
             return pd.DataFrame()
 
@@ -36,77 +268,267 @@ def fetch_netsuite_products(api_url=None):
             "Accept": "application/json"
         }
 
-        params = {"limit": 1000, "offset": 0}
-        all_products = []
-
-        while True:
-            # Make the request using shared `make_request` function
-            response = make_request("GET", api_url, headers=headers, params=params)
-
-            # Check for NoneType and error response handling
-            if response is None:
-                logging.error(f"Request to NetSuite failed: No response received for {api_url}.")
-                return pd.DataFrame()
+        query = modified_since_query(modified_since) if modified_since else None
 
-            # Check if the response status code is a success
-            if response.status_code != 200:
-                logging.error(f"Failed to fetch products from NetSuite. Status code: {response.status_code}, Response: {response.text}")
-                return pd.DataFrame()  # Return empty DataFrame on failure
-
-            # Parse JSON data from the response
-            data = response.json()
-            products = data.get('items', [])
-            
-            # If there are no products, break out of the loop (end of pagination)
-            if not products:
-                break
+        all_products = []
+        for _, items in _iter_pages(api_url, headers, PAGE_SIZE, parallel, max_in_flight, checkpoint, query):
+            all_products.extend(items)
 
-            # Append the fetched products to the overall list
-            all_products.extend(products)
-            params['offset'] += params['limit']  # Increment the offset for pagination
+        if checkpoint:
+            checkpoint.clear()
 
         # Convert the accumulated products into a DataFrame
         df = pd.DataFrame(all_products)
         logging.info(f"Fetched {len(df)} products from NetSuite via API.")
         return df
 
+    except NetSuiteAPIError as err:
+        logging.error(str(err))
+        _log_checkpoint_kept(checkpoint)
+        if raise_errors:
+            raise
+        return pd.DataFrame()  # Return empty DataFrame on failure
     except Exception as err:
         logging.error(f"An unexpected error occurred while fetching NetSuite products: {err}")
+        _log_checkpoint_kept(checkpoint)
+        if raise_errors:
+            raise NetSuiteAPIError(f"Fetching NetSuite products failed: {err}") from err
+        return pd.DataFrame()
+
+
+def _log_checkpoint_kept(checkpoint):
+    if checkpoint:
+        logging.info(f"Fetched NetSuite pages are kept in '{checkpoint.directory}'. Re-run to resume from the failed offset.")
+
+
+# Numeric NetSuite fields converted when building product frames
+NUMERIC_PRODUCT_FIELDS = {'variant price': 'float64', 'inventory_qty': 'float64'}
+
+def _to_product_frame(items):
+    """
+    Builds a typed product DataFrame from a list of NetSuite items.
+    Numeric fields are parsed so every chunk carries the same dtypes.
+    """
+    df = pd.DataFrame(items)
+    for column, dtype in NUMERIC_PRODUCT_FIELDS.items():
+        if column in df.columns:
+            df[column] = pd.to_numeric(df[column], errors='coerce').astype(dtype)
+    return df
+
+
+def iter_netsuite_product_chunks(api_url=None, chunk_size=PAGE_SIZE, parallel=False, max_in_flight=DEFAULT_MAX_IN_FLIGHT, checkpoint_dir=None, modified_since=None):
+    """
+    Streams product information from NetSuite as a sequence of typed DataFrames, so large
+    catalogs can be mapped and exported with bounded memory instead of as one big frame.
+
+    Parameters:
+        api_url (str): Optional parameter for specifying a different API endpoint. If not provided, will use default URL.
+        chunk_size (int): Minimum number of products per yielded DataFrame. Pages are grouped until
+            the chunk holds at least this many rows; the last chunk may be smaller.
+        parallel (bool): If True, fetch pages concurrently (see `fetch_netsuite_products`).
+        max_in_flight (int): Maximum number of pages fetched at the same time in parallel mode.
+        checkpoint_dir (str): Optional directory for the pagination checkpoint.
+        modified_since (datetime): If set, only stream items whose lastModifiedDate is on or after this time.
+
+    Yields:
+        pandas.DataFrame: Chunk of product data from NetSuite.
+
+    Raises:
+        NetSuitePageError: If a page cannot be fetched. Chunks yielded before the failure are complete.
+    """
+    if not api_url:
+        api_url = "https://<ACCOUNT_ID>.suitetalk.api.netsuite.com/services/rest/record/v1/item"
+
+    access_token = os.getenv('NETSUITE_ACCESS_TOKEN')
+    if not access_token:
+        logging.error("NetSuite access token not found. Please set NETSUITE_ACCESS_TOKEN in .env.")
+        return
+
+    headers = {
+        "Authorization": f"Bearer {access_token}",
+        "Content-Type": "application/json",
+        "Accept": "application/json"
+    }
+
+    checkpoint = PaginationCheckpoint(checkpoint_dir) if checkpoint_dir else None
+    query = modified_since_query(modified_since) if modified_since else None
+    buffered = []
+    total = 0
+    try:
+        for _, items in _iter_pages(api_url, headers, PAGE_SIZE, parallel, max_in_flight, checkpoint, query):
+            buffered.extend(items)
+            if len(buffered) >= chunk_size:
+                total += len(buffered)
+                chunk, buffered = _to_product_frame(buffered), []
+                yield chunk
+        if buffered:
+            total += len(buffered)
+            yield _to_product_frame(buffered)
+    except Exception as err:
+        logging.error(f"An error occurred while streaming NetSuite products after {total} rows: {err}")
+        _log_checkpoint_kept(checkpoint)
+        raise
+
+    if checkpoint:
+        checkpoint.clear()
+    logging.info(f"Streamed {total} products from NetSuite via API.")
+
+
+# SuiteQL projection: output column (as read by data_mapping.netsuite_mapping) -> SuiteQL expression.
+# Only these columns are selected, so each bulk page carries just the fields the mapping uses.
+SUITEQL_COLUMNS = {
+    'title': 'item.displayname',
+    'description': 'item.salesdescription',
+    'vendor': 'item.vendorname',
+    'variant sku': 'item.itemid',
+    'variant price': 'item.baseprice',
+    'inventory_qty': 'item.totalquantityonhand',
+    'barcode': 'item.upccode',
+}
+
+def build_suiteql_query(columns=None, modified_since=None):
+    """
+    Builds the SuiteQL statement selecting the projected item columns.
+
+    Parameters:
+        columns (dict): Output column -> SuiteQL expression. Defaults to SUITEQL_COLUMNS.
+        modified_since (datetime): If set, only select items modified on or after this time.
+
+    Returns:
+        str: SuiteQL statement ordered by item id so offset paging is stable.
+    """
+    columns = columns or SUITEQL_COLUMNS
+    select_list = ", ".join(f"{expression} AS {_suiteql_alias(name)}" for name, expression in columns.items())
+    statement = f"SELECT {select_list} FROM item"
+    if modified_since:
+        if modified_since.tzinfo is not None:
+            modified_since = modified_since.astimezone()
+        statement += f" WHERE item.lastmodifieddate >= TO_DATE('{modified_since.strftime('%Y-%m-%d %H:%M:%S')}', 'YYYY-MM-DD HH24:MI:SS')"
+    return statement + " ORDER BY item.id"
+
+
+def _suiteql_alias(column):
+    # SuiteQL aliases cannot contain spaces and come back lower-cased
+    return column.lower().replace(' ', '_')
+
+
+def fetch_netsuite_products_suiteql(api_url=None, columns=None, parallel=False, max_in_flight=DEFAULT_MAX_IN_FLIGHT, checkpoint_dir=None, modified_since=None):
+    """
+    Fetches product information from NetSuite with a paged SuiteQL query. Unlike the REST item
+    collection, which only returns item links, each SuiteQL page carries the projected fields
+    for up to 1000 items, so no follow-up request per item is needed.
+
+    Parameters:
+        api_url (str): Optional SuiteQL endpoint. If not provided, will use default URL.
+        columns (dict): Output column -> SuiteQL expression. Defaults to SUITEQL_COLUMNS.
+        parallel (bool): If True, fetch the remaining pages concurrently (see `fetch_netsuite_products`).
+        max_in_flight (int): Maximum number of pages fetched at the same time in parallel mode.
+        checkpoint_dir (str): Optional directory for the pagination checkpoint.
+        modified_since (datetime): If set, only fetch items modified on or after this time.
+
+    Returns:
+        pandas.DataFrame: DataFrame with one column per projected field, named as in `columns`.
+    """
+    checkpoint = PaginationCheckpoint(checkpoint_dir) if checkpoint_dir else None
+    try:
+        # Use default API URL if not provided
+        if not api_url:
+            api_url = "https://<ACCOUNT_ID>.suitetalk.api.netsuite.com/services/rest/query/v1/suiteql"
+
+        # Retrieve access token from environment variables
+        access_token = os.getenv('NETSUITE_ACCESS_TOKEN')
+        if not access_token:
+            logging.error("NetSuite access token not found. Please set NETSUITE_ACCESS_TOKEN in .env.")
+            return pd.DataFrame()
+
+        headers = {
+            "Authorization": f"Bearer {access_token}",
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+            "Prefer": "transient"  # Required by the SuiteQL endpoint
+        }
+
+        columns = columns or SUITEQL_COLUMNS
+        statement = build_suiteql_query(columns, modified_since)
+        aliases = {_suiteql_alias(name): name for name in columns}
+
+        all_rows = []
+        for _, items in _iter_pages(api_url, headers, PAGE_SIZE, parallel, max_in_flight, checkpoint, suiteql=statement):
+            all_rows.extend(items)
+
+        if checkpoint:
+            checkpoint.clear()
+
+        # Rename aliases back to the mapping's column names and drop the per-row 'links'
+        df = pd.DataFrame(all_rows).drop(columns=['links'], errors='ignore').rename(columns=aliases)
+        df = _to_product_frame(df.reindex(columns=list(columns)))
+        logging.info(f"Fetched {len(df)} products from NetSuite via SuiteQL.")
+        return df
+
+    except NetSuitePageError as err:
+        logging.error(str(err))
+        _log_checkpoint_kept(checkpoint)
+        return pd.DataFrame()  # Return empty DataFrame on failure
+    except Exception as err:
+        logging.error(f"An unexpected error occurred while fetching NetSuite products via SuiteQL: {err}")
+        _log_checkpoint_kept(checkpoint)
         return pd.DataFrame()
 
 
-def fetch_netsuite_data_from_file(file='Test Shopify Sheet.xlsx'):
+# Columns read by the streaming file reader: the ones this adapter cleans plus the product
+# fields used by the mappings downstream
+NETSUITE_FILE_COLUMNS = [
+    'Handle', 'Title', 'Body (HTML)', 'Vendor', 'Type', 'Tags', 'Variant SKU', 'Variant Price',
+    'Variant Inventory Qty', 'Variant Barcode', 'Image Src',
+]
+
+def _clean_netsuite_file_frame(output_df):
+    """
+    Applies the type conversions and defaults for NetSuite product rows read from a file.
+
+    Parameters:
+        output_df (pandas.DataFrame): Raw rows from the file.
+
+    Returns:
+        pandas.DataFrame: Cleaned DataFrame.
+    """
+    # Ensure 'Variant Price' is numeric
+    output_df['Variant Price'] = pd.to_numeric(output_df['Variant Price'], errors='coerce')
+
+    # Ensure key columns are of correct data types
+    output_df['Variant SKU'] = output_df['Variant SKU'].astype(str)
+    output_df['Title'] = output_df['Title'].astype(str)
+    output_df['Body (HTML)'] = output_df['Body (HTML)'].astype(str)
+
+    # Handle missing data by dropping rows without essential columns
+    output_df.dropna(subset=['Variant SKU', 'Title'], inplace=True)
+    
+    # Fill missing values with default entries
+    output_df['Variant Price'] = output_df['Variant Price'].fillna(0)
+    output_df['Body (HTML)'] = output_df['Body (HTML)'].fillna('')
+
+    # Reset index for the cleaned DataFrame
+    output_df.reset_index(drop=True, inplace=True)
+    return output_df
+
+
+def fetch_netsuite_data_from_file(file='Test Shopify Sheet.xlsx', use_cache=True):
     """
     Reads NetSuite product data from an Excel file for offline testing.
     
     Parameters:
         file (str): Path to the Excel file containing the NetSuite data.
+        use_cache (bool): If True, serve unchanged files from the columnar cache instead of re-parsing them.
     
     Returns:
         pandas.DataFrame: DataFrame containing the cleaned and formatted product data.
     """
     try:
         # Read data from the Excel file
-        output_df = pd.read_excel(file, engine='openpyxl')
+        output_df = read_tabular(file, use_cache=use_cache)
         logging.info(f"Data successfully read from {file}")
-        
-        # Ensure 'Variant Price' is numeric
-        output_df['Variant Price'] = pd.to_numeric(output_df['Variant Price'], errors='coerce')
-
-        # Ensure key columns are of correct data types
-        output_df['Variant SKU'] = output_df['Variant SKU'].astype(str)
-        output_df['Title'] = output_df['Title'].astype(str)
-        output_df['Body (HTML)'] = output_df['Body (HTML)'].astype(str)
 
-        # Handle missing data by dropping rows without essential columns
-        output_df.dropna(subset=['Variant SKU', 'Title'], inplace=True)
-        
-        # Fill missing values with default entries
-        output_df['Variant Price'] = output_df['Variant Price'].fillna(0)
-        output_df['Body (HTML)'] = output_df['Body (HTML)'].fillna('')
-
-        # Reset index for the cleaned DataFrame
-        output_df.reset_index(drop=True, inplace=True)
+        output_df = _clean_netsuite_file_frame(output_df)
 
         logging.info(f"Data processed successfully from {file}.")
         return output_df
@@ -117,3 +539,24 @@ def fetch_netsuite_data_from_file(file='Test Shopify Sheet.xlsx'):
     except Exception as e:
         logging.error(f"An error occurred while processing '{file}': {e}")
         return pd.DataFrame()
+
+
+def iter_netsuite_data_chunks_from_file(file='Test Shopify Sheet.xlsx', chunk_size=10000, columns=NETSUITE_FILE_COLUMNS):
+    """
+    Streams NetSuite product data from an Excel file as cleaned DataFrame chunks with a fixed
+    memory ceiling. The workbook is read in openpyxl read-only mode and only `columns` are materialized.
+
+    Parameters:
+        file (str): Path to the Excel file containing the NetSuite data.
+        chunk_size (int): Number of rows per yielded DataFrame.
+        columns (list): Column names to read. None reads every column.
+
+    Yields:
+        pandas.DataFrame: Cleaned chunk, processed the same way as `fetch_netsuite_data_from_file`.
+    """
+    rows = 0
+    for chunk in iter_excel_chunks(file, columns=columns, chunk_size=chunk_size):
+        chunk = _clean_netsuite_file_frame(chunk)
+        rows += len(chunk)
+        yield chunk
+    logging.info(f"Streamed {rows} NetSuite rows from {file}.")
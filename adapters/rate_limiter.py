@@ -0,0 +1,170 @@
+# adapters/rate_limiter.py
+
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import Mapping
+from email.utils import parsedate_to_datetime
+
+# Starting send rate per host in requests per second; 0 means unlimited until the host pushes back
+DEFAULT_RATE = float(os.getenv('HTTP_RATE_LIMIT_DEFAULT', '0'))
+MIN_RATE = float(os.getenv('HTTP_RATE_LIMIT_MIN', '0.5'))
+
+# AIMD tuning: additive increase per successful request, multiplicative decrease on throttling
+ADDITIVE_INCREASE = 0.1
+DECREASE_FACTOR = 0.5
+
+# Fraction of the rate advertised by rate-limit headers to actually use
+HEADROOM = 0.9
+
+
+def _parse_retry_after(value):
+    """
+    Returns the Retry-After header value in seconds (it is either a number of seconds or an HTTP date).
+    """
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _header_float(headers, *names):
+    for name in names:
+        value = headers.get(name)
+        if value is not None:
+            try:
+                return float(value)
+            except ValueError:
+                return None
+    return None
+
+
+class TokenBucket:
+    """
+    Token bucket for one host whose rate adapts to the host's feedback:
+
+    - every successful request raises the rate by ADDITIVE_INCREASE,
+    - a 429 (or a nearly exhausted quota) cuts it by DECREASE_FACTOR and pauses
+      all senders for the Retry-After period,
+    - explicit quota headers (remaining calls and reset time) set the rate to what is left
+      of the window, with HEADROOM.
+
+    A rate of None means unlimited; the first throttling signal sets it from the recent send rate.
+    """
+
+    def __init__(self, rate=None, min_rate=MIN_RATE):
+        self.rate = rate
+        self.min_rate = min_rate
+        self.tokens = 1.0
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.requests = 0
+        self.throttled = 0
+        self.waited_seconds = 0.0
+        self._recent = deque(maxlen=50)
+        self._lock = threading.Lock()
+
+    def acquire(self, max_wait=None):
+        """
+        Blocks until the host may receive another request.
+
+        Parameters:
+            max_wait (float): Longest total wait allowed, e.g. the time left until the job deadline.
+                If the host's pause or the next token needs longer, `TimeoutError` is raised at
+                once instead of sleeping. None waits as long as needed.
+
+        Returns:
+            float: Seconds spent waiting.
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                wait = self.paused_until - now
+                if wait <= 0 and self.rate is not None:
+                    # Allow a burst of at most one second worth of requests
+                    self.tokens = min(max(self.rate, 1.0), self.tokens + (now - self.updated) * self.rate)
+                    self.updated = now
+                    wait = 0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+                if wait <= 0:
+                    if self.rate is not None:
+                        self.tokens -= 1
+                    self.requests += 1
+                    self.waited_seconds += waited
+                    self._recent.append(now)
+                    return waited
+            if max_wait is not None and waited + wait > max_wait:
+                raise TimeoutError(f"Next request slot is {wait:.1f}s away, past the allowed wait.")
+            time.sleep(wait)
+            waited += wait
+
+    def _recent_rate(self):
+        if len(self._recent) < 2:
+            return self.min_rate
+        span = self._recent[-1] - self._recent[0]
+        return (len(self._recent) - 1) / span if span > 0 else float(len(self._recent))
+
+    def _decrease(self):
+        current = self.rate if self.rate is not None else self._recent_rate()
+        self.rate = max(self.min_rate, current * DECREASE_FACTOR)
+
+    def observe(self, status_code, headers):
+        """
+        Adjusts the rate from a response status code and its rate-limit headers.
+        """
+        headers = headers if isinstance(headers, Mapping) else {}
+        retry_after = _parse_retry_after(headers.get('Retry-After'))
+
+        with self._lock:
+            now = time.monotonic()
+            if status_code == 429:
+                self.throttled += 1
+                self._decrease()
+                self.tokens = 0.0
+                self.paused_until = max(self.paused_until, now + (retry_after if retry_after is not None else 1.0 / self.rate))
+                return retry_after
+
+            if retry_after is not None and status_code == 503:
+                self.paused_until = max(self.paused_until, now + retry_after)
+
+            # Shopify REST: "X-Shopify-Shop-Api-Call-Limit: 32/40" (bucket level / size)
+            call_limit = headers.get('X-Shopify-Shop-Api-Call-Limit')
+            remaining = _header_float(headers, 'X-RateLimit-Remaining', 'RateLimit-Remaining')
+            reset = _header_float(headers, 'X-RateLimit-Reset', 'RateLimit-Reset')
+            if call_limit:
+                try:
+                    used, size = (float(part) for part in call_limit.split('/'))
+                except ValueError:
+                    used, size = 0.0, 0.0
+                if size and used / size >= 0.8:
+                    self._decrease()
+                    return None
+            elif remaining is not None and reset is not None:
+                # Reset is either seconds until the window resets or an epoch timestamp
+                seconds = reset - time.time() if reset > 1e9 else reset
+                if seconds > 0:
+                    self.rate = max(self.min_rate, remaining / seconds * HEADROOM)
+                    return None
+            elif remaining is not None and remaining <= 0:
+                self._decrease()
+                return None
+
+            if self.rate is not None and 200 <= int(status_code) < 400:
+                self.rate += ADDITIVE_INCREASE
+        return None
+
+    def metrics(self):
+        with self._lock:
+            return {
+                'rate': self.rate,
+                'requests': self.requests,
+                'throttled': self.throttled,
+                'waited_seconds': round(self.waited_seconds, 3),
+            }
@@ -1,67 +1,115 @@
 # adapters/shopify_adapter.py
 
 import pandas as pd
+import json
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 import os
-from data_mapping.common_mapping import clean_html, normalize_column_names
+from tenacity import Retrying, stop_after_attempt, wait_exponential, retry_if_result
+from data_mapping.common_mapping import clean_html_series, normalize_column_names, normalize_column_name
+from adapters.common_adapter import make_request, get_session, propagate_context, request_timeout, remaining_time
+from adapters.file_reader import read_tabular, iter_excel_chunks
 
 # Load environment variables
 load_dotenv()
 
-def fetch_shopify_data(file='Test Shopify Sheet.xlsx'):
+# Upload tuning: batches of at least SHOPIFY_BULK_THRESHOLD products use a bulk operation,
+# smaller ones are sent as SHOPIFY_UPLOAD_CONCURRENCY concurrent mutations
+SHOPIFY_BULK_THRESHOLD = int(os.getenv('SHOPIFY_BULK_THRESHOLD', '250'))
+SHOPIFY_UPLOAD_CONCURRENCY = int(os.getenv('SHOPIFY_UPLOAD_CONCURRENCY', '4'))
+SHOPIFY_BULK_POLL_INTERVAL = float(os.getenv('SHOPIFY_BULK_POLL_INTERVAL', '2'))
+SHOPIFY_BULK_TIMEOUT = float(os.getenv('SHOPIFY_BULK_TIMEOUT', '3600'))
+
+# Estimated query cost of one productSet mutation, used to pace concurrent uploads
+SHOPIFY_MUTATION_COST = 10
+
+# Attempts per product while Shopify answers THROTTLED. Without a reported throttle status the
+# attempts are spaced by an exponential backoff instead of the cost budget.
+SHOPIFY_THROTTLE_ATTEMPTS = int(os.getenv('SHOPIFY_THROTTLE_ATTEMPTS', '5'))
+_throttle_backoff = wait_exponential(multiplier=1, min=1, max=30)
+
+# Normalized columns read by the streaming reader: the ones this adapter cleans plus the
+# product fields used by the Zoey mapping downstream
+SHOPIFY_STREAM_COLUMNS = [
+    'handle', 'title', 'body_html', 'vendor', 'type', 'tags', 'variant_sku', 'variant_price',
+    'variant_inventory_qty', 'variant_barcode', 'variant_weight_unit', 'image_src',
+]
+
+def _clean_shopify_frame(output_df, normalize=True):
     """
-    Fetches and processes product data from a Shopify-formatted Excel file.
-    
+    Applies the Shopify cleaning steps (column normalization, types, HTML cleanup, defaults)
+    to a DataFrame read from a Shopify export.
+
     Parameters:
-        file (str): The path to the Shopify Excel file. Default is 'Test Shopify Sheet.xlsx'.
-    
+        output_df (pandas.DataFrame): Raw rows from the Shopify file.
+        normalize (bool): If False, column names are assumed to be normalized already.
+
     Returns:
-        pandas.DataFrame: A cleaned and processed DataFrame containing product data formatted for Shopify.
+        pandas.DataFrame: Cleaned DataFrame.
     """
-    try:
-        # Step 1: Read data from the Excel file using `openpyxl` engine
-        output_df = pd.read_excel(file, engine='openpyxl')
-        logging.info(f"Data successfully read from {file}")
-
-        # Step 2: Normalize column names to ensure consistency across the DataFrame
+    # Step 2: Normalize column names to ensure consistency across the DataFrame
+    if normalize:
         output_df = normalize_column_names(output_df)
         logging.debug(f"Columns in DataFrame after normalization: {output_df.columns.tolist()}")
 
-        # Step 3: Ensure 'variant_price' column exists and is numeric
-        if 'variant_price' in output_df.columns:
-            output_df['variant_price'] = pd.to_numeric(output_df['variant_price'], errors='coerce')
+    # Step 3: Ensure 'variant_price' column exists and is numeric
+    if 'variant_price' in output_df.columns:
+        output_df['variant_price'] = pd.to_numeric(output_df['variant_price'], errors='coerce')
+    else:
+        logging.warning("Column 'variant_price' not found. Creating with default values of 0.")
+        output_df['variant_price'] = 0
+
+    # Step 4: Check and create missing required columns with default values
+    required_columns = {'variant_sku', 'title', 'body_html'}
+    missing_columns = required_columns - set(output_df.columns)
+
+    for col in missing_columns:
+        logging.warning(f"Column '{col}' is missing. Creating with default values.")
+        if col == 'body_html':
+            output_df[col] = ''  # Default to an empty string for HTML descriptions
         else:
-            logging.warning("Column 'variant_price' not found. Creating with default values of 0.")
-            output_df['variant_price'] = 0
+            output_df[col] = 'N/A'  # Default placeholder for SKU and Title
 
-        # Step 4: Check and create missing required columns with default values
-        required_columns = {'variant_sku', 'title', 'body_(html)'}
-        missing_columns = required_columns - set(output_df.columns)
+    # Step 5: Ensure data types are consistent and clean HTML in 'body_html'
+    output_df['variant_sku'] = output_df['variant_sku'].astype(str)
+    output_df['title'] = output_df['title'].astype(str)
+    output_df['body_html'] = clean_html_series(output_df['body_html'])
 
-        for col in missing_columns:
-            logging.warning(f"Column '{col}' is missing. Creating with default values.")
-            if col == 'body_(html)':
-                output_df[col] = ''  # Default to an empty string for HTML descriptions
-            else:
-                output_df[col] = 'N/A'  # Default placeholder for SKU and Title
+    # Step 6: Handle missing data by removing rows without mandatory fields
+    output_df.dropna(subset=['variant_sku', 'title'], inplace=True)
 
-        # Step 5: Ensure data types are consistent and clean HTML in 'body_(html)'
-        output_df['variant_sku'] = output_df['variant_sku'].astype(str)
-        output_df['title'] = output_df['title'].astype(str)
-        output_df['body_(html)'] = output_df['body_(html)'].apply(lambda x: clean_html(x) if isinstance(x, str) else '')
+    # Fill missing 'variant_price' values with 0 after conversion to numeric
+    output_df['variant_price'] = output_df['variant_price'].fillna(0)
 
-        # Step 6: Handle missing data by removing rows without mandatory fields
-        output_df.dropna(subset=['variant_sku', 'title'], inplace=True)
+    # Ensure 'body_html' has no null values
+    output_df['body_html'] = output_df['body_html'].fillna('')
 
-        # Fill missing 'variant_price' values with 0 after conversion to numeric
-        output_df['variant_price'] = output_df['variant_price'].fillna(0)
+    # Step 7: Reset index for a cleaner output DataFrame
+    output_df.reset_index(drop=True, inplace=True)
+    return output_df
 
-        # Ensure 'body_(html)' has no null values
-        output_df['body_(html)'] = output_df['body_(html)'].fillna('')
 
-        # Step 7: Reset index for a cleaner output DataFrame
-        output_df.reset_index(drop=True, inplace=True)
+def fetch_shopify_data(file='Test Shopify Sheet.xlsx', use_cache=True):
+    """
+    Fetches and processes product data from a Shopify-formatted Excel file.
+    
+    Parameters:
+        file (str): The path to the Shopify Excel file. Default is 'Test Shopify Sheet.xlsx'.
+        use_cache (bool): If True, serve unchanged files from the columnar cache instead of re-parsing them.
+    
+    Returns:
+        pandas.DataFrame: A cleaned and processed DataFrame containing product data formatted for Shopify.
+    """
+    try:
+        # Step 1: Read data from the Excel file using `openpyxl` engine (or from the columnar cache)
+        output_df = read_tabular(file, use_cache=use_cache)
+        logging.info(f"Data successfully read from {file}")
+
+        # Steps 2-7: Normalize, type and clean the data
+        output_df = _clean_shopify_frame(output_df)
 
         # Optional: Log a summary of the processed data for verification
         logging.debug(f"Data types after processing:\n{output_df.dtypes}")
@@ -81,12 +129,509 @@ def fetch_shopify_data(file='Test Shopify Sheet.xlsx'):
         return pd.DataFrame()
 
 
-def upload_products(df):
+def iter_shopify_data_chunks(file='Test Shopify Sheet.xlsx', chunk_size=10000, columns=SHOPIFY_STREAM_COLUMNS):
+    """
+    Streams a Shopify-formatted Excel file as cleaned DataFrame chunks with a fixed memory ceiling.
+    The workbook is read in openpyxl read-only mode and only `columns` are materialized.
+
+    Parameters:
+        file (str): The path to the Shopify Excel file. Default is 'Test Shopify Sheet.xlsx'.
+        chunk_size (int): Number of rows per yielded DataFrame.
+        columns (list): Normalized column names to read. None reads every column.
+
+    Yields:
+        pandas.DataFrame: Cleaned chunk, processed the same way as `fetch_shopify_data`.
+    """
+    rows = 0
+    for chunk in iter_excel_chunks(file, columns=columns, chunk_size=chunk_size, normalize=normalize_column_name):
+        chunk = _clean_shopify_frame(chunk, normalize=False)
+        rows += len(chunk)
+        yield chunk
+    logging.info(f"Streamed {rows} Shopify rows from {file}.")
+
+
+class ShopifyAPIError(Exception):
+    pass
+
+
+# Shopify Admin GraphQL mutation used for both the bulk and the per-product upload paths
+PRODUCT_SET_MUTATION = """
+mutation productSet($input: ProductSetInput!) {
+  productSet(input: $input) {
+    product { id handle }
+    userErrors { field message }
+  }
+}
+"""
+
+STAGED_UPLOADS_CREATE = """
+mutation stagedUploadsCreate($input: [StagedUploadInput!]!) {
+  stagedUploadsCreate(input: $input) {
+    stagedTargets { url resourceUrl parameters { name value } }
+    userErrors { field message }
+  }
+}
+"""
+
+BULK_OPERATION_RUN_MUTATION = """
+mutation bulkOperationRunMutation($mutation: String!, $stagedUploadPath: String!) {
+  bulkOperationRunMutation(mutation: $mutation, stagedUploadPath: $stagedUploadPath) {
+    bulkOperation { id status }
+    userErrors { field message }
+  }
+}
+"""
+
+CURRENT_BULK_MUTATION = """
+query {
+  currentBulkOperation(type: MUTATION) { id status errorCode objectCount url }
+}
+"""
+
+BULK_OPERATION_RUN_QUERY = """
+mutation bulkOperationRunQuery($query: String!) {
+  bulkOperationRunQuery(query: $query) {
+    bulkOperation { id status }
+    userErrors { field message }
+  }
+}
+"""
+
+CURRENT_BULK_QUERY = """
+query {
+  currentBulkOperation(type: QUERY) { id status errorCode objectCount url }
+}
+"""
+
+# Bulk export of the catalog. Variants and images come back as separate JSONL lines that
+# follow their product and point to it with `__parentId`.
+PRODUCTS_BULK_QUERY = """
+{
+  products {
+    edges {
+      node {
+        id handle title descriptionHtml vendor productType tags
+        variants { edges { node { id sku price inventoryQuantity barcode } } }
+        images { edges { node { id url } } }
+      }
+    }
+  }
+}
+"""
+
+# Shopify product fields: (ProductSetInput key, candidate normalized column names)
+SHOPIFY_PRODUCT_FIELDS = [
+    ('title', ['title']),
+    ('descriptionHtml', ['body_(html)', 'body_html', 'description']),
+    ('vendor', ['vendor']),
+    ('productType', ['type', 'product_type']),
+    ('tags', ['tags']),
+    ('handle', ['handle']),
+]
+SHOPIFY_SKU_COLUMNS = ['variant_sku', 'sku']
+SHOPIFY_PRICE_COLUMNS = ['variant_price', 'price']
+
+_DEFAULT_OPTION = {'name': 'Title', 'values': [{'name': 'Default Title'}]}
+_DEFAULT_OPTION_VALUE = [{'optionName': 'Title', 'name': 'Default Title'}]
+
+_BULK_FINAL_STATUSES = {'COMPLETED', 'FAILED', 'CANCELED', 'EXPIRED'}
+
+
+def _shopify_column(df, candidates):
+    """
+    Returns the first column of `df` whose normalized name is in `candidates`, or None.
+    """
+    normalized = {normalize_column_name(str(column)): column for column in df.columns}
+    return next((normalized[name] for name in candidates if name in normalized), None)
+
+
+def _native_values(df, column, default):
+    if column is None:
+        return [default] * len(df)
+    series = df[column]
+    return series.astype(object).where(series.notna(), default).tolist()
+
+
+def build_product_inputs(df):
+    """
+    Builds one Shopify `ProductSetInput` per row of `df`, column by column. Accepts either the
+    normalized Shopify export columns (`variant_sku`, `body_html`, ...) or the Shopify template
+    headings (`Variant SKU`, `Body (HTML)`, ...).
+
+    Parameters:
+        df (pandas.DataFrame): DataFrame containing product information.
+
+    Returns:
+        list: Product inputs (dict) in row order.
+    """
+    keys = [key for key, _ in SHOPIFY_PRODUCT_FIELDS]
+    columns = [_native_values(df, _shopify_column(df, candidates), '') for _, candidates in SHOPIFY_PRODUCT_FIELDS]
+    skus = _native_values(df, _shopify_column(df, SHOPIFY_SKU_COLUMNS), '')
+    prices = _native_values(df, _shopify_column(df, SHOPIFY_PRICE_COLUMNS), 0)
+
+    inputs = []
+    for values, sku, price in zip(zip(*columns), skus, prices):
+        product = {key: str(value) for key, value in zip(keys, values) if value != ''}
+        if 'tags' in product:
+            product['tags'] = [tag.strip() for tag in product['tags'].split(',') if tag.strip()]
+        product['productOptions'] = [_DEFAULT_OPTION]
+        variant = {'optionValues': _DEFAULT_OPTION_VALUE, 'price': str(price)}
+        if sku != '':
+            variant['inventoryItem'] = {'sku': str(sku)}
+        product['variants'] = [variant]
+        inputs.append(product)
+    return inputs
+
+
+def _graphql_url(store_url=None):
+    """
+    Returns the Admin GraphQL endpoint, for `store_url` (e.g. a local stub) or SHOPIFY_STORE_DOMAIN.
+    """
+    api_version = os.getenv('SHOPIFY_API_VERSION', '2024-10')
+    if not store_url:
+        store_url = f"https://{os.getenv('SHOPIFY_STORE_DOMAIN')}"
+    return f"{store_url.rstrip('/')}/admin/api/{api_version}/graphql.json"
+
+
+def _graphql(api_url, headers, query, variables=None):
+    """
+    Sends a GraphQL request and returns the parsed body. Top-level errors other than throttling
+    raise `ShopifyAPIError`; throttled bodies are returned for the caller to wait and retry.
+    """
+    response = make_request("POST", api_url, headers=headers, data={"query": query, "variables": variables or {}})
+    if response is None:
+        raise ShopifyAPIError("No response received from Shopify.")
+    body = response.json()
+    errors = body.get('errors') or []
+    if errors and not _is_throttled(body):
+        raise ShopifyAPIError(f"Shopify GraphQL error: {errors}")
+    return body
+
+
+def _is_throttled(body):
+    return any((error.get('extensions') or {}).get('code') == 'THROTTLED' for error in body.get('errors') or [])
+
+
+class _CostBudget:
+    """
+    Client-side view of Shopify's leaky-bucket query cost limit, shared by the upload workers.
+    Each response reports the bucket level (`extensions.cost.throttleStatus`); workers wait for
+    enough points to restore before sending, instead of running into THROTTLED errors.
+    """
+
+    def __init__(self):
+        self.available = None
+        self.restore_rate = 50.0
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, cost):
+        while True:
+            with self._lock:
+                if self.available is None:
+                    return
+                now = time.monotonic()
+                self.available += (now - self.updated) * self.restore_rate
+                self.updated = now
+                if self.available >= cost:
+                    self.available -= cost
+                    return
+                wait = (cost - self.available) / self.restore_rate
+            time.sleep(wait)
+
+    def update(self, body):
+        throttle_status = ((body.get('extensions') or {}).get('cost') or {}).get('throttleStatus')
+        if not throttle_status:
+            return
+        with self._lock:
+            self.available = float(throttle_status['currentlyAvailable'])
+            self.restore_rate = float(throttle_status.get('restoreRate') or self.restore_rate)
+            self.updated = time.monotonic()
+
+
+def _upload_concurrently(inputs, api_url, headers, concurrency):
+    """
+    Sends one `productSet` mutation per product from a pool of workers, pacing them with the
+    query cost reported by Shopify. A product still throttled after SHOPIFY_THROTTLE_ATTEMPTS
+    attempts is counted as rejected.
+
+    Returns:
+        int: Number of products rejected by Shopify.
+    """
+    budget = _CostBudget()
+
+    def send(product_input):
+        budget.acquire(SHOPIFY_MUTATION_COST)
+        body = _graphql(api_url, headers, PRODUCT_SET_MUTATION, {"input": product_input})
+        budget.update(body)
+        return body
+
+    def wait(retry_state):
+        logging.info("Shopify throttled the upload. Waiting for the cost budget to restore.")
+        if budget.available is not None:
+            return 0  # The cost budget paces the next attempt
+        remaining = remaining_time()
+        backoff = _throttle_backoff(retry_state)
+        return backoff if remaining is None else max(0, min(backoff, remaining))
+
+    def upload(product_input):
+        retrying = Retrying(
+            stop=stop_after_attempt(SHOPIFY_THROTTLE_ATTEMPTS),
+            wait=wait,
+            retry=retry_if_result(_is_throttled),
+            retry_error_callback=lambda retry_state: retry_state.outcome.result(),
+        )
+        body = retrying(send, product_input)
+        if _is_throttled(body):
+            return [{'message': f"Throttled by Shopify on {SHOPIFY_THROTTLE_ATTEMPTS} attempts."}]
+        return (body.get('data') or {}).get('productSet', {}).get('userErrors') or []
+
+    failed = 0
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for product_input, user_errors in zip(inputs, executor.map(propagate_context(upload), inputs)):
+            if user_errors:
+                failed += 1
+                logging.error(f"Shopify rejected product '{product_input.get('title', 'N/A')}': {user_errors}")
+    return failed
+
+
+def _wait_for_bulk_operation(api_url, headers, status_query, poll_interval, timeout):
+    """
+    Polls `currentBulkOperation` until it reaches a final status.
+
+    Returns:
+        dict: The completed operation (with the result file 'url').
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        operation = _graphql(api_url, headers, status_query)['data']['currentBulkOperation']
+        if operation and operation['status'] in _BULK_FINAL_STATUSES:
+            break
+        if time.monotonic() > deadline:
+            raise ShopifyAPIError(f"Bulk operation did not finish within {timeout} seconds.")
+        time.sleep(poll_interval)
+
+    if operation['status'] != 'COMPLETED':
+        raise ShopifyAPIError(f"Bulk operation ended as {operation['status']} ({operation.get('errorCode')}).")
+    return operation
+
+
+def _iter_jsonl(url):
+    """
+    Streams a bulk operation result file, yielding one parsed JSON object per line without
+    downloading the whole file first.
+    """
+    with get_session(url).get(url, stream=True, timeout=request_timeout()) as response:
+        response.raise_for_status()
+        for line in response.iter_lines(decode_unicode=True):
+            if line:
+                yield json.loads(line)
+
+
+def _upload_bulk(inputs, api_url, headers, poll_interval, timeout):
+    """
+    Uploads products with one bulk operation: stage a JSONL file of mutation variables, run
+    `bulkOperationRunMutation` on it and poll until the operation finishes.
+
+    Returns:
+        int: Number of products rejected by Shopify.
+    """
+    jsonl = ''.join(json.dumps({"input": product_input}) + '\n' for product_input in inputs).encode('utf-8')
+
+    # Step 1: Reserve a staged upload target
+    body = _graphql(api_url, headers, STAGED_UPLOADS_CREATE, {"input": [{
+        "resource": "BULK_MUTATION_VARIABLES",
+        "filename": "products.jsonl",
+        "mimeType": "text/jsonl",
+        "httpMethod": "POST",
+    }]})
+    staged = body['data']['stagedUploadsCreate']
+    if staged['userErrors']:
+        raise ShopifyAPIError(f"Staged upload was rejected: {staged['userErrors']}")
+    target = staged['stagedTargets'][0]
+    parameters = {parameter['name']: parameter['value'] for parameter in target['parameters']}
+
+    # Step 2: Upload the JSONL file to the staged target
+    response = get_session(target['url']).post(
+        target['url'], data=parameters, files={'file': ('products.jsonl', jsonl, 'text/jsonl')}, timeout=request_timeout()
+    )
+    response.raise_for_status()
+    logging.info(f"Staged {len(inputs)} Shopify products ({len(jsonl)} bytes) for a bulk operation.")
+
+    # Step 3: Start the bulk operation on the staged file
+    body = _graphql(api_url, headers, BULK_OPERATION_RUN_MUTATION, {
+        "mutation": PRODUCT_SET_MUTATION,
+        "stagedUploadPath": parameters.get('key', target.get('resourceUrl')),
+    })
+    run = body['data']['bulkOperationRunMutation']
+    if run['userErrors']:
+        raise ShopifyAPIError(f"Bulk operation was rejected: {run['userErrors']}")
+    logging.info(f"Started Shopify bulk operation {run['bulkOperation']['id']}.")
+
+    # Step 4: Poll until the operation reaches a final status
+    operation = _wait_for_bulk_operation(api_url, headers, CURRENT_BULK_MUTATION, poll_interval, timeout)
+
+    # Step 5: Count the products rejected in the result file, one JSON line per input line
+    failed = 0
+    if operation.get('url'):
+        for result in _iter_jsonl(operation['url']):
+            user_errors = ((result.get('data') or {}).get('productSet') or {}).get('userErrors') or []
+            if user_errors:
+                failed += 1
+                logging.error(f"Shopify rejected product on line {result.get('__lineNumber')}: {user_errors}")
+    logging.info(f"Shopify bulk operation finished: {operation.get('objectCount')} objects processed.")
+    return failed
+
+
+def _shopify_headers():
+    """
+    Returns the Admin API headers, or None if the access token is not configured.
+    """
+    access_token = os.getenv('SHOPIFY_ACCESS_TOKEN')
+    if not access_token:
+        return None
+    return {
+        "X-Shopify-Access-Token": access_token,
+        "Content-Type": "application/json",
+        "Accept": "application/json"
+    }
+
+
+def _bulk_product_rows(lines):
+    """
+    Reassembles bulk query JSONL lines into one row per variant in a single pass. Shopify writes
+    every child line (variant, image) after its parent product, so a product is complete as soon
+    as the next product line arrives and only one product is held in memory at a time.
+
+    Parameters:
+        lines (iterable): Parsed JSONL objects from the bulk operation result file.
+
+    Yields:
+        dict: Row with the normalized Shopify export columns.
+    """
+    product, variants, image_src = None, [], ''
+
+    def product_rows():
+        base = {
+            'handle': product.get('handle', ''),
+            'title': product.get('title', ''),
+            'body_html': product.get('descriptionHtml', ''),
+            'vendor': product.get('vendor', ''),
+            'type': product.get('productType', ''),
+            'tags': ', '.join(product.get('tags') or []),
+            'image_src': image_src,
+        }
+        for variant in variants or [{}]:
+            yield dict(
+                base,
+                variant_sku=variant.get('sku'),
+                variant_price=variant.get('price'),
+                variant_inventory_qty=variant.get('inventoryQuantity'),
+                variant_barcode=variant.get('barcode'),
+            )
+
+    for line in lines:
+        parent_id = line.get('__parentId')
+        if parent_id is None:
+            if product is not None:
+                yield from product_rows()
+            product, variants, image_src = line, [], ''
+        elif product is None or parent_id != product.get('id'):
+            logging.warning(f"Skipping Shopify bulk line {line.get('id')} whose parent {parent_id} is not the current product.")
+        elif '/ProductVariant/' in str(line.get('id', '')):
+            variants.append(line)
+        elif 'url' in line and not image_src:
+            image_src = line['url']
+
+    if product is not None:
+        yield from product_rows()
+
+
+def iter_shopify_api_chunks(store_url=None, chunk_size=10000, poll_interval=SHOPIFY_BULK_POLL_INTERVAL, timeout=SHOPIFY_BULK_TIMEOUT):
+    """
+    Fetches the Shopify catalog with a bulk query and streams it as cleaned DataFrame chunks.
+    The result file is read line by line and children are joined to their product in one pass,
+    so memory stays bounded by `chunk_size` rows.
+
+    Parameters:
+        store_url (str): Optional store base URL (e.g. a local stub). Defaults to SHOPIFY_STORE_DOMAIN.
+        chunk_size (int): Number of rows (one per variant) per yielded DataFrame.
+        poll_interval (float): Seconds between bulk operation status checks.
+        timeout (float): Maximum seconds to wait for the bulk operation.
+
+    Yields:
+        pandas.DataFrame: Chunk with the same normalized columns as `fetch_shopify_data`.
+    """
+    headers = _shopify_headers()
+    if not headers or not (store_url or os.getenv('SHOPIFY_STORE_DOMAIN')):
+        raise ShopifyAPIError("Shopify credentials not found. Please set SHOPIFY_STORE_DOMAIN and SHOPIFY_ACCESS_TOKEN in .env.")
+    api_url = _graphql_url(store_url)
+
+    # Step 1: Start the bulk query and wait for its result file
+    run = _graphql(api_url, headers, BULK_OPERATION_RUN_QUERY, {"query": PRODUCTS_BULK_QUERY})['data']['bulkOperationRunQuery']
+    if run['userErrors']:
+        raise ShopifyAPIError(f"Bulk query was rejected: {run['userErrors']}")
+    logging.info(f"Started Shopify bulk query {run['bulkOperation']['id']}.")
+    operation = _wait_for_bulk_operation(api_url, headers, CURRENT_BULK_QUERY, poll_interval, timeout)
+    if not operation.get('url'):
+        logging.info("Shopify bulk query returned no products.")
+        return
+
+    # Step 2: Stream the result file and clean it chunk by chunk
+    rows, buffered = 0, []
+    for row in _bulk_product_rows(_iter_jsonl(operation['url'])):
+        buffered.append(row)
+        if len(buffered) >= chunk_size:
+            chunk = _clean_shopify_frame(pd.DataFrame(buffered), normalize=False)
+            rows += len(chunk)
+            buffered = []
+            yield chunk
+    if buffered:
+        chunk = _clean_shopify_frame(pd.DataFrame(buffered), normalize=False)
+        rows += len(chunk)
+        yield chunk
+    logging.info(f"Streamed {rows} Shopify rows from the bulk query.")
+
+
+def fetch_shopify_data_from_api(store_url=None, chunk_size=10000):
+    """
+    Fetches and processes product data from the Shopify Admin API with a bulk query.
+
+    Parameters:
+        store_url (str): Optional store base URL (e.g. a local stub). Defaults to SHOPIFY_STORE_DOMAIN.
+        chunk_size (int): Number of rows cleaned at a time while streaming the result file.
+
+    Returns:
+        pandas.DataFrame: Same columns as `fetch_shopify_data`, or an empty DataFrame on failure.
+    """
+    try:
+        chunks = list(iter_shopify_api_chunks(store_url, chunk_size))
+        if not chunks:
+            return pd.DataFrame()
+        logging.info("Shopify data fetched from the API successfully.")
+        return pd.concat(chunks, ignore_index=True)
+    except Exception as e:
+        logging.error(f"An error occurred while fetching Shopify data from the API: {e}")
+        return pd.DataFrame()
+
+
+def upload_products(df, store_url=None, bulk_threshold=SHOPIFY_BULK_THRESHOLD, concurrency=SHOPIFY_UPLOAD_CONCURRENCY,
+                    poll_interval=SHOPIFY_BULK_POLL_INTERVAL, timeout=SHOPIFY_BULK_TIMEOUT):
     """
-    Mock function to upload products to Shopify.
+    Uploads products to Shopify through the Admin GraphQL API.
+
+    Batches of at least `bulk_threshold` products are sent as one bulk operation (staged JSONL
+    file plus `bulkOperationRunMutation`, polled until done), which runs server-side without the
+    per-request cost limit. Smaller batches are sent as concurrent `productSet` mutations paced
+    by the query cost Shopify reports.
 
     Parameters:
         df (pd.DataFrame): DataFrame containing the product information to be uploaded.
+        store_url (str): Optional store base URL (e.g. a local stub). Defaults to SHOPIFY_STORE_DOMAIN.
+        bulk_threshold (int): Minimum number of products for the bulk operation path.
+        concurrency (int): Number of workers for per-product mutations.
+        poll_interval (float): Seconds between bulk operation status checks.
+        timeout (float): Maximum seconds to wait for a bulk operation.
 
     Returns:
         bool: True if upload is successful, False otherwise.
@@ -95,12 +640,25 @@ def upload_products(df):
         logging.warning("No data to upload to Shopify. Please provide a valid DataFrame.")
         return False
 
+    headers = _shopify_headers()
+    if not headers or not (store_url or os.getenv('SHOPIFY_STORE_DOMAIN')):
+        logging.error("Shopify credentials not found. Please set SHOPIFY_STORE_DOMAIN and SHOPIFY_ACCESS_TOKEN in .env.")
+        return False
+
     try:
-        # Simulate the upload process
         logging.info(f"Uploading {len(df)} products to Shopify.")
-        
-        # Normally, the API request would be sent here (e.g., using requests.post())
-        # Simulating success with logging
+        inputs = build_product_inputs(df)
+        api_url = _graphql_url(store_url)
+
+        if len(inputs) >= bulk_threshold:
+            failed = _upload_bulk(inputs, api_url, headers, poll_interval, timeout)
+        else:
+            failed = _upload_concurrently(inputs, api_url, headers, concurrency)
+
+        if failed:
+            logging.error(f"{failed} of {len(inputs)} products were rejected by Shopify.")
+            return False
+
         logging.info("Products successfully uploaded to Shopify.")
         return True
 
@@ -1,25 +1,185 @@
 import pandas as pd
+import json
 import logging
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from itertools import repeat
 from dotenv import load_dotenv
-from adapters.common_adapter import make_request  # Import shared request function
+from adapters.common_adapter import make_request, propagate_context  # Import shared request function
+from data_mapping.mapping_spec import LazyFrame
 
 # Load environment variables
 load_dotenv()
 
-def export_to_zoey(df):
+# Caps for one bulk request in batched export mode
+ZOEY_BULK_MAX_PRODUCTS = int(os.getenv('ZOEY_BULK_MAX_PRODUCTS', '100'))
+ZOEY_BULK_MAX_BYTES = int(os.getenv('ZOEY_BULK_MAX_BYTES', str(1024 * 1024)))
+
+# Default number of products exported at the same time in concurrent mode
+ZOEY_EXPORT_CONCURRENCY = int(os.getenv('ZOEY_EXPORT_CONCURRENCY', '8'))
+
+# Columns holding the SKU: the Zoey product layout of `map_to_zoey`, then the Zoey CSV layout
+# of `map_output_to_zoey_csv`
+ZOEY_SKU_COLUMNS = ('SKU', 'sku')
+
+# Zoey payload fields: (payload key, DataFrame columns in order of preference, default for missing
+# columns and values). Both the `map_to_zoey` and the Zoey CSV layouts are accepted.
+ZOEY_PRODUCT_FIELDS = [
+    ('handle', ('Handle', 'url_key'), ''),
+    ('title', ('Title', 'name'), ''),
+    ('description', ('Description', 'description'), ''),
+    ('vendor', ('Vendor',), ''),
+    ('type', ('Type',), ''),
+    ('tags', ('Tags',), ''),
+    ('published', ('Published',), False),
+]
+ZOEY_VARIANT_FIELDS = [
+    ('sku', ZOEY_SKU_COLUMNS, ''),
+    ('price', ('Price', 'price'), 0.0),
+    ('inventory_quantity', ('Inventory Quantity', 'qty'), 0),
+    ('barcode', ('Barcode', 'barcode'), ''),
+]
+ZOEY_IMAGE_FIELDS = [
+    ('src', ('Image URL', 'image'), ''),
+    ('alt_text', ('Image Alt Text',), ''),
+]
+
+def _column_values(df, columns, default):
+    """
+    Returns the first of `columns` present in `df` as a list of native Python values, with
+    missing values (or no matching column) replaced by `default`. Missing and constant columns
+    of a `LazyFrame` are repeated instead of expanded.
+    """
+    column = next((name for name in columns if name in df.columns), None)
+    if column is None:
+        return repeat(default, len(df))
+    if isinstance(df, LazyFrame) and column in df.constants:
+        value = df.constants[column]
+        return repeat(default if pd.isna(value) else value, len(df))
+    series = df[column]
+    return series.astype(object).where(series.notna(), default).tolist()
+
+
+def build_zoey_payloads(df):
+    """
+    Builds the Zoey product payloads for every row of `df`, column by column instead of
+    row by row, so no per-row Series is created.
+
+    Parameters:
+        df (pandas.DataFrame): DataFrame containing product information, in the `map_to_zoey`
+            or the Zoey CSV layout (see ZOEY_PRODUCT_FIELDS).
+
+    Returns:
+        list: One product payload (dict) per row, in row order.
+    """
+    fields = ZOEY_PRODUCT_FIELDS + ZOEY_VARIANT_FIELDS + ZOEY_IMAGE_FIELDS
+    columns = [_column_values(df, candidates, default) for _, candidates, default in fields]
+    product_keys = [key for key, _, _ in ZOEY_PRODUCT_FIELDS]
+    variant_keys = [key for key, _, _ in ZOEY_VARIANT_FIELDS]
+    image_keys = [key for key, _, _ in ZOEY_IMAGE_FIELDS]
+    variant_start = len(product_keys)
+    image_start = variant_start + len(variant_keys)
+
+    payloads = []
+    for values in zip(*columns):
+        payload = dict(zip(product_keys, values[:variant_start]))
+        payload['variants'] = [dict(zip(variant_keys, values[variant_start:image_start]))]
+        payload['images'] = [dict(zip(image_keys, values[image_start:]))]
+        payloads.append(payload)
+    return payloads
+
+
+def _payload_sku(payload):
+    return str(payload['variants'][0]['sku']).strip()
+
+
+def _route_payloads(payloads, api_url, index):
+    """
+    Decides per payload whether it creates or updates a Zoey product. SKUs found in `index`
+    are sent as PUT to `<api_url>/<id>`, all others as POST to `api_url`. The index is
+    queried once for the whole batch, not once per SKU. Payloads without a SKU cannot be
+    matched to a Zoey product and are always created.
+
+    Returns:
+        list: (method, url, product ID or None) per payload, in payload order.
+    """
+    if index is None:
+        return [("POST", api_url, None)] * len(payloads)
+
+    skus = [_payload_sku(payload) for payload in payloads]
+    blank = skus.count('')
+    if blank:
+        logging.warning(f"{blank} Zoey products have no SKU. They are created without an index lookup.")
+    product_ids = index.lookup(sku for sku in skus if sku)
+    routes = []
+    for sku in skus:
+        product_id = product_ids.get(sku) if sku else None
+        routes.append(("PUT", f"{api_url}/{product_id}", product_id) if product_id else ("POST", api_url, None))
+    updates = sum(1 for _, _, product_id in routes if product_id)
+    logging.info(f"Routing {len(payloads) - updates} Zoey products to create and {updates} to update.")
+    return routes
+
+
+def _response_json(response):
+    try:
+        return response.json()
+    except Exception:
+        return None
+
+
+def _created_product_id(response):
+    """
+    Returns the product ID from the body of a successful create call, or None if there is none.
+    """
+    body = _response_json(response)
+    product_id = body.get('id') if isinstance(body, dict) else None
+    return product_id if isinstance(product_id, (str, int)) and not isinstance(product_id, bool) else None
+
+
+def iter_zoey_batches(payloads, max_products=ZOEY_BULK_MAX_PRODUCTS, max_bytes=ZOEY_BULK_MAX_BYTES):
+    """
+    Groups product payloads into batches capped by product count and encoded JSON size.
+    A single product larger than `max_bytes` is sent in a batch of its own.
+
+    Yields:
+        list: Product payloads for one bulk request.
+    """
+    batch, batch_bytes = [], 0
+    for payload in payloads:
+        payload_bytes = len(json.dumps(payload).encode('utf-8')) + 2  # Separator between array items
+        if batch and (len(batch) >= max_products or batch_bytes + payload_bytes > max_bytes):
+            yield batch
+            batch, batch_bytes = [], 0
+        batch.append(payload)
+        batch_bytes += payload_bytes
+    if batch:
+        yield batch
+
+
+def export_to_zoey(df, api_url=None, batch_size=None, max_batch_bytes=ZOEY_BULK_MAX_BYTES, index=None):
     """
     Exports product data to Zoey via its REST API.
 
     Parameters:
         df (pandas.DataFrame): DataFrame containing product information.
+        api_url (str): Optional parameter for specifying a different API endpoint. If not provided, will use default URL.
+        batch_size (int): If set, send products in bulk requests of up to this many products
+            (and `max_batch_bytes` of JSON) to `<api_url>/bulk`. Otherwise each product is
+            sent in its own request.
+        max_batch_bytes (int): Maximum encoded size of one bulk request in batched mode.
+        index (ZoeyProductIndex): Optional SKU -> Zoey product ID index. When given, products
+            already in Zoey are updated instead of created, and the IDs of created products are
+            recorded. In batched mode the ID is added to the payload of products to update.
 
     Returns:
         bool: True if export is successful, False otherwise.
     """
     try:
-        # Set Zoey's API endpoint for product creation
-        api_url = "https://api.zoey.com/v1/products"
+        # Use Zoey's default API endpoint for product creation if not provided
+        if not api_url:
+            api_url = "https://api.zoey.com/v1/products"
 
         # Retrieve API key from environment variables
         api_key = os.getenv('ZOEY_API_KEY')
@@ -33,50 +193,219 @@ def export_to_zoey(df):
             "Accept": "application/json"
         }
 
-        # Iterate through the rows in the DataFrame and export each product to Zoey
-        for _, row in df.iterrows():
-            product_data = {
-                "handle": row.get('Handle', ''),
-                "title": row.get('Title', ''),
-                "description": row.get('Description', ''),
-                "vendor": row.get('Vendor', ''),
-                "type": row.get('Type', ''),
-                "tags": row.get('Tags', ''),
-                "published": row.get('Published', False),
-                "variants": [
-                    {
-                        "sku": row.get('SKU', ''),
-                        "price": row.get('Price', 0.0),
-                        "inventory_quantity": row.get('Inventory Quantity', 0),
-                        "barcode": row.get('Barcode', '')
-                    }
-                ],
-                "images": [
-                    {
-                        "src": row.get('Image URL', ''),
-                        "alt_text": row.get('Image Alt Text', '')
-                    }
-                ]
-            }
-
-            # Use shared `make_request` function to handle the HTTP POST request.
-            # Here, we're using `data=product_data` instead of `json=product_data` to match the signature.
-            response = make_request("POST", api_url, headers=headers, data=product_data)
-
-            # Check if response is None before attempting to access its attributes
-            if response is None:
-                logging.error(f"Request failed for product '{row.get('Title', 'N/A')}'. No response received from Zoey.")
-                return False
+        payloads = build_zoey_payloads(df)
+        routes = _route_payloads(payloads, api_url, index)
+        if batch_size:
+            if index is not None:
+                payloads = [dict(payload, id=product_id) if product_id else payload
+                            for payload, (_, _, product_id) in zip(payloads, routes)]
+            return _export_batches(payloads, f"{api_url}/bulk", headers, batch_size, max_batch_bytes, index)
 
-            # Check the response status code and log the result
-            if response.status_code in [200, 201]:
-                logging.info(f"Product '{row.get('Title', 'N/A')}' exported successfully to Zoey.")
-            else:
-                logging.error(f"Failed to export product '{row.get('Title', 'N/A')}' to Zoey: {response.status_code} - {response.text}")
-                return False  # Optionally, you can choose to continue exporting other products
+        # Export each product to Zoey in its own request
+        created = {}
+        try:
+            for product_data, (method, url, _) in zip(payloads, routes):
+                # Use shared `make_request` function to handle the HTTP request (POST to create, PUT to update).
+                # Here, we're using `data=product_data` instead of `json=product_data` to match the signature.
+                response = make_request(method, url, headers=headers, data=product_data)
+
+                # Check if response is None before attempting to access its attributes
+                if response is None:
+                    logging.error(f"Request failed for product '{product_data['title'] or 'N/A'}'. No response received from Zoey.")
+                    return False
+
+                # Check the response status code and log the result
+                if response.status_code in [200, 201]:
+                    logging.info(f"Product '{product_data['title'] or 'N/A'}' exported successfully to Zoey.")
+                    if index is not None and method == "POST" and _payload_sku(product_data):
+                        created[_payload_sku(product_data)] = _created_product_id(response)
+                else:
+                    logging.error(f"Failed to export product '{product_data['title'] or 'N/A'}' to Zoey: {response.status_code} - {response.text}")
+                    return False  # Optionally, you can choose to continue exporting other products
+        finally:
+            if index is not None:
+                # Keep the IDs of products created before a failure, so a re-run updates them
+                index.update(created)
 
         return True
 
     except Exception as err:
         logging.error(f"An unexpected error occurred while exporting to Zoey: {err}")
         return False
+
+
+def _export_batches(payloads, bulk_url, headers, batch_size, max_batch_bytes, index=None):
+    """
+    Sends product payloads to Zoey's bulk endpoint in capped batches over the pooled connection.
+    With an `index`, IDs of products listed in the bulk response are recorded.
+
+    Returns:
+        bool: True if every batch was accepted, False at the first rejected batch.
+    """
+    exported = 0
+    for batch_number, batch in enumerate(iter_zoey_batches(payloads, batch_size, max_batch_bytes), start=1):
+        response = make_request("POST", bulk_url, headers=headers, data={"products": batch})
+
+        if response is None:
+            logging.error(f"Bulk request {batch_number} failed. No response received from Zoey.")
+            return False
+
+        if response.status_code not in [200, 201, 202]:
+            logging.error(f"Failed to export bulk request {batch_number} ({len(batch)} products) to Zoey: {response.status_code} - {response.text}")
+            return False
+
+        if index is not None:
+            index.update(_bulk_product_ids(response))
+
+        exported += len(batch)
+        logging.info(f"Bulk request {batch_number} exported {len(batch)} products to Zoey ({exported}/{len(payloads)}).")
+
+    return True
+
+
+def _bulk_product_ids(response):
+    """
+    Returns SKU -> product ID for the products listed in a bulk response body
+    (`{"products": [{"id": ..., "sku": ...}, ...]}`), if Zoey returned them.
+    """
+    body = _response_json(response)
+    products = body.get('products') if isinstance(body, dict) else None
+    if not isinstance(products, list):
+        return {}
+    return {
+        product['sku']: product['id'] for product in products
+        if isinstance(product, dict) and product.get('sku') and product.get('id') is not None
+    }
+
+
+@dataclass
+class ZoeyExportResult:
+    """
+    Outcome of a concurrent Zoey export, per product. Products are identified by their row
+    position in the exported DataFrame, because SKUs can be blank or repeated.
+
+    Attributes:
+        skus (list): SKU of every exported row, by position.
+        succeeded (list): Positions of the products exported successfully.
+        failed (dict): Position -> error message for products that could not be exported.
+        latencies (dict): Position -> seconds spent on the request, including retries.
+        retries (dict): Position -> number of retries `make_request` needed.
+    """
+    skus: list = field(default_factory=list)
+    succeeded: list = field(default_factory=list)
+    failed: dict = field(default_factory=dict)
+    latencies: dict = field(default_factory=dict)
+    retries: dict = field(default_factory=dict)
+
+    @property
+    def success(self):
+        return not self.failed
+
+    def failed_products(self, df, with_errors=False):
+        """
+        Returns the rows of `df` that failed, ready to be exported again, as a DataFrame.
+
+        Parameters:
+            df (pandas.DataFrame): The exported products, in the order they were exported.
+            with_errors (bool): Add an 'export_error' column with the error of each row.
+        """
+        positions = sorted(self.failed)
+        failed = pd.Series(False, index=range(len(df)))
+        failed[positions] = True
+        failed_df = df[failed.to_numpy()]
+        if isinstance(failed_df, LazyFrame):
+            failed_df = failed_df.to_frame()
+        if with_errors:
+            failed_df = failed_df.assign(export_error=[self.failed[position] for position in positions])
+        return failed_df
+
+    def save_failed_products(self, df, path):
+        """
+        Writes the failed rows of `df` to a CSV file so they can be re-driven as a separate job.
+
+        Returns:
+            int: Number of rows written.
+        """
+        failed_df = self.failed_products(df, with_errors=True)
+        failed_df.to_csv(path, index=False)
+        logging.info(f"Saved {len(failed_df)} failed Zoey products to {path}.")
+        return len(failed_df)
+
+
+def export_to_zoey_concurrent(df, api_url=None, concurrency=ZOEY_EXPORT_CONCURRENCY, index=None):
+    """
+    Exports product data to Zoey with a pool of workers, one product per request. Unlike
+    `export_to_zoey`, a failed product does not stop the run: every product is attempted and
+    the outcome is reported per product.
+
+    Parameters:
+        df (pandas.DataFrame): DataFrame containing product information.
+        api_url (str): Optional parameter for specifying a different API endpoint. If not provided, will use default URL.
+        concurrency (int): Maximum number of requests in flight.
+        index (ZoeyProductIndex): Optional SKU -> Zoey product ID index used to route products to
+            create or update calls. IDs of created products are recorded in it.
+
+    Returns:
+        ZoeyExportResult: Succeeded/failed products with per-request latency and retry counts.
+    """
+    result = ZoeyExportResult()
+
+    if not api_url:
+        api_url = "https://api.zoey.com/v1/products"
+
+    api_key = os.getenv('ZOEY_API_KEY')
+    if not api_key:
+        logging.error("Zoey API key not found. Please set ZOEY_API_KEY in .env.")
+        result.skus = [_payload_sku(product_data) for product_data in build_zoey_payloads(df)]
+        result.failed = dict.fromkeys(range(len(result.skus)), "Zoey API key not found.")
+        return result
+
+    headers = {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json",
+        "Accept": "application/json"
+    }
+
+    def export_product(product_data, route):
+        method, url, _ = route
+        started = time.perf_counter()
+        created_id = None
+        try:
+            response = make_request(method, url, headers=headers, data=product_data)
+            attempts = getattr(response, 'attempts', 1)
+            if response is None:
+                error = "No response received from Zoey."
+            elif response.status_code in [200, 201]:
+                error = None
+                if method == "POST":
+                    created_id = _created_product_id(response)
+            else:
+                error = f"{response.status_code} - {response.text}"
+        except Exception as err:
+            attempts = getattr(err, 'attempts', 1)
+            error = str(err) or type(err).__name__
+        return error, time.perf_counter() - started, attempts, created_id
+
+    payloads = build_zoey_payloads(df)
+    routes = _route_payloads(payloads, api_url, index)
+    created = {}
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        outcomes = executor.map(propagate_context(export_product), payloads, routes)
+        for position, (product_data, (error, latency, attempts, created_id)) in enumerate(zip(payloads, outcomes)):
+            sku = _payload_sku(product_data)
+            result.skus.append(sku)
+            result.latencies[position] = latency
+            result.retries[position] = attempts - 1
+            if error is None:
+                result.succeeded.append(position)
+                if sku:
+                    created[sku] = created_id
+            else:
+                result.failed[position] = error
+                logging.error(f"Failed to export product '{sku}' (row {position}) to Zoey: {error}")
+
+    if index is not None:
+        index.update(created)
+
+    logging.info(f"Concurrent Zoey export finished: {len(result.succeeded)} succeeded, {len(result.failed)} failed.")
+    return result
@@ -0,0 +1,142 @@
+# adapters/zoey_index.py
+
+import logging
+import os
+import sqlite3
+import threading
+
+# SQLite file mapping SKUs to Zoey product IDs, kept between sync runs
+ZOEY_INDEX_FILE = os.getenv('ZOEY_INDEX_FILE', os.path.join('.sync_state', 'zoey_index.sqlite'))
+
+# SQLite limits the number of bound parameters per statement, so lookups are split
+_LOOKUP_BATCH = 500
+
+
+class ZoeyProductIndex:
+    """
+    Persistent local index from SKU to Zoey product ID.
+
+    Lets the Zoey exporter route each product to an update (PUT) or a create (POST) call
+    without asking Zoey whether the SKU exists. The index is seeded from a product listing
+    (`fetch_data_from_zoey`) and updated with the IDs returned by successful creates.
+    """
+
+    def __init__(self, path=ZOEY_INDEX_FILE):
+        self.path = path
+        self._connection = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS zoey_products (sku TEXT PRIMARY KEY, product_id TEXT NOT NULL)"
+            )
+        return self._connection
+
+    def lookup(self, skus):
+        """
+        Returns the Zoey product IDs known for `skus` with one query per 500 SKUs.
+
+        Parameters:
+            skus (iterable): SKUs to look up.
+
+        Returns:
+            dict: SKU -> Zoey product ID, for the SKUs present in the index.
+        """
+        skus = list(dict.fromkeys(str(sku).strip() for sku in skus))
+        skus = [sku for sku in skus if sku]
+        if not skus or not os.path.exists(self.path):
+            return {}
+
+        found = {}
+        with self._lock:
+            connection = self._connect()
+            for start in range(0, len(skus), _LOOKUP_BATCH):
+                batch = skus[start:start + _LOOKUP_BATCH]
+                placeholders = ','.join('?' * len(batch))
+                rows = connection.execute(
+                    f"SELECT sku, product_id FROM zoey_products WHERE sku IN ({placeholders})", batch
+                )
+                found.update(rows)
+        return found
+
+    def update(self, mapping):
+        """
+        Records or replaces SKU -> Zoey product ID pairs. Blank SKUs are ignored.
+
+        Parameters:
+            mapping (dict): SKU -> Zoey product ID.
+        """
+        rows = [(str(sku).strip(), str(product_id)) for sku, product_id in mapping.items()
+                if sku is not None and str(sku).strip() and product_id is not None]
+        if not rows:
+            return
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.executemany(
+                    "INSERT INTO zoey_products (sku, product_id) VALUES (?, ?) "
+                    "ON CONFLICT(sku) DO UPDATE SET product_id = excluded.product_id",
+                    rows,
+                )
+
+    def seed(self, zoey_df):
+        """
+        Fills the index from a Zoey product listing, as returned by `fetch_data_from_zoey`.
+        The SKU is read from a 'sku' column or, failing that, from the first entry of 'variants'.
+
+        Parameters:
+            zoey_df (pandas.DataFrame): Zoey products with an 'id' column.
+
+        Returns:
+            int: Number of SKUs recorded.
+        """
+        if zoey_df.empty or 'id' not in zoey_df.columns:
+            logging.warning("Zoey product listing has no 'id' column. The SKU index was not seeded.")
+            return 0
+
+        if 'sku' in zoey_df.columns:
+            skus = zoey_df['sku']
+        elif 'variants' in zoey_df.columns:
+            skus = zoey_df['variants'].map(
+                lambda variants: variants[0].get('sku') if isinstance(variants, list) and variants else None
+            )
+        else:
+            logging.warning("Zoey product listing has no SKUs. The SKU index was not seeded.")
+            return 0
+
+        mapping = {sku: product_id for sku, product_id in zip(skus, zoey_df['id']) if sku}
+        self.update(mapping)
+        logging.info(f"Seeded the Zoey SKU index with {len(mapping)} products.")
+        return len(mapping)
+
+    def __len__(self):
+        if not os.path.exists(self.path):
+            return 0
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM zoey_products").fetchone()[0]
+
+    def clear(self):
+        """
+        Removes every entry, e.g. after products were deleted in Zoey.
+        """
+        if not os.path.exists(self.path):
+            return
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute("DELETE FROM zoey_products")
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+# Shared index used by the sync jobs
+zoey_product_index = ZoeyProductIndex()
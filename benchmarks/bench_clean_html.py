@@ -0,0 +1,52 @@
+# benchmarks/bench_clean_html.py
+#
+# Compares per-row `Series.apply(clean_html)` with the factorized `clean_html_series`.
+#
+# Usage: python -m benchmarks.bench_clean_html [--rows 1000000] [--unique 20000]
+
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from data_mapping.common_mapping import clean_html, clean_html_series
+
+
+def build_descriptions(rows, unique):
+    """
+    Builds `rows` HTML descriptions drawn from `unique` distinct bodies, like variants sharing a product body.
+    """
+    bodies = [
+        f"<p>Product {i} &amp; friends</p><p>Made from <b>organic</b> cotton.<br/>Size&nbsp;chart   below.</p>"
+        for i in range(unique)
+    ]
+    rng = np.random.default_rng(0)
+    return pd.Series(np.array(bodies, dtype=object)[rng.integers(0, unique, rows)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark per-row vs factorized HTML cleaning.')
+    parser.add_argument('--rows', type=int, default=1_000_000, help='Number of rows to clean.')
+    parser.add_argument('--unique', type=int, default=20_000, help='Number of distinct descriptions.')
+    args = parser.parse_args()
+
+    descriptions = build_descriptions(args.rows, args.unique)
+
+    start = time.perf_counter()
+    per_row = descriptions.apply(clean_html)
+    apply_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    vectorized = clean_html_series(descriptions)
+    series_seconds = time.perf_counter() - start
+
+    if not (per_row == vectorized).all():
+        raise RuntimeError("clean_html_series output differs from clean_html.")
+
+    print(f"Rows: {args.rows:,} ({args.unique:,} distinct)")
+    print(f"Series.apply(clean_html): {apply_seconds:.2f}s")
+    print(f"clean_html_series:        {series_seconds:.2f}s")
+    print(f"Speedup:                  {apply_seconds / series_seconds:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+# benchmarks/bench_dtypes.py
+#
+# Measures the memory of a mapped Zoey catalog before and after `optimize_dtypes`.
+#
+# Usage: python -m benchmarks.bench_dtypes [--rows 1000000]
+
+import argparse
+import logging
+import time
+import numpy as np
+import pandas as pd
+from data_mapping.common_mapping import optimize_dtypes
+from data_mapping.zoey_mapping import map_output_to_zoey_csv
+
+
+def build_shopify_items(rows):
+    """
+    Builds `rows` Shopify export rows with object-dtype text columns, as read from Excel.
+    """
+    rng = np.random.default_rng(0)
+    ids = np.arange(rows)
+    text = lambda values: pd.Series(values, dtype=object)
+    return pd.DataFrame({
+        'Handle': text([f"product-{i}" for i in ids]),
+        'Title': text([f"Product {i}" for i in ids]),
+        'Body (HTML)': text([f"<p>Description of product {i}</p>" for i in ids]),
+        'Vendor': text(np.array(['Acme', 'Globex', 'Initech', 'Umbrella'], dtype=object)[rng.integers(0, 4, rows)]),
+        'Type': text(np.array(['Shirts', 'Hats', 'Shoes'], dtype=object)[rng.integers(0, 3, rows)]),
+        'SKU': text([f"SKU-{i:08d}" for i in ids]),
+        'Variant Price': rng.uniform(1, 500, rows).round(2),
+        'Variant Inventory Qty': rng.integers(0, 1000, rows),
+        'Image Src': text([f"https://cdn.example.com/{i}.jpg" for i in ids]),
+    })
+
+
+def megabytes(df):
+    return df.memory_usage(deep=True).sum() / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the memory of mapped catalogs before and after dtype optimization.')
+    parser.add_argument('--rows', type=int, default=1_000_000, help='Number of products.')
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    mapped = map_output_to_zoey_csv(build_shopify_items(args.rows)).astype(object)
+    before = megabytes(mapped)
+
+    start = time.perf_counter()
+    optimized = optimize_dtypes(mapped)
+    seconds = time.perf_counter() - start
+    after = megabytes(optimized)
+
+    print(f"Rows: {args.rows:,}")
+    print(f"Object columns:   {before:,.1f} MB")
+    print(f"optimize_dtypes:  {after:,.1f} MB ({(1 - after / before) * 100:.0f}% less, {seconds:.2f}s)")
+
+
+if __name__ == '__main__':
+    main()
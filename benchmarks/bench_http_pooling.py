@@ -0,0 +1,85 @@
+# benchmarks/bench_http_pooling.py
+#
+# Compares requests/second of a Zoey export with and without pooled keep-alive sessions.
+#
+# Usage: python -m benchmarks.bench_http_pooling [--products 10000]
+
+import argparse
+import logging
+import os
+import time
+from unittest.mock import patch
+import pandas as pd
+import requests
+from adapters import common_adapter
+from adapters.zoey_adapter import export_to_zoey
+from benchmarks.stub_server import start_stub_server
+
+
+def build_products(count):
+    """
+    Builds a DataFrame of `count` synthetic products in the format expected by `export_to_zoey`.
+    """
+    return pd.DataFrame({
+        'Handle': [f'product-{i}' for i in range(count)],
+        'Title': [f'Product {i}' for i in range(count)],
+        'Description': ['Benchmark product'] * count,
+        'Vendor': ['Vendor'] * count,
+        'Type': ['Product'] * count,
+        'Tags': [''] * count,
+        'Published': [True] * count,
+        'SKU': [f'SKU{i:06d}' for i in range(count)],
+        'Price': [9.99] * count,
+        'Inventory Quantity': [1] * count,
+        'Barcode': [''] * count,
+        'Image URL': [''] * count,
+        'Image Alt Text': [''] * count,
+    })
+
+
+def run_export(df, api_url, pooled):
+    """
+    Runs `export_to_zoey` against the stub server and returns the achieved requests/second.
+    """
+    if pooled:
+        common_adapter.close_sessions()
+        start = time.perf_counter()
+        ok = export_to_zoey(df, api_url=api_url)
+    else:
+        # The `requests` module exposes the same `request` signature as a Session but
+        # opens (and closes) a fresh connection for every call, i.e. the unpooled behaviour.
+        with patch.object(common_adapter, 'get_session', lambda url: requests):
+            start = time.perf_counter()
+            ok = export_to_zoey(df, api_url=api_url)
+    elapsed = time.perf_counter() - start
+    if not ok:
+        raise RuntimeError("Export against the stub server failed.")
+    return len(df) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark pooled vs unpooled HTTP sessions for a Zoey export.')
+    parser.add_argument('--products', type=int, default=10000, help='Number of products to export.')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    os.environ.setdefault('ZOEY_API_KEY', 'benchmark')
+
+    server, base_url = start_stub_server()
+    try:
+        df = build_products(args.products)
+        api_url = f"{base_url}/v1/products"
+        unpooled = run_export(df, api_url, pooled=False)
+        pooled = run_export(df, api_url, pooled=True)
+    finally:
+        server.shutdown()
+        common_adapter.close_sessions()
+
+    print(f"Products exported:   {args.products}")
+    print(f"Without pooling:     {unpooled:,.0f} requests/s")
+    print(f"With pooled session: {pooled:,.0f} requests/s")
+    print(f"Speedup:             {pooled / unpooled:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+# benchmarks/bench_mapping.py
+#
+# Compares the hand-written column-by-column mappings (kept below as legacy copies) with the
+# compiled mapping specs used by `map_to_shopify`, `map_to_zoey` and `map_output_to_zoey_csv`.
+#
+# Usage: python -m benchmarks.bench_mapping [--rows 1000000] [--repeat 3]
+
+import argparse
+import logging
+import time
+import numpy as np
+import pandas as pd
+from data_mapping import netsuite_mapping, zoey_mapping
+
+
+def legacy_map_to_shopify(netsuite_df):
+    shopify_df = pd.DataFrame()
+    shopify_df['Handle'] = pd.Series(netsuite_df.get('title', '')).str.lower().str.replace(' ', '-').str.replace('/', '-')
+    shopify_df['Title'] = pd.Series(netsuite_df.get('title', ''))
+    shopify_df['Body (HTML)'] = pd.Series(netsuite_df.get('description', ''))
+    shopify_df['Vendor'] = pd.Series(netsuite_df.get('vendor', 'Unknown'))
+    shopify_df['Type'] = pd.Series(netsuite_df.get('type', 'Product'))
+    shopify_df['Tags'] = pd.Series(netsuite_df.get('tags', ''))
+    shopify_df['Published'] = pd.Series([True] * len(shopify_df))
+    shopify_df['Variant SKU'] = pd.Series(netsuite_df.get('variant sku', ''))
+    shopify_df['Variant Price'] = pd.Series(netsuite_df.get('variant price', 0.0)).fillna(0.0)
+    shopify_df['Variant Inventory Qty'] = pd.Series(netsuite_df.get('inventory_qty', 0)).fillna(0)
+    shopify_df['Variant Barcode'] = pd.Series(netsuite_df.get('barcode', ''))
+    return shopify_df
+
+
+def legacy_map_to_zoey(netsuite_df):
+    zoey_df = pd.DataFrame()
+    zoey_df['Handle'] = pd.Series(netsuite_df.get('title', '')).str.lower().str.replace(' ', '-').str.replace('/', '-')
+    zoey_df['Title'] = pd.Series(netsuite_df.get('title', ''))
+    zoey_df['Description'] = pd.Series(netsuite_df.get('description', ''))
+    zoey_df['Vendor'] = pd.Series(netsuite_df.get('vendor', 'Unknown'))
+    zoey_df['Type'] = pd.Series(netsuite_df.get('type', 'Product'))
+    zoey_df['Tags'] = pd.Series(netsuite_df.get('tags', ''))
+    zoey_df['Published'] = pd.Series([True] * len(zoey_df))
+    zoey_df['SKU'] = pd.Series(netsuite_df.get('variant sku', ''))
+    zoey_df['Price'] = pd.Series(netsuite_df.get('variant price', 0.0)).fillna(0.0)
+    zoey_df['Inventory Quantity'] = pd.Series(netsuite_df.get('inventory_qty', 0)).fillna(0)
+    zoey_df['Barcode'] = pd.Series(netsuite_df.get('barcode', ''))
+    zoey_df['Image URL'] = pd.Series(netsuite_df.get('image_url', ''))
+    zoey_df['Image Alt Text'] = pd.Series(netsuite_df.get('image_alt_text', ''))
+    return zoey_df
+
+
+def legacy_zoey_csv_columns(df):
+    """
+    Step 4 of the former `map_output_to_zoey_csv` (the shared normalize/clean/fill steps are not timed).
+    """
+    zoey_csv_df = pd.DataFrame()
+    zoey_csv_df['sku'] = df.get('sku', '')
+    zoey_csv_df['_type'] = df.get('_type', 'simple')
+    zoey_csv_df['name'] = df.get('title', '')
+    zoey_csv_df['description'] = df.get('body_html', '')
+    zoey_csv_df['price'] = df.get('variant_price', 0.0)
+    zoey_csv_df['status'] = df.get('status', 1)
+    zoey_csv_df['qty'] = df.get('variant_inventory_qty', 0)
+    zoey_csv_df['visibility'] = df.get('visibility', 4)
+    zoey_csv_df['use_config_manage_stock'] = df.get('use_config_manage_stock', 1)
+    zoey_csv_df['is_in_stock'] = df.get('is_in_stock', 1)
+    zoey_csv_df['manage_stock'] = df.get('manage_stock', 1)
+    zoey_csv_df['tax_class_id'] = df.get('tax_class_id', 2)
+    zoey_csv_df['weight'] = df.get('variant_weight_unit', 0.0)
+    zoey_csv_df['barcode'] = df.get('barcode', '')
+    zoey_csv_df['brand'] = df.get('brand', '')
+    zoey_csv_df['color'] = df.get('color', '')
+    zoey_csv_df['url_key'] = df.get('url_key', '')
+    zoey_csv_df['image'] = df.get('image_src', '')
+    zoey_csv_df['_media_image'] = df.get('image_src', '')
+    zoey_csv_df['category_ids'] = df.get('category_ids', '')
+    zoey_csv_df['use_config_enable_qty_inc'] = df.get('use_config_enable_qty_inc', 1)
+    zoey_csv_df['enable_qty_increments'] = df.get('enable_qty_increments', 1)
+    zoey_csv_df['use_config_qty_increments'] = df.get('use_config_qty_increments', 1)
+    zoey_csv_df['qty_increments'] = df.get('qty_increments', 0)
+    zoey_csv_df['zoey_add_to_cart_qty'] = df.get('zoey_add_to_cart_qty', 1)
+    return zoey_csv_df
+
+
+def build_netsuite_items(rows):
+    """
+    Builds `rows` NetSuite items with every mapped column present: the hand-written mappings
+    misalign a column whose source is missing, so outputs could not be compared otherwise.
+    """
+    rng = np.random.default_rng(0)
+    ids = np.arange(rows)
+    prices = rng.uniform(1, 500, rows).round(2)
+    prices[::50] = np.nan
+    return pd.DataFrame({
+        'title': [f"Product {i} Tee/Shirt" for i in ids],
+        'description': [f"<p>Description of product {i}</p>" for i in ids],
+        'vendor': 'Acme',
+        'type': 'Apparel',
+        'tags': 'cotton, summer',
+        'variant sku': [f"SKU-{i:08d}" for i in ids],
+        'variant price': prices,
+        'inventory_qty': rng.integers(0, 1000, rows),
+        'barcode': [f"{i:012d}" for i in ids],
+        'image_url': [f"https://cdn.example.com/{i}.jpg" for i in ids],
+        'image_alt_text': [f"Product {i}" for i in ids],
+    })
+
+
+def build_normalized_items(rows):
+    """
+    Source frame as `map_output_to_zoey_csv` sees it after normalization and filling.
+    """
+    items = build_netsuite_items(rows).rename(columns={
+        'variant sku': 'sku', 'variant price': 'variant_price', 'inventory_qty': 'variant_inventory_qty',
+        'description': 'body_html', 'image_url': 'image_src',
+    })
+    items['variant_price'] = items['variant_price'].fillna(0.0)
+    return items
+
+
+def best_of(repeat, fn, *args):
+    best, result = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark hand-written vs compiled product mappings.')
+    parser.add_argument('--rows', type=int, default=1_000_000, help='Number of products to map.')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per mapping; the best time is reported.')
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    netsuite_items = build_netsuite_items(args.rows)
+    normalized_items = build_normalized_items(args.rows)
+    cases = [
+        ('NetSuite -> Shopify', legacy_map_to_shopify, netsuite_mapping.map_to_shopify, netsuite_items),
+        ('NetSuite -> Zoey', legacy_map_to_zoey, netsuite_mapping.map_to_zoey, netsuite_items),
+        ('Zoey CSV columns', legacy_zoey_csv_columns, zoey_mapping._to_zoey_csv, normalized_items),
+    ]
+
+    print(f"Rows: {args.rows:,}")
+    for name, legacy, compiled, source in cases:
+        legacy_seconds, expected = best_of(args.repeat, legacy, source)
+        compiled_seconds, actual = best_of(args.repeat, compiled, source)
+        pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+        print(f"{name:<20} hand-written: {legacy_seconds:.3f}s  compiled spec: {compiled_seconds:.3f}s  "
+              f"speedup: {legacy_seconds / compiled_seconds:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
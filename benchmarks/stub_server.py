@@ -0,0 +1,48 @@
+# benchmarks/stub_server.py
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """
+    Minimal keep-alive JSON endpoint that accepts any GET/POST and answers with a small JSON body.
+    """
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written separately; without TCP_NODELAY, Nagle plus delayed ACKs
+    # would add ~40ms to every keep-alive response and distort the comparison.
+    disable_nagle_algorithm = True
+
+    def _reply(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._reply(200, {'items': []})
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        self.rfile.read(length)
+        self._reply(201, {'id': 1})
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server(handler=_StubHandler):
+    """
+    Starts a threaded stub HTTP server on a free local port.
+
+    Returns:
+        tuple: (server, base_url). Call `server.shutdown()` when done.
+    """
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
@@ -2,7 +2,7 @@
 
 import os
 import sys
-import pandas as pd
+from adapters.file_reader import read_tabular
 from data_mapping import map_to_shopify, map_netsuite_to_zoey, map_shopify_to_zoey
 import logging
 
@@ -22,7 +22,7 @@ def convert_product(source_format, destination_format, source_file_path, output_
     try:
         # Load the source file
         logging.info(f"Loading source file: {source_file_path}")
-        source_df = pd.read_excel(source_file_path)
+        source_df = read_tabular(source_file_path)
 
         # Select the appropriate mapping function based on the formats
         if source_format == 'shopify' and destination_format == 'netsuite':
@@ -1,7 +1,10 @@
 # data_mapping/__init__.py
 
 # Importing shared utilities from common_mapping
-from .common_mapping import clean_html, normalize_column_names, fill_missing_values
+from .common_mapping import clean_html, clean_html_series, normalize_column_names, fill_missing_values, optimize_dtypes
+
+# Declarative mapping specs and their compiler
+from .mapping_spec import FieldSpec, MappingPlan, LazyFrame, compile_mapping
 
 # Importing specific mapping functions for each platform
 from .shopify_mapping import map_to_zoey as map_shopify_to_zoey
@@ -9,3 +12,6 @@ from .netsuite_mapping import map_to_shopify, map_to_zoey as map_netsuite_to_zoe
 
 # Importing Zoey-specific CSV mapping function
 from .zoey_mapping import map_output_to_zoey_csv, generate_mock_zoey_csv
+
+# Catalog validation run before export
+from .validation import ValidationRule, VALIDATION_RULES, validate_products, save_quarantine
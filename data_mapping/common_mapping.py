@@ -1,10 +1,56 @@
 import pandas as pd
+import numpy as np
+import html
 import re
 import logging
+from data_mapping.mapping_spec import LazyFrame
+
+# HTML cleanup rules shared by `clean_html` and `clean_html_series`, applied in this order
+_BREAK_TAGS = re.compile(r'<\s*(?:br|/?p)\b[^>]*>', re.IGNORECASE)  # <br>, <p> and </p> become line breaks
+_HTML_TAGS = re.compile(r'<[^>]+>')                                 # Any other tag is removed
+_INLINE_WHITESPACE = re.compile(r'[^\S\n]+')                        # Runs of spaces/tabs/nbsp become one space
+_LINE_BREAKS = re.compile(r' ?\n\s*')                               # Blank lines and indentation collapse to one break
+
+# Column types set by `optimize_dtypes`. They are fixed per column rather than chosen from the
+# values, so every chunk of a catalog ends up with the same schema (and the same `schema_hash`).
+# Columns with few distinct values across a catalog, stored as categoricals
+CATEGORICAL_COLUMNS = ['Vendor', 'Type', '_type', 'tax_class_id', 'vendor', 'type']
+# Zoey flags and small enumerations
+INT8_COLUMNS = [
+    'status', 'visibility', 'is_in_stock', 'manage_stock', 'use_config_manage_stock',
+    'use_config_enable_qty_inc', 'enable_qty_increments', 'use_config_qty_increments',
+]
+# Stock quantities
+INT32_COLUMNS = [
+    'qty', 'qty_increments', 'zoey_add_to_cart_qty', 'inventory_qty', 'variant_inventory_qty',
+    'Variant Inventory Qty', 'Inventory Quantity',
+]
+COLUMN_DTYPES = {
+    **{column: 'category' for column in CATEGORICAL_COLUMNS},
+    **{column: np.dtype('int8') for column in INT8_COLUMNS},
+    **{column: np.dtype('int32') for column in INT32_COLUMNS},
+}
+
+def _arrow_string_dtype():
+    """
+    Returns the pyarrow-backed string dtype, or None if pyarrow is not installed.
+    """
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return None
+    try:
+        # Same missing-value semantics as object columns (NaN)
+        return pd.StringDtype('pyarrow', na_value=np.nan)
+    except TypeError:
+        return pd.StringDtype('pyarrow')
+
+ARROW_STRING_DTYPE = _arrow_string_dtype()
 
 def clean_html(html_content):
     """
     Cleans HTML content by removing HTML tags and stripping whitespace.
+    `<br>` and paragraph tags become line breaks, entities are decoded and whitespace is collapsed.
 
     Parameters:
         html_content (str): HTML content to clean.
@@ -12,16 +58,123 @@ def clean_html(html_content):
     Returns:
         str: Cleaned text without HTML tags.
     """
-    if not html_content:
+    if not html_content or not isinstance(html_content, str):
         return ""
-    # Remove HTML tags using regular expressions
-    clean_text = re.sub(r'<[^>]+>', '', html_content)
-    
-    # Remove leading and trailing whitespace
+    # Turn line-break tags into newlines, then remove the remaining HTML tags
+    clean_text = _BREAK_TAGS.sub('\n', html_content)
+    clean_text = _HTML_TAGS.sub('', clean_text)
+
+    # Decode entities after tag removal so escaped markup stays as text
+    clean_text = html.unescape(clean_text)
+
+    # Collapse whitespace and remove leading and trailing whitespace
+    clean_text = _INLINE_WHITESPACE.sub(' ', clean_text)
+    clean_text = _LINE_BREAKS.sub('\n', clean_text)
     clean_text = clean_text.strip()
     
     return clean_text
 
+def clean_html_series(series):
+    """
+    Vectorized `clean_html` for a whole column. Duplicate values (e.g. variants sharing a
+    product body) are factorized first, so each distinct description is cleaned only once
+    and the results are broadcast back to every row.
+
+    Parameters:
+        series (pandas.Series): Column of HTML content. Missing and non-string values become ''.
+
+    Returns:
+        pandas.Series: Cleaned text, aligned with the input index.
+    """
+    codes, uniques = pd.factorize(series)
+    uniques = pd.Series(uniques, dtype=object)
+    uniques = uniques.where(uniques.map(type) == str, '')
+
+    cleaned = (
+        uniques
+        .str.replace(_BREAK_TAGS, '\n', regex=True)
+        .str.replace(_HTML_TAGS, '', regex=True)
+        .map(html.unescape)
+        .str.replace(_INLINE_WHITESPACE, ' ', regex=True)
+        .str.replace(_LINE_BREAKS, '\n', regex=True)
+        .str.strip()
+    )
+
+    # Missing values are coded -1 by factorize and pick up the trailing empty string
+    lookup = np.append(cleaned.to_numpy(dtype=object), '')
+    return pd.Series(lookup[codes], index=series.index, name=series.name)
+
+def _optimized_dtype(series, dtype):
+    """
+    Returns the type to store one column as, or None to keep it as is.
+    `dtype` is the column's entry in COLUMN_DTYPES, or None for columns not listed there.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype) or pd.api.types.is_bool_dtype(series.dtype):
+        return None
+    if isinstance(dtype, str) and dtype == 'category':
+        return dtype
+
+    if dtype is not None:
+        # Numbers parsed from JSON or Excel often arrive in object columns
+        if series.dtype == object and pd.api.types.infer_dtype(series, skipna=True) in ('integer', 'mixed-integer-float', 'floating'):
+            series = pd.to_numeric(series)
+        if not pd.api.types.is_integer_dtype(series.dtype) and not (
+                pd.api.types.is_float_dtype(series.dtype) and series.notna().all() and (series % 1 == 0).all()):
+            return None
+        limits = np.iinfo(dtype)
+        if series.min() < limits.min or series.max() > limits.max:
+            logging.warning(f"Column '{series.name}' does not fit {dtype}; keeping {series.dtype}.")
+            return None
+        return dtype
+
+    is_text = pd.api.types.is_string_dtype(series.dtype) and pd.api.types.infer_dtype(series, skipna=True) in ('string', 'empty')
+    if is_text and ARROW_STRING_DTYPE is not None and series.dtype != ARROW_STRING_DTYPE:
+        return ARROW_STRING_DTYPE
+    return None
+
+def optimize_dtypes(df, label='products'):
+    """
+    Shrinks the memory of a product frame after ingest or mapping:
+    - CATEGORICAL_COLUMNS become categoricals,
+    - flags and quantities (INT8_COLUMNS, INT32_COLUMNS) become int8/int32 when their values fit,
+    - other text columns use pyarrow-backed strings (when pyarrow is installed),
+    - floats and unlisted numeric columns are left as they are.
+
+    Types depend on the column, not on the values of the frame, so chunks of one catalog share
+    a schema. Values are unchanged, so payloads built from the frame stay the same.
+
+    Parameters:
+        df (pandas.DataFrame): Product data. For a `LazyFrame`, only the non-constant columns are optimized.
+        label (str): Name of the data in the memory report logged before and after.
+
+    Returns:
+        pandas.DataFrame: Data with optimized column types.
+    """
+    if isinstance(df, LazyFrame):
+        return df.with_data(optimize_dtypes(df.data, label))
+    if df.empty:
+        return df
+    dtypes = {}
+    for column in df.columns.unique():
+        series = df[column]
+        if isinstance(series, pd.DataFrame):
+            continue  # Duplicate column names
+        dtype = _optimized_dtype(series, COLUMN_DTYPES.get(column))
+        if dtype is not None and dtype != series.dtype:
+            dtypes[column] = dtype
+    if not dtypes:
+        return df
+
+    # Deep memory usage scans every Python string, so it is only measured for the report
+    report = logging.getLogger().isEnabledFor(logging.INFO)
+    before = df.memory_usage(deep=True).sum() if report else 0
+    df = df.astype(dtypes)
+    if report:
+        after = df.memory_usage(deep=True).sum()
+        logging.info(f"Optimized {len(dtypes)} column types of {label}: {before / 1e6:.1f} MB -> "
+                     f"{after / 1e6:.1f} MB ({(1 - after / before) * 100 if before else 0:.0f}% less).")
+    return df
+
 def normalize_column_names(df):
     """
     Normalizes the column names of a DataFrame by converting them to lowercase,
@@ -42,6 +195,18 @@ def normalize_column_names(df):
     logging.info(f"Normalized columns: {df.columns.tolist()}")
     return df
 
+def normalize_column_name(name):
+    """
+    Normalizes a single column name with the same rules as `normalize_column_names`.
+
+    Parameters:
+        name (str): Column name to normalize.
+
+    Returns:
+        str: Normalized column name.
+    """
+    return re.sub(r'[()]', '', name.lower().replace(' ', '_'))
+
 def fill_missing_values(df):
     """
     Fills missing values in a DataFrame based on the column data types.
@@ -55,12 +220,19 @@ def fill_missing_values(df):
     try:
         # Isolate columns based on data type
         object_columns = df.select_dtypes(include='object').columns
-        numeric_columns = df.select_dtypes(include=['float64', 'int64']).columns
+        numeric_columns = df.select_dtypes(include='number').columns
+        category_columns = df.select_dtypes(include='category').columns
 
         # Fill missing values for object columns with empty strings, using .loc to avoid misalignment
         for col in object_columns:
             if col in df.columns:
                 df.loc[:, col] = df[col].fillna('')
+
+        # Categoricals (see `optimize_dtypes`) need the empty string as a category first
+        for col in category_columns:
+            if df[col].hasnans:
+                categories = df[col].cat.categories
+                df[col] = (df[col] if '' in categories else df[col].cat.add_categories('')).fillna('')
         
         # Fill missing values for numeric columns with 0, using .loc to ensure alignment
         for col in numeric_columns:
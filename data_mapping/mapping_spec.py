@@ -0,0 +1,208 @@
+# data_mapping/mapping_spec.py
+
+import os
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, Union
+import numpy as np
+import pandas as pd
+
+# Rows expanded at a time when a `LazyFrame` is written
+LAZY_WRITE_CHUNK_ROWS = int(os.getenv('LAZY_WRITE_CHUNK_ROWS', '50000'))
+
+
+@dataclass(frozen=True)
+class FieldSpec:
+    """
+    One output column of a declarative mapping spec.
+
+    Attributes:
+        target (str): Output column name.
+        source (str): Input column to read, or a tuple of candidate columns of which the first
+            present one is read. None for a constant column.
+        default: Value used for every row when `source` is None or missing from the input.
+            With `fillna`, it also replaces missing values of the source column.
+        transform (callable): Vectorized function applied to the source column (a Series in,
+            a Series or array of the same length out). It is not applied to the default.
+        fillna (bool): Replace missing values of the (transformed) source column with `default`.
+    """
+    target: str
+    source: Optional[Union[str, tuple]] = None
+    default: Any = ''
+    transform: Optional[Callable] = None
+    fillna: bool = False
+
+
+class LazyFrame:
+    """
+    Mapped data whose constant columns (defaults for missing sources, fixed flags) are kept as
+    scalars instead of per-row arrays. Returned by `MappingPlan(df, lazy=True)`.
+
+    Supports the parts of the DataFrame API used by the writers and exporters: `columns`,
+    `index`, `empty`, `len()`, column access (which expands a constant column), boolean row
+    selection, and `to_csv`/`to_json`/`to_excel`. The CSV and JSON writers expand constants one
+    chunk of LAZY_WRITE_CHUNK_ROWS rows at a time; `to_frame()` materializes everything.
+
+    Attributes:
+        data (pandas.DataFrame): Columns read from the source.
+        constants (dict): Column -> scalar value shared by every row.
+    """
+
+    def __init__(self, data, constants, columns):
+        self.data = data
+        self.constants = dict(constants)
+        self.columns = pd.Index(columns)
+
+    @property
+    def index(self):
+        return self.data.index
+
+    @property
+    def empty(self):
+        return len(self.index) == 0 or len(self.columns) == 0
+
+    @property
+    def shape(self):
+        return (len(self.index), len(self.columns))
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, column):
+        return column in self.columns
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            if key in self.constants:
+                return pd.Series(self.constants[key], index=self.index, name=key)
+            return self.data[key]
+        # Boolean row selection keeps constants lazy
+        return LazyFrame(self.data[key], self.constants, self.columns)
+
+    def get(self, column, default=None):
+        return self[column] if column in self.columns else default
+
+    def with_data(self, data):
+        """
+        Returns a LazyFrame with the same constants and `data` as the source columns.
+        """
+        return LazyFrame(data, self.constants, self.columns)
+
+    def _expand(self, data):
+        return pd.DataFrame({**{column: data[column].array for column in data.columns}, **self.constants},
+                            index=data.index, columns=self.columns, copy=False)
+
+    def to_frame(self):
+        """
+        Returns the data as a regular DataFrame, with every constant expanded.
+        """
+        return self._expand(self.data)
+
+    def iter_frames(self, chunk_size=LAZY_WRITE_CHUNK_ROWS):
+        """
+        Yields the data as DataFrames of at most `chunk_size` rows, expanding constants per chunk.
+        """
+        for start in range(0, len(self.data), chunk_size):
+            yield self._expand(self.data.iloc[start:start + chunk_size])
+
+    def to_csv(self, path_or_buf, index=False, header=True, encoding='utf-8', chunk_size=LAZY_WRITE_CHUNK_ROWS, **kwargs):
+        """
+        Writes the data to a CSV file (or an open text file) chunk by chunk; same output as
+        `to_frame().to_csv(...)`.
+        """
+        if not hasattr(path_or_buf, 'write'):
+            with open(path_or_buf, 'w', newline='', encoding=encoding) as handle:
+                return self.to_csv(handle, index=index, header=header, chunk_size=chunk_size, **kwargs)
+        if self.empty and header:
+            pd.DataFrame(columns=self.columns).to_csv(path_or_buf, index=index, **kwargs)
+        for number, frame in enumerate(self.iter_frames(chunk_size)):
+            frame.to_csv(path_or_buf, index=index, header=header and number == 0, **kwargs)
+
+    def to_json(self, path, orient='records', lines=True, chunk_size=LAZY_WRITE_CHUNK_ROWS, **kwargs):
+        """
+        Writes the data as JSON lines chunk by chunk. Other layouts are written from `to_frame()`.
+        """
+        if orient != 'records' or not lines:
+            return self.to_frame().to_json(path, orient=orient, lines=lines, **kwargs)
+        with open(path, 'w', encoding='utf-8') as handle:
+            for frame in self.iter_frames(chunk_size):
+                text = frame.to_json(orient='records', lines=True, **kwargs)
+                handle.write(text if text.endswith('\n') else text + '\n')
+
+    def to_excel(self, *args, **kwargs):
+        return self.to_frame().to_excel(*args, **kwargs)
+
+
+class MappingPlan:
+    """
+    A mapping spec compiled into a single vectorized plan.
+
+    Output columns reading the same source with the same transform are computed once. Source
+    values are taken positionally (never aligned on the index), constants are broadcast by the
+    DataFrame constructor, and the output frame is built in one allocation with the input's index.
+    """
+
+    def __init__(self, spec):
+        self.fields = tuple(spec)
+        self.columns = [field.target for field in self.fields]
+        duplicates = sorted({name for name in self.columns if self.columns.count(name) > 1})
+        if duplicates:
+            raise ValueError(f"Mapping spec has duplicate output columns: {duplicates}")
+
+        # Group output columns by the expression that produces them
+        self._steps = {}
+        for field in self.fields:
+            key = (field.source, field.transform, field.fillna, field.default)
+            self._steps.setdefault(key, []).append(field.target)
+
+    def _evaluate(self, df, source, transform, fillna, default):
+        if isinstance(source, tuple):
+            source = next((column for column in source if column in df.columns), None)
+        if source is None or source not in df.columns:
+            return default
+
+        values = df[source]
+        if transform is not None:
+            values = transform(values)
+        if not isinstance(values, pd.Series):
+            values = pd.Series(np.asarray(values), index=df.index)
+        if len(values) != len(df):
+            raise ValueError(f"Transform of '{source}' returned {len(values)} values for {len(df)} rows.")
+        if fillna:
+            values = values.fillna(default)
+        return values.array
+
+    def __call__(self, df, lazy=False):
+        """
+        Applies the plan to `df`.
+
+        Parameters:
+            df (pandas.DataFrame): Source data.
+            lazy (bool): Keep constant columns as scalars and return a `LazyFrame`.
+
+        Returns:
+            pandas.DataFrame: Mapped data with the spec's columns, in spec order, and the index of `df`
+                (a `LazyFrame` if `lazy`).
+        """
+        data = {}
+        constants = {}
+        for (source, transform, fillna, default), targets in self._steps.items():
+            value = self._evaluate(df, source, transform, fillna, default)
+            for target in targets:
+                (data if isinstance(value, pd.api.extensions.ExtensionArray) else constants)[target] = value
+        if lazy:
+            columns = [column for column in self.columns if column in data]
+            return LazyFrame(pd.DataFrame(data, index=df.index, columns=columns, copy=False), constants, self.columns)
+        return pd.DataFrame({**data, **constants}, index=df.index, columns=self.columns, copy=False)
+
+
+def compile_mapping(spec):
+    """
+    Compiles a mapping spec (a sequence of `FieldSpec`) into a reusable `MappingPlan`.
+
+    Parameters:
+        spec (iterable): Output columns, in order.
+
+    Returns:
+        MappingPlan: Callable taking a source DataFrame and returning the mapped DataFrame.
+    """
+    return MappingPlan(spec)
@@ -1,5 +1,49 @@
 import pandas as pd
 import logging
+from data_mapping.mapping_spec import FieldSpec, compile_mapping
+
+
+def _handle_from_title(titles):
+    """
+    Builds URL handles from product titles: lowercase, with spaces and slashes replaced by dashes.
+    """
+    return titles.str.lower().str.replace(' ', '-').str.replace('/', '-')
+
+
+# NetSuite -> Shopify product CSV columns
+NETSUITE_TO_SHOPIFY_SPEC = [
+    FieldSpec('Handle', 'title', transform=_handle_from_title),
+    FieldSpec('Title', 'title'),
+    FieldSpec('Body (HTML)', 'description'),
+    FieldSpec('Vendor', 'vendor', default='Unknown'),
+    FieldSpec('Type', 'type', default='Product'),
+    FieldSpec('Tags', 'tags'),
+    FieldSpec('Published', default=True),
+    FieldSpec('Variant SKU', 'variant sku'),
+    FieldSpec('Variant Price', 'variant price', default=0.0, fillna=True),
+    FieldSpec('Variant Inventory Qty', 'inventory_qty', default=0, fillna=True),
+    FieldSpec('Variant Barcode', 'barcode'),
+]
+
+# NetSuite -> Zoey product columns
+NETSUITE_TO_ZOEY_SPEC = [
+    FieldSpec('Handle', 'title', transform=_handle_from_title),
+    FieldSpec('Title', 'title'),
+    FieldSpec('Description', 'description'),
+    FieldSpec('Vendor', 'vendor', default='Unknown'),
+    FieldSpec('Type', 'type', default='Product'),
+    FieldSpec('Tags', 'tags'),
+    FieldSpec('Published', default=True),
+    FieldSpec('SKU', 'variant sku'),
+    FieldSpec('Price', 'variant price', default=0.0, fillna=True),
+    FieldSpec('Inventory Quantity', 'inventory_qty', default=0, fillna=True),
+    FieldSpec('Barcode', 'barcode'),
+    FieldSpec('Image URL', 'image_url'),
+    FieldSpec('Image Alt Text', 'image_alt_text'),
+]
+
+_to_shopify = compile_mapping(NETSUITE_TO_SHOPIFY_SPEC)
+_to_zoey = compile_mapping(NETSUITE_TO_ZOEY_SPEC)
 
 def map_to_shopify(netsuite_df):
     """
@@ -9,22 +53,10 @@ def map_to_shopify(netsuite_df):
         netsuite_df (pandas.DataFrame): DataFrame containing product data from NetSuite.
 
     Returns:
-        pandas.DataFrame: Mapped DataFrame formatted for Shopify.
+        pandas.DataFrame: Mapped DataFrame formatted for Shopify (see NETSUITE_TO_SHOPIFY_SPEC).
     """
     try:
-        # Convert all columns to pandas.Series to handle missing values correctly
-        shopify_df = pd.DataFrame()
-        shopify_df['Handle'] = pd.Series(netsuite_df.get('title', '')).str.lower().str.replace(' ', '-').str.replace('/', '-')
-        shopify_df['Title'] = pd.Series(netsuite_df.get('title', ''))
-        shopify_df['Body (HTML)'] = pd.Series(netsuite_df.get('description', ''))  # Use description or empty if not present
-        shopify_df['Vendor'] = pd.Series(netsuite_df.get('vendor', 'Unknown'))
-        shopify_df['Type'] = pd.Series(netsuite_df.get('type', 'Product'))
-        shopify_df['Tags'] = pd.Series(netsuite_df.get('tags', ''))
-        shopify_df['Published'] = pd.Series([True] * len(shopify_df))
-        shopify_df['Variant SKU'] = pd.Series(netsuite_df.get('variant sku', ''))
-        shopify_df['Variant Price'] = pd.Series(netsuite_df.get('variant price', 0.0)).fillna(0.0)  # Fill NaN values with 0.0
-        shopify_df['Variant Inventory Qty'] = pd.Series(netsuite_df.get('inventory_qty', 0)).fillna(0)  # Ensure no NaN in inventory
-        shopify_df['Variant Barcode'] = pd.Series(netsuite_df.get('barcode', ''))
+        shopify_df = _to_shopify(netsuite_df)
 
         logging.info(f"Mapping {len(shopify_df)} products from NetSuite to Shopify format completed successfully.")
         return shopify_df
@@ -45,24 +77,10 @@ def map_to_zoey(netsuite_df):
         netsuite_df (pandas.DataFrame): DataFrame containing product data from NetSuite.
 
     Returns:
-        pandas.DataFrame: Mapped DataFrame formatted for Zoey.
+        pandas.DataFrame: Mapped DataFrame formatted for Zoey (see NETSUITE_TO_ZOEY_SPEC).
     """
     try:
-        # Convert all columns to pandas.Series to handle missing values correctly
-        zoey_df = pd.DataFrame()
-        zoey_df['Handle'] = pd.Series(netsuite_df.get('title', '')).str.lower().str.replace(' ', '-').str.replace('/', '-')
-        zoey_df['Title'] = pd.Series(netsuite_df.get('title', ''))
-        zoey_df['Description'] = pd.Series(netsuite_df.get('description', ''))
-        zoey_df['Vendor'] = pd.Series(netsuite_df.get('vendor', 'Unknown'))
-        zoey_df['Type'] = pd.Series(netsuite_df.get('type', 'Product'))
-        zoey_df['Tags'] = pd.Series(netsuite_df.get('tags', ''))
-        zoey_df['Published'] = pd.Series([True] * len(zoey_df))
-        zoey_df['SKU'] = pd.Series(netsuite_df.get('variant sku', ''))
-        zoey_df['Price'] = pd.Series(netsuite_df.get('variant price', 0.0)).fillna(0.0)  # Fill NaN values with 0.0
-        zoey_df['Inventory Quantity'] = pd.Series(netsuite_df.get('inventory_qty', 0)).fillna(0)  # Ensure no NaN in inventory
-        zoey_df['Barcode'] = pd.Series(netsuite_df.get('barcode', ''))
-        zoey_df['Image URL'] = pd.Series(netsuite_df.get('image_url', ''))
-        zoey_df['Image Alt Text'] = pd.Series(netsuite_df.get('image_alt_text', ''))
+        zoey_df = _to_zoey(netsuite_df)
 
         logging.info(f"Mapping {len(zoey_df)} products from NetSuite to Zoey format completed successfully.")
         return zoey_df
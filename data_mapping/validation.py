@@ -0,0 +1,171 @@
+# data_mapping/validation.py
+
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Callable
+import numpy as np
+import pandas as pd
+from data_mapping.mapping_spec import LazyFrame
+
+# Where rows rejected by `validate_products` are written, with the reasons they failed
+QUARANTINE_FILE = os.getenv('QUARANTINE_FILE', 'quarantined_products.csv')
+
+# Column holding the failed rule descriptions in the quarantine file
+REASON_COLUMN = 'quarantine_reason'
+
+# Candidate column names per field, covering the Zoey CSV, NetSuite and Shopify layouts
+SKU_COLUMNS = ['sku', 'SKU', 'Variant SKU', 'variant sku', 'variant_sku']
+TITLE_COLUMNS = ['name', 'Title', 'title']
+PRICE_COLUMNS = ['price', 'Price', 'Variant Price', 'variant price', 'variant_price']
+BARCODE_COLUMNS = ['barcode', 'Barcode', 'Variant Barcode', 'variant_barcode']
+
+# GS1 check digit weights for a GTIN left-padded to 14 digits (GTIN-8, UPC-A, EAN-13 and GTIN-14)
+_GTIN_WEIGHTS = np.array([3, 1] * 6 + [3], dtype=np.int64)
+
+
+def _text(series):
+    """
+    Returns a column as stripped strings, with missing values as ''. Integral numbers (e.g.
+    barcodes read from Excel as floats) are written without a decimal part.
+    """
+    if pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype):
+        numbers = series.where(series.notna() & (series % 1 == 0))
+        return numbers.astype('Int64').astype(object).where(numbers.notna(), '').astype(str)
+    return series.astype(object).where(series.notna(), '').astype(str).str.strip()
+
+
+def duplicate_skus(column):
+    """
+    Flags every row whose SKU appears more than once; none of them can be exported safely.
+    """
+    skus = _text(column)
+    return (skus != '') & skus.duplicated(keep=False)
+
+
+def non_positive_prices(column):
+    """
+    Flags missing, non-numeric, zero and negative prices.
+    """
+    prices = pd.to_numeric(column, errors='coerce')
+    return ~(prices > 0).fillna(False).astype(bool)
+
+
+def invalid_gtins(column):
+    """
+    Flags barcodes that are not 8, 12, 13 or 14 digits or whose GS1 check digit is wrong.
+    Empty barcodes are allowed. Numeric columns have lost their leading zeros, so any length up
+    to 14 digits is accepted there. The checksum is computed for all rows at once on a digit matrix.
+    """
+    barcodes = _text(column)
+    present = barcodes != ''
+    pattern = r'\d{1,14}' if pd.api.types.is_numeric_dtype(column.dtype) else r'\d{8}|\d{12,14}'
+    well_formed = barcodes.str.fullmatch(pattern).fillna(False).astype(bool)
+
+    candidates = barcodes[well_formed]
+    valid = np.zeros(len(barcodes), dtype=bool)
+    if len(candidates):
+        # Fixed-width byte strings give a (rows x 14) digit matrix, left-aligned and NUL-padded
+        raw = np.frombuffer(candidates.to_numpy(dtype=object).astype('S14').tobytes(), dtype=np.uint8)
+        raw = raw.reshape(-1, 14).astype(np.int64) - ord('0')
+        # Right-align every barcode, which is the same as left-padding it with zeros to GTIN-14
+        positions = np.arange(14) - (14 - candidates.str.len().to_numpy())[:, None]
+        digits = np.where(positions >= 0, np.take_along_axis(raw, positions.clip(0), axis=1), 0)
+        check = (10 - (digits[:, :13] @ _GTIN_WEIGHTS) % 10) % 10
+        valid[well_formed.to_numpy()] = check == digits[:, 13]
+    return present & ~valid
+
+
+def empty_titles(column):
+    """
+    Flags missing and blank titles.
+    """
+    return _text(column) == ''
+
+
+@dataclass(frozen=True)
+class ValidationRule:
+    """
+    A vectorized row check.
+
+    Attributes:
+        name (str): Rule identifier used in logs.
+        reason (str): Message written to the quarantine file for failing rows.
+        columns (list): Candidate column names; the first present one is checked. The rule is
+            skipped if none is present.
+        check (callable): Takes the column as a Series and returns a boolean mask of failing rows.
+    """
+    name: str
+    reason: str
+    columns: list
+    check: Callable
+
+
+VALIDATION_RULES = [
+    ValidationRule('duplicate_sku', 'duplicate SKU', SKU_COLUMNS, duplicate_skus),
+    ValidationRule('non_positive_price', 'missing or non-positive price', PRICE_COLUMNS, non_positive_prices),
+    ValidationRule('invalid_barcode', 'invalid GTIN/EAN barcode check digit', BARCODE_COLUMNS, invalid_gtins),
+    ValidationRule('empty_title', 'empty title', TITLE_COLUMNS, empty_titles),
+]
+
+
+def validate_products(df, rules=None):
+    """
+    Runs the validation rules over mapped products and splits them into valid and quarantined
+    rows. Each rule is one vectorized pass over its column; its duration and failure count are logged.
+
+    Parameters:
+        df (pandas.DataFrame): Mapped products (a `LazyFrame` is accepted as well).
+        rules (list): Rules to apply. Defaults to VALIDATION_RULES.
+
+    Returns:
+        tuple: (valid rows, same type as `df`; quarantined rows as a DataFrame with a REASON_COLUMN).
+    """
+    rules = VALIDATION_RULES if rules is None else rules
+    failed = np.zeros(len(df), dtype=bool)
+    reasons = []
+    for rule in rules:
+        column = next((name for name in rule.columns if name in df.columns), None)
+        if column is None:
+            logging.debug(f"Validation rule '{rule.name}' skipped: none of {rule.columns} present.")
+            continue
+        started = time.perf_counter()
+        mask = np.asarray(rule.check(df[column]), dtype=bool)
+        elapsed = time.perf_counter() - started
+        logging.info(f"Validation rule '{rule.name}' on '{column}': {int(mask.sum())} of {len(df)} rows failed "
+                     f"in {elapsed * 1000:.1f} ms.")
+        failed |= mask
+        reasons.append((rule.reason, mask))
+
+    if not failed.any():
+        return df, pd.DataFrame(columns=list(df.columns) + [REASON_COLUMN])
+
+    quarantined = df[failed]
+    if isinstance(quarantined, LazyFrame):
+        quarantined = quarantined.to_frame()
+    # Join the reasons of the failing rows only, one rule column at a time
+    reason_text = pd.Series('', index=quarantined.index, dtype=object)
+    for reason, mask in reasons:
+        reason_text = reason_text + np.where(mask[failed], reason + '; ', '')
+    quarantined = quarantined.assign(**{REASON_COLUMN: reason_text.str.rstrip('; ')})
+
+    logging.warning(f"{len(quarantined)} of {len(df)} products failed validation and were quarantined.")
+    return df[~failed], quarantined
+
+
+def save_quarantine(quarantined, path=None):
+    """
+    Writes quarantined rows and their reasons to a CSV file.
+
+    Parameters:
+        quarantined (pandas.DataFrame): Rows returned by `validate_products`.
+        path (str): Output file. Defaults to QUARANTINE_FILE.
+
+    Returns:
+        int: Number of rows written.
+    """
+    path = path or QUARANTINE_FILE
+    quarantined.to_csv(path, index=False)
+    logging.info(f"Saved {len(quarantined)} quarantined products to {path}.")
+    return len(quarantined)
@@ -1,8 +1,12 @@
 import pandas as pd
 import logging
 import os
-import requests
-from data_mapping.common_mapping import clean_html, normalize_column_names, fill_missing_values
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count, islice
+from adapters.common_adapter import make_request, propagate_context
+from data_mapping.common_mapping import clean_html_series, normalize_column_names, fill_missing_values
+from data_mapping.mapping_spec import FieldSpec, compile_mapping
 
 # Fetch environment variables (API key)
 from dotenv import load_dotenv
@@ -11,56 +15,229 @@ load_dotenv()
 # Zoey API Key
 ZOEY_API_KEY = os.getenv("ZOEY_API_KEY")
 
-def fetch_data_from_zoey():
+# Zoey product listing endpoint and paging
+ZOEY_PRODUCTS_URL = "https://api.zoey.com/v1/products"
+ZOEY_PAGE_SIZE = int(os.getenv('ZOEY_PAGE_SIZE', '100'))
+ZOEY_MAX_IN_FLIGHT = int(os.getenv('ZOEY_MAX_IN_FLIGHT', '4'))
+
+# Zoey product CSV columns, read from normalized source columns (NetSuite or Shopify)
+ZOEY_CSV_SPEC = [
+    FieldSpec('sku', ('sku', 'variant_sku')),
+    FieldSpec('_type', '_type', default='simple'),
+    FieldSpec('name', 'title'),
+    FieldSpec('description', 'body_html'),
+    FieldSpec('price', 'variant_price', default=0.0),
+    FieldSpec('status', 'status', default=1),
+    FieldSpec('qty', 'variant_inventory_qty', default=0),
+    FieldSpec('visibility', 'visibility', default=4),
+    FieldSpec('use_config_manage_stock', 'use_config_manage_stock', default=1),
+    FieldSpec('is_in_stock', 'is_in_stock', default=1),
+    FieldSpec('manage_stock', 'manage_stock', default=1),
+    FieldSpec('tax_class_id', 'tax_class_id', default=2),
+    FieldSpec('weight', 'variant_weight_unit', default=0.0),
+    FieldSpec('barcode', 'barcode'),
+    FieldSpec('brand', 'brand'),
+    FieldSpec('color', 'color'),
+    FieldSpec('url_key', 'url_key'),
+    FieldSpec('image', 'image_src'),
+    FieldSpec('_media_image', 'image_src'),
+    FieldSpec('category_ids', 'category_ids'),
+    FieldSpec('use_config_enable_qty_inc', 'use_config_enable_qty_inc', default=1),
+    FieldSpec('enable_qty_increments', 'enable_qty_increments', default=1),
+    FieldSpec('use_config_qty_increments', 'use_config_qty_increments', default=1),
+    FieldSpec('qty_increments', 'qty_increments', default=0),
+    FieldSpec('zoey_add_to_cart_qty', 'zoey_add_to_cart_qty', default=1),
+]
+
+_to_zoey_csv = compile_mapping(ZOEY_CSV_SPEC)
+
+
+class ZoeyPageError(Exception):
+    pass
+
+
+def _zoey_headers():
+    return {
+        "Authorization": f"Bearer {ZOEY_API_KEY}",
+        "Content-Type": "application/json",
+        "Accept": "application/json"
+    }
+
+
+def _fetch_zoey_page(api_url, headers, page, page_size=ZOEY_PAGE_SIZE):
+    """
+    Fetches one page of the Zoey product listing.
+
+    Parameters:
+        api_url (str): Zoey products endpoint.
+        headers (dict): HTTP headers including authorization.
+        page (int): 1-based page number.
+        page_size (int): Number of products per page.
+
+    Returns:
+        list: Product records on the page (empty past the last page).
+    """
+    response = make_request("GET", api_url, headers=headers, params={"page": page, "limit": page_size}, hedge=True)
+    if response is None:
+        raise ZoeyPageError(f"Request to Zoey failed: No response received for page {page}.")
+    if response.status_code != 200:
+        raise ZoeyPageError(f"Failed to fetch page {page} from Zoey: {response.status_code} - {response.text}")
+
+    body = response.json()
+    # The listing is either a bare list or wrapped as {"products": [...]}
+    products = body.get('products', []) if isinstance(body, dict) else body
+    return products or []
+
+
+def iter_zoey_pages(api_url=None, page_size=ZOEY_PAGE_SIZE, parallel=False, max_in_flight=ZOEY_MAX_IN_FLIGHT):
+    """
+    Yields the product records of the Zoey listing one page at a time, in page order.
+    The walk stops at the first page holding fewer than `page_size` products.
+
+    Parameters:
+        api_url (str): Zoey products endpoint. Defaults to the public API.
+        page_size (int): Number of products per page.
+        parallel (bool): If True, request up to `max_in_flight` pages ahead concurrently. The total
+            is unknown up front, so up to `max_in_flight - 1` requests past the end are wasted.
+        max_in_flight (int): Maximum number of outstanding page requests in parallel mode.
+
+    Yields:
+        list: Product records of one page.
+    """
+    api_url = api_url or ZOEY_PRODUCTS_URL
+    headers = _zoey_headers()
+
+    if not parallel:
+        page = 1
+        while True:
+            products = _fetch_zoey_page(api_url, headers, page, page_size)
+            if products:
+                yield products
+            if len(products) < page_size:
+                return
+            page += 1
+
+    # Keep a window of `max_in_flight` pages outstanding and hand them back in page order
+    fetch_page = propagate_context(_fetch_zoey_page)
+    pages = count(1)
+    with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+        pending = deque(executor.submit(fetch_page, api_url, headers, page, page_size)
+                        for page in islice(pages, max_in_flight))
+        try:
+            while pending:
+                products = pending.popleft().result()
+                if products:
+                    yield products
+                if len(products) < page_size:
+                    return
+                pending.append(executor.submit(fetch_page, api_url, headers, next(pages), page_size))
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def iter_zoey_data_chunks(api_url=None, page_size=ZOEY_PAGE_SIZE, parallel=False, max_in_flight=ZOEY_MAX_IN_FLIGHT):
+    """
+    Streams the Zoey product listing as flat DataFrame chunks, one per page, so only one page of
+    JSON is held in memory at a time.
+
+    Yields:
+        pandas.DataFrame: Page of products flattened with `pd.json_normalize`.
+    """
+    for products in iter_zoey_pages(api_url, page_size, parallel, max_in_flight):
+        yield pd.json_normalize(products)
+
+
+def fetch_data_from_zoey(api_url=None, page_size=ZOEY_PAGE_SIZE, parallel=False, max_in_flight=ZOEY_MAX_IN_FLIGHT):
     """
     Fetch product data from Zoey API and return as a DataFrame.
 
+    Parameters:
+        api_url (str): Zoey products endpoint. Defaults to the public API.
+        page_size (int): Number of products requested per page.
+        parallel (bool): If True, fetch pages concurrently.
+        max_in_flight (int): Maximum number of outstanding page requests in parallel mode.
+
     Returns:
         pandas.DataFrame: DataFrame containing product data from Zoey.
     """
     try:
-        # Define the Zoey API endpoint for fetching products
-        api_url = "https://api.zoey.com/v1/products"
-        
         # Check for the API key
         if not ZOEY_API_KEY:
             logging.error("Zoey API key not found. Please set ZOEY_API_KEY in .env.")
             return pd.DataFrame()
 
-        # Set up request headers
-        headers = {
-            "Authorization": f"Bearer {ZOEY_API_KEY}",
-            "Content-Type": "application/json",
-            "Accept": "application/json"
-        }
-
-        # Make the API request to fetch product data
-        response = requests.get(api_url, headers=headers)
-
-        # Check if the request was successful
-        if response.status_code == 200:
-            zoey_data = response.json()  # Parse the JSON response
-            logging.info(f"Fetched {len(zoey_data)} products from Zoey via API.")
-            return pd.json_normalize(zoey_data)  # Normalize nested JSON to a flat DataFrame
-
-        else:
-            logging.error(f"Failed to fetch data from Zoey: {response.status_code} - {response.text}")
+        # Flatten page by page and concatenate once at the end
+        chunks = list(iter_zoey_data_chunks(api_url, page_size, parallel, max_in_flight))
+        if not chunks:
+            logging.info("Fetched 0 products from Zoey via API.")
             return pd.DataFrame()
 
+        zoey_df = pd.concat(chunks, ignore_index=True)
+        logging.info(f"Fetched {len(zoey_df)} products from Zoey via API.")
+        return zoey_df
+
     except Exception as err:
         logging.error(f"An error occurred while fetching data from Zoey: {err}")
         return pd.DataFrame()
 
 
-def map_output_to_zoey_csv(df):
+def write_zoey_data_to_csv(output_file, api_url=None, page_size=ZOEY_PAGE_SIZE, parallel=False, max_in_flight=ZOEY_MAX_IN_FLIGHT):
+    """
+    Dumps the Zoey product listing to a CSV file page by page, without holding the whole
+    catalog in memory. The columns of the first page define the header; later pages are aligned
+    to it (columns only seen later are dropped and logged).
+
+    Parameters:
+        output_file (str): Path of the CSV file to write.
+        api_url (str): Zoey products endpoint. Defaults to the public API.
+        page_size (int): Number of products requested per page.
+        parallel (bool): If True, fetch pages concurrently.
+        max_in_flight (int): Maximum number of outstanding page requests in parallel mode.
+
+    Returns:
+        int: Number of products written.
+    """
+    if not ZOEY_API_KEY:
+        logging.error("Zoey API key not found. Please set ZOEY_API_KEY in .env.")
+        return 0
+
+    columns = None
+    rows = 0
+    # Write to a temporary file so a failed run does not leave a truncated CSV behind
+    tmp_file = f"{output_file}.tmp"
+    try:
+        with open(tmp_file, 'w', newline='', encoding='utf-8') as f:
+            for chunk in iter_zoey_data_chunks(api_url, page_size, parallel, max_in_flight):
+                if columns is None:
+                    columns = chunk.columns.tolist()
+                    chunk.to_csv(f, index=False)
+                else:
+                    extra = chunk.columns.difference(columns)
+                    if len(extra):
+                        logging.warning(f"Dropping Zoey fields not present on the first page: {extra.tolist()}")
+                    chunk.reindex(columns=columns).to_csv(f, index=False, header=False)
+                rows += len(chunk)
+        os.replace(tmp_file, output_file)
+    except Exception:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+        raise
+    logging.info(f"Streamed {rows} Zoey products to {output_file}.")
+    return rows
+
+
+def map_output_to_zoey_csv(df, lazy=False):
     """
     Maps data from other sources (NetSuite, Shopify) to Zoey's CSV format.
 
     Parameters:
         df (pandas.DataFrame): DataFrame containing product information.
+        lazy (bool): Keep columns filled from defaults (e.g. 'status', 'visibility') as scalars and
+            return a `LazyFrame`; the writers and the Zoey exporter expand them only when writing.
 
     Returns:
-        pandas.DataFrame: Mapped DataFrame ready for Zoey's CSV import.
+        pandas.DataFrame: Mapped DataFrame ready for Zoey's CSV import (a `LazyFrame` if `lazy`).
     """
     try:
         # Step 1: Normalize the column names
@@ -68,38 +245,13 @@ def map_output_to_zoey_csv(df):
 
         # Step 2: Clean the 'body_html' field if present
         if 'body_html' in df.columns:
-            df['body_html'] = df['body_html'].apply(clean_html)
+            df['body_html'] = clean_html_series(df['body_html'])
 
         # Step 3: Fill missing values
         df = fill_missing_values(df)
 
-        # Step 4: Map columns to Zoey's CSV format based on the template
-        zoey_csv_df = pd.DataFrame()
-        zoey_csv_df['sku'] = df.get('sku', '')
-        zoey_csv_df['_type'] = df.get('_type', 'simple')
-        zoey_csv_df['name'] = df.get('title', '')
-        zoey_csv_df['description'] = df.get('body_html', '')
-        zoey_csv_df['price'] = df.get('variant_price', 0.0)
-        zoey_csv_df['status'] = df.get('status', 1)
-        zoey_csv_df['qty'] = df.get('variant_inventory_qty', 0)
-        zoey_csv_df['visibility'] = df.get('visibility', 4)
-        zoey_csv_df['use_config_manage_stock'] = df.get('use_config_manage_stock', 1)
-        zoey_csv_df['is_in_stock'] = df.get('is_in_stock', 1)
-        zoey_csv_df['manage_stock'] = df.get('manage_stock', 1)
-        zoey_csv_df['tax_class_id'] = df.get('tax_class_id', 2)
-        zoey_csv_df['weight'] = df.get('variant_weight_unit', 0.0)
-        zoey_csv_df['barcode'] = df.get('barcode', '')
-        zoey_csv_df['brand'] = df.get('brand', '')
-        zoey_csv_df['color'] = df.get('color', '')
-        zoey_csv_df['url_key'] = df.get('url_key', '')
-        zoey_csv_df['image'] = df.get('image_src', '')
-        zoey_csv_df['_media_image'] = df.get('image_src', '')
-        zoey_csv_df['category_ids'] = df.get('category_ids', '')
-        zoey_csv_df['use_config_enable_qty_inc'] = df.get('use_config_enable_qty_inc', 1)
-        zoey_csv_df['enable_qty_increments'] = df.get('enable_qty_increments', 1)
-        zoey_csv_df['use_config_qty_increments'] = df.get('use_config_qty_increments', 1)
-        zoey_csv_df['qty_increments'] = df.get('qty_increments', 0)
-        zoey_csv_df['zoey_add_to_cart_qty'] = df.get('zoey_add_to_cart_qty', 1)
+        # Step 4: Map columns to Zoey's CSV format based on the template (ZOEY_CSV_SPEC)
+        zoey_csv_df = _to_zoey_csv(df, lazy=lazy)
 
         logging.info("Data mapping to Zoey's CSV format completed.")
         return zoey_csv_df
@@ -109,6 +261,44 @@ def map_output_to_zoey_csv(df):
         return pd.DataFrame()
 
 
+def write_zoey_csv_from_chunks(chunks, output_file, encoding='utf-8'):
+    """
+    Maps source product chunks (NetSuite or Shopify) to Zoey's CSV format and writes them to
+    `output_file` chunk by chunk, in ZOEY_CSV_SPEC column order. Only one chunk is held in
+    memory, and default columns are expanded only while that chunk is written, so memory stays
+    flat however large the catalog is.
+
+    Parameters:
+        chunks (iterable): Source DataFrames, e.g. from `iter_netsuite_product_chunks`.
+        output_file (str): Path of the CSV file to write.
+        encoding (str): File encoding.
+
+    Returns:
+        int: Number of products written.
+    """
+    rows = 0
+    # Write to a temporary file so a failed run does not leave a truncated CSV behind
+    tmp_file = f"{output_file}.tmp"
+    try:
+        with open(tmp_file, 'w', newline='', encoding=encoding) as f:
+            pd.DataFrame(columns=[field.target for field in ZOEY_CSV_SPEC]).to_csv(f, index=False)
+            for number, chunk in enumerate(chunks, start=1):
+                if chunk.empty:
+                    continue
+                zoey_chunk = map_output_to_zoey_csv(chunk, lazy=True)
+                if zoey_chunk.empty:
+                    raise ValueError(f"Mapping chunk {number} to Zoey format failed.")
+                zoey_chunk.to_csv(f, index=False, header=False)
+                rows += len(zoey_chunk)
+        os.replace(tmp_file, output_file)
+    except Exception:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+        raise
+    logging.info(f"Streamed {rows} products to the Zoey import file {output_file}.")
+    return rows
+
+
 def generate_mock_zoey_csv(output_file='zoey_mock_data.csv'):
     """
     Generates a mock CSV file for Zoey based on the required column structure.
@@ -1,43 +1,73 @@
 import argparse
 import logging
-from orchestrator.data_orchestrator import sync_netsuite_to_shopify, sync_netsuite_to_zoey, sync_shopify_to_zoey
-from data_mapping.zoey_mapping import generate_mock_zoey_csv, fetch_data_from_zoey
+import os
+from orchestrator.data_orchestrator import sync_netsuite_to_shopify, sync_netsuite_to_zoey, sync_shopify_to_zoey, redrive_zoey_failures, export_zoey_import_csv
+from data_mapping.zoey_mapping import generate_mock_zoey_csv, fetch_data_from_zoey, write_zoey_data_to_csv
+from adapters.zoey_index import zoey_product_index
+from adapters.common_adapter import job_deadline
 
-def main(platform):
+# Default time budget in seconds for a whole operation; unset means no deadline
+SYNC_DEADLINE_SECONDS = float(os.getenv('SYNC_DEADLINE_SECONDS')) if os.getenv('SYNC_DEADLINE_SECONDS') else None
+
+def main(platform, delta=False, concurrency=None, changed_only=False, stream=False, shopify_source='file', deadline=None):
     """
     Main function to handle data synchronization or mock data generation based on the provided platform.
 
     Parameters:
         platform (str): The target platform for product data export or mock generation. Options are:
-                        'netsuite_to_shopify', 'netsuite_to_zoey', 'shopify_to_zoey', 'generate_mock_zoey', 'fetch_from_zoey'
+                        'netsuite_to_shopify', 'netsuite_to_zoey', 'shopify_to_zoey', 'generate_mock_zoey', 'fetch_from_zoey',
+                        'redrive_zoey_failures', 'netsuite_to_zoey_csv', 'shopify_to_zoey_csv'
+        delta (bool): For NetSuite syncs, fetch only items modified since the last successful run.
+        concurrency (int): For Zoey exports, number of products exported at the same time. Failed
+                        products are saved and can be exported again with 'redrive_zoey_failures'.
+        changed_only (bool): For syncs, send only products whose mapped content changed since the last successful run.
+        stream (bool): For 'fetch_from_zoey', write the CSV page by page instead of loading the whole catalog.
+        shopify_source (str): For 'shopify_to_zoey' and 'shopify_to_zoey_csv', read the Shopify Excel export ('file') or the store API ('api').
+        deadline (float): Time budget in seconds for the whole operation. Requests still running at the
+                        deadline fail with `DeadlineExceededError`. None means no deadline.
     """
     try:
-        if platform == 'netsuite_to_shopify':
-            logging.info("Starting synchronization from NetSuite to Shopify...")
-            sync_netsuite_to_shopify()
-        elif platform == 'netsuite_to_zoey':
-            logging.info("Starting synchronization from NetSuite to Zoey...")
-            sync_netsuite_to_zoey()
-        elif platform == 'shopify_to_zoey':
-            logging.info("Starting synchronization from Shopify to Zoey...")
-            sync_shopify_to_zoey()
-        elif platform == 'generate_mock_zoey':
-            logging.info("Generating mock CSV data for Zoey import...")
-            generate_mock_zoey_csv()
-        elif platform == 'fetch_from_zoey':
-            logging.info("Fetching data directly from Zoey via API...")
-            zoey_data = fetch_data_from_zoey()
-            
-            # If data is fetched successfully, export to CSV
-            if not zoey_data.empty:
+        # Bound the whole operation: requests time out at the deadline instead of retrying past it
+        with job_deadline(deadline):
+            if platform == 'netsuite_to_shopify':
+                logging.info("Starting synchronization from NetSuite to Shopify...")
+                sync_netsuite_to_shopify(delta=delta, changed_only=changed_only)
+            elif platform == 'netsuite_to_zoey':
+                logging.info("Starting synchronization from NetSuite to Zoey...")
+                sync_netsuite_to_zoey(delta=delta, concurrency=concurrency, changed_only=changed_only)
+            elif platform == 'shopify_to_zoey':
+                logging.info("Starting synchronization from Shopify to Zoey...")
+                sync_shopify_to_zoey(concurrency=concurrency, changed_only=changed_only, source=shopify_source)
+            elif platform == 'redrive_zoey_failures':
+                logging.info("Re-driving failed Zoey exports...")
+                redrive_zoey_failures(concurrency=concurrency)
+            elif platform in ('netsuite_to_zoey_csv', 'shopify_to_zoey_csv'):
+                logging.info("Streaming products to a Zoey CSV import file...")
+                export_zoey_import_csv(source=platform.split('_')[0], shopify_source=shopify_source)
+            elif platform == 'generate_mock_zoey':
+                logging.info("Generating mock CSV data for Zoey import...")
+                generate_mock_zoey_csv()
+            elif platform == 'fetch_from_zoey':
+                logging.info("Fetching data directly from Zoey via API...")
                 output_file = 'zoey_exported_data.csv'
-                zoey_data.to_csv(output_file, index=False)
-                logging.info(f"Zoey product data exported successfully to {output_file}")
+                if stream:
+                    # Dump the catalog page by page without holding it in memory
+                    write_zoey_data_to_csv(output_file)
+                else:
+                    zoey_data = fetch_data_from_zoey()
+
+                    # If data is fetched successfully, export to CSV
+                    if not zoey_data.empty:
+                        zoey_data.to_csv(output_file, index=False)
+                        logging.info(f"Zoey product data exported successfully to {output_file}")
+
+                        # Refresh the SKU -> product ID index used to route exports to create or update calls
+                        zoey_product_index.seed(zoey_data)
+                    else:
+                        logging.warning("No data fetched from Zoey or data is empty.")
             else:
-                logging.warning("No data fetched from Zoey or data is empty.")
-        else:
-            logging.error(f"Unsupported platform: {platform}. Please choose from 'netsuite_to_shopify', 'netsuite_to_zoey', 'shopify_to_zoey', 'generate_mock_zoey', or 'fetch_from_zoey'.")
-            return
+                logging.error(f"Unsupported platform: {platform}. Please choose from 'netsuite_to_shopify', 'netsuite_to_zoey', 'shopify_to_zoey', 'generate_mock_zoey', 'fetch_from_zoey', 'redrive_zoey_failures', 'netsuite_to_zoey_csv', or 'shopify_to_zoey_csv'.")
+                return
 
         logging.info(f"Operation for {platform} completed successfully.")
 
@@ -52,10 +82,22 @@ if __name__ == "__main__":
     # Set up argument parser for the platform input
     parser = argparse.ArgumentParser(description='Data synchronization tool for multiple platforms.')
     parser.add_argument('--platform', type=str, required=True,
-                        help="Target platform for product data export. Options are: 'netsuite_to_shopify', 'netsuite_to_zoey', 'shopify_to_zoey', 'generate_mock_zoey', 'fetch_from_zoey'.")
+                        help="Target platform for product data export. Options are: 'netsuite_to_shopify', 'netsuite_to_zoey', 'shopify_to_zoey', 'generate_mock_zoey', 'fetch_from_zoey', 'redrive_zoey_failures', 'netsuite_to_zoey_csv', 'shopify_to_zoey_csv'.")
+    parser.add_argument('--delta', action='store_true',
+                        help="For NetSuite syncs, fetch only items modified since the last successful run.")
+    parser.add_argument('--concurrency', type=int, default=None,
+                        help="For Zoey exports, number of products exported at the same time. Failed products are saved for 'redrive_zoey_failures'.")
+    parser.add_argument('--stream', action='store_true',
+                        help="For 'fetch_from_zoey', write the CSV page by page instead of loading the whole catalog.")
+    parser.add_argument('--shopify-source', choices=['file', 'api'], default='file',
+                        help="For 'shopify_to_zoey' and 'shopify_to_zoey_csv', read the Shopify Excel export or run a bulk query against the store API.")
+    parser.add_argument('--changed-only', action='store_true',
+                        help="For syncs, send only products whose mapped content changed since the last successful run.")
+    parser.add_argument('--deadline', type=float, default=SYNC_DEADLINE_SECONDS,
+                        help="Time budget in seconds for the whole operation. Requests are cut off at the deadline.")
     
     # Parse the provided arguments
     args = parser.parse_args()
     
     # Execute the main function with the provided platform argument
-    main(args.platform)
+    main(args.platform, delta=args.delta, concurrency=args.concurrency, changed_only=args.changed_only, stream=args.stream, shopify_source=args.shopify_source, deadline=args.deadline)
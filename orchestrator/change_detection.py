@@ -0,0 +1,155 @@
+# orchestrator/change_detection.py
+
+import hashlib
+import logging
+import os
+import sqlite3
+import pandas as pd
+from orchestrator.sync_state import SYNC_STATE_DIR
+
+
+def row_hashes(df, key):
+    """
+    Hashes every row of `df` in one vectorized pass (`pd.util.hash_pandas_object`).
+
+    Parameters:
+        df (pandas.DataFrame): Mapped products.
+        key (str): Column identifying a product.
+
+    Returns:
+        pandas.Series: Signed 64-bit row hashes indexed by the product key, in row order.
+    """
+    hashes = pd.util.hash_pandas_object(df, index=False).to_numpy().view('int64')
+    return pd.Series(hashes, index=df[key].astype(str).to_numpy())
+
+
+def unusable_keys(keys):
+    """
+    Returns a boolean mask of keys that cannot identify a product: missing, blank, or shared
+    by several rows. Their stored hash would be overwritten by the other rows with the same key.
+    """
+    text = keys.astype(object).where(keys.notna(), '').astype(str).str.strip()
+    return ((text == '') | text.duplicated(keep=False)).to_numpy()
+
+
+def schema_hash(df):
+    """
+    Returns a fingerprint of the column names, types and order. Row hashes only cover
+    values, so a changed mapping has to invalidate every stored hash.
+    """
+    schema = '|'.join(f"{name}:{dtype}" for name, dtype in df.dtypes.items())
+    return hashlib.sha256(schema.encode('utf-8')).hexdigest()
+
+
+class ChangeDetector:
+    """
+    Keeps the content hash of every product row exported by a sync job (e.g. 'netsuite_to_zoey')
+    so the next run can skip the rows that did not change.
+
+    Hashes are stored in SQLite and must be committed only after the export succeeded, so a
+    failed run sends the same rows again. Create one detector per run: when the column layout
+    changed, the stored hashes are dropped on its first commit only, so the chunks of one run
+    do not drop each other's hashes.
+    """
+
+    def __init__(self, name, state_dir=SYNC_STATE_DIR):
+        self.name = name
+        self.path = os.path.join(state_dir, f"{name}.hashes.sqlite")
+        self._schema_checked = False
+
+    def _connect(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        connection = sqlite3.connect(self.path)
+        connection.execute("CREATE TABLE IF NOT EXISTS row_hashes (key TEXT PRIMARY KEY, hash INTEGER NOT NULL)")
+        connection.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        return connection
+
+    def _stored_hashes(self, schema):
+        """
+        Returns the stored hashes as a Series indexed by key, or an empty Series if there are
+        none or they were computed for a different column layout.
+        """
+        if not os.path.exists(self.path):
+            return pd.Series(dtype='Int64')
+        connection = self._connect()
+        try:
+            stored_schema = connection.execute("SELECT value FROM meta WHERE name = 'schema'").fetchone()
+            if stored_schema is None or stored_schema[0] != schema:
+                logging.info(f"Mapped columns changed since the last {self.name} export. Treating every row as changed.")
+                return pd.Series(dtype='Int64')
+            rows = connection.execute("SELECT key, hash FROM row_hashes").fetchall()
+        finally:
+            connection.close()
+        if not rows:
+            return pd.Series(dtype='Int64')
+        keys, hashes = zip(*rows)
+        return pd.Series(hashes, index=keys, dtype='Int64')
+
+    def filter_changed(self, df, key):
+        """
+        Returns the rows of `df` that are new or changed since the last committed export.
+        Rows with a missing, blank or duplicate key are always returned and their hashes are
+        never stored.
+
+        Parameters:
+            df (pandas.DataFrame): Mapped products.
+            key (str): Column identifying a product (e.g. 'sku').
+
+        Returns:
+            tuple: (changed rows as a DataFrame, pending hashes to pass to `commit` after a successful export).
+        """
+        hashes = row_hashes(df, key)
+        schema = schema_hash(df)
+        unkeyed = unusable_keys(df[key])
+        if unkeyed.any():
+            logging.warning(f"{self.name}: {int(unkeyed.sum())} products have a missing, blank or duplicate "
+                            f"'{key}'. They are always exported.")
+        previous = self._stored_hashes(schema).reindex(hashes.index)
+        changed = previous.ne(hashes.to_numpy()).fillna(True).to_numpy(dtype=bool) | unkeyed
+
+        logging.info(f"{self.name}: {int(changed.sum())} of {len(df)} products are new or changed.")
+        pending = (schema, hashes[changed & ~unkeyed])
+        return df[changed], pending
+
+    def commit(self, pending, keys=None):
+        """
+        Stores the hashes of exported rows, so the next run skips them while they stay unchanged.
+
+        Parameters:
+            pending (tuple): Pending hashes returned by `filter_changed`.
+            keys (iterable): Optional subset of product keys to commit, e.g. only the products that
+                were exported successfully. Defaults to all pending rows.
+        """
+        schema, hashes = pending
+        if keys is not None:
+            hashes = hashes[hashes.index.isin([str(k) for k in keys])]
+
+        connection = self._connect()
+        try:
+            with connection:
+                stored_schema = connection.execute("SELECT value FROM meta WHERE name = 'schema'").fetchone()
+                if stored_schema is None or (not self._schema_checked and stored_schema[0] != schema):
+                    # Hashes of an earlier run's layout can never match again
+                    connection.execute("DELETE FROM row_hashes")
+                    connection.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('schema', ?)", (schema,))
+                elif stored_schema[0] != schema:
+                    # Another chunk of this run stored its layout; its hashes are kept and these
+                    # rows are exported again next time
+                    logging.warning(f"Mapped columns of {self.name} differ between chunks of this run. "
+                                    f"Not storing {len(hashes)} hashes of the other layout.")
+                    hashes = hashes.iloc[:0]
+                self._schema_checked = True
+                connection.executemany(
+                    "INSERT OR REPLACE INTO row_hashes (key, hash) VALUES (?, ?)",
+                    zip(hashes.index.tolist(), hashes.tolist()),
+                )
+        finally:
+            connection.close()
+        logging.info(f"Committed {len(hashes)} {self.name} product hashes.")
+
+    def clear(self):
+        """
+        Forgets every stored hash, so the next run exports the full catalog.
+        """
+        if os.path.exists(self.path):
+            os.remove(self.path)
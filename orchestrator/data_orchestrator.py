@@ -1,85 +1,444 @@
 # orchestrator/data_orchestrator.py
 
 import logging
+import os
+from datetime import datetime, timezone
+import pandas as pd
 from adapters import shopify_adapter, netsuite_adapter, zoey_adapter
+from adapters.zoey_index import zoey_product_index
 from data_mapping import shopify_mapping, netsuite_mapping, zoey_mapping
+from data_mapping.common_mapping import optimize_dtypes
+from data_mapping.mapping_spec import LazyFrame
+from data_mapping.validation import validate_products, save_quarantine
+from orchestrator.sync_state import SyncState
+from orchestrator.change_detection import ChangeDetector
 
 # Configure logging to capture debug and info messages
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-def sync_netsuite_to_shopify():
+# Where products that failed a concurrent Zoey export are saved for a later re-drive
+ZOEY_FAILED_EXPORT_FILE = os.getenv('ZOEY_FAILED_EXPORT_FILE', 'zoey_failed_products.csv')
+
+# Zoey CSV import file written by `export_zoey_import_csv`
+ZOEY_IMPORT_FILE = os.getenv('ZOEY_IMPORT_FILE', 'zoey_import.csv')
+
+# Columns that identify a product in mapped data, in order of preference
+PRODUCT_KEY_COLUMNS = ['sku', 'SKU', 'variant_sku', 'variant sku', 'Variant SKU', 'Handle', 'id']
+
+def _skip_unchanged(mapped_data, detector):
+    """
+    Drops the mapped products whose content did not change since the last successful export.
+
+    Parameters:
+        mapped_data (pandas.DataFrame): Products ready for export.
+        detector (ChangeDetector): Hash store of the sync job, or None to export everything.
+
+    Returns:
+        tuple: (rows to export, (key column, pending hashes) to commit after the export, or None).
+    """
+    if detector is None:
+        return mapped_data, None
+    if isinstance(mapped_data, LazyFrame):
+        # Row hashes cover every column, constants included
+        mapped_data = mapped_data.to_frame()
+    key = next((column for column in PRODUCT_KEY_COLUMNS if column in mapped_data.columns), None)
+    if key is None:
+        logging.warning("No product key column found in the mapped data. Change detection skipped.")
+        return mapped_data, None
+    changed_data, pending = detector.filter_changed(mapped_data, key)
+    return changed_data, (key, pending)
+
+
+def _reject_invalid(mapped_data, quarantined_chunks=None):
+    """
+    Drops products that fail validation (duplicate SKU, non-positive price, bad barcode check
+    digit, empty title). The rejected rows are saved to QUARANTINE_FILE with their reasons, or
+    appended to `quarantined_chunks` for the caller to save once.
+
+    Returns:
+        pandas.DataFrame: Valid products.
+    """
+    valid_data, quarantined = validate_products(mapped_data)
+    if not quarantined.empty:
+        if quarantined_chunks is None:
+            save_quarantine(quarantined)
+        else:
+            quarantined_chunks.append(quarantined)
+    return valid_data
+
+
+def _zoey_index():
+    """
+    Returns the shared SKU -> Zoey product ID index used to route exports to create or update
+    calls. An empty index is seeded from the Zoey product listing first.
+    """
+    if len(zoey_product_index) == 0:
+        logging.info("Zoey SKU index is empty. Seeding it from the Zoey product listing...")
+        zoey_product_index.seed(zoey_mapping.fetch_data_from_zoey())
+    return zoey_product_index
+
+
+def _export_zoey_products(zoey_ready_data, index, concurrency=None, detector=None):
+    """
+    Exports mapped products to Zoey, skipping unchanged ones when a `detector` is given. Hashes
+    are committed only for products that were exported successfully.
+
+    Returns:
+        tuple: (True if every product was exported, DataFrame of failed rows with an
+            'export_error' column in concurrent mode, or None).
+    """
+    zoey_ready_data, pending = _skip_unchanged(zoey_ready_data, detector)
+    if zoey_ready_data.empty:
+        logging.info("No new or changed products to export to Zoey.")
+        return True, None
+
+    if not concurrency:
+        success = zoey_adapter.export_to_zoey(zoey_ready_data, index=index)
+        if success and pending:
+            detector.commit(pending[1])
+        return success, None
+
+    result = zoey_adapter.export_to_zoey_concurrent(zoey_ready_data, concurrency=concurrency, index=index)
+    failed_rows = None
+    if not result.success:
+        failed_rows = result.failed_products(zoey_ready_data, with_errors=True)
+    if pending:
+        key, hashes = pending
+        exported = zoey_ready_data if failed_rows is None else zoey_ready_data.drop(index=failed_rows.index)
+        detector.commit(hashes, keys=exported[key])
+    return result.success, failed_rows
+
+
+def _export_to_zoey(zoey_ready_data, concurrency=None, detector=None):
+    """
+    Exports mapped products to Zoey. With `concurrency`, every product is attempted by a pool
+    of workers and the ones that fail are saved to ZOEY_FAILED_EXPORT_FILE for `redrive_zoey_failures`.
+    With a `detector`, only new or changed products are exported.
+
+    Returns:
+        bool: True if every product was exported.
+    """
+    success, failed_rows = _export_zoey_products(zoey_ready_data, _zoey_index(), concurrency, detector)
+    if failed_rows is not None:
+        failed_rows.to_csv(ZOEY_FAILED_EXPORT_FILE, index=False)
+        logging.info(f"Saved {len(failed_rows)} failed Zoey products to {ZOEY_FAILED_EXPORT_FILE}.")
+    return success
+
+def _fetch_netsuite_delta(state):
+    """
+    Fetches the NetSuite items modified since the job's last successful run. Without a stored
+    watermark, the full catalog is fetched.
+
+    Parameters:
+        state (SyncState): Sync state of the calling job.
+
+    Returns:
+        tuple: (changed rows as a DataFrame, or None if the fetch failed; start time of this run
+            to store as the next watermark).
+    """
+    run_started = datetime.now(timezone.utc)
+    modified_since = state.modified_since()
+    if modified_since:
+        logging.info(f"Fetching NetSuite items modified since {modified_since.isoformat()}.")
+    else:
+        logging.info("No watermark stored yet. Fetching the full NetSuite catalog.")
+
+    try:
+        netsuite_data = netsuite_adapter.fetch_netsuite_products(modified_since=modified_since, raise_errors=True)
+    except netsuite_adapter.NetSuiteAPIError:
+        logging.error("NetSuite delta fetch failed. The watermark is left where it is.")
+        return None, run_started
+    return netsuite_data, run_started
+
+
+def _commit_delta(state, netsuite_data, run_started):
+    """
+    Records a successful delta run: merges the fetched items into the job's cached catalog
+    snapshot, then advances the watermark. A run without a stored watermark fetched the full
+    catalog, which replaces the snapshot.
+    """
+    state.merge_snapshot(netsuite_data, replace=state.load_watermark() is None)
+    state.save_watermark(run_started)
+
+
+def sync_netsuite_to_shopify(delta=False, changed_only=False):
     """
     Synchronizes product data from NetSuite to Shopify.
+
+    Parameters:
+        delta (bool): If True, fetch only items modified since the last successful run, and merge
+            them into the cached snapshot and advance the stored watermark once the upload succeeds.
+        changed_only (bool): If True, upload only products whose mapped content changed since
+            the last successful upload.
     """
     logging.info("Starting NetSuite to Shopify synchronization...")
 
     # Step 1: Fetch data from NetSuite
-    netsuite_data = netsuite_adapter.fetch_netsuite_products()
+    if delta:
+        state = SyncState('netsuite_to_shopify')
+        netsuite_data, run_started = _fetch_netsuite_delta(state)
+        if netsuite_data is None:
+            return
+        if netsuite_data.empty:
+            logging.info("No NetSuite items changed since the last run. Nothing to synchronize.")
+            state.save_watermark(run_started)
+            return
+    else:
+        netsuite_data = netsuite_adapter.fetch_netsuite_products()
+
     if netsuite_data.empty:
         logging.warning("No data fetched from NetSuite. Synchronization aborted.")
         return
+    netsuite_data = optimize_dtypes(netsuite_data, 'NetSuite products')
 
-    # Step 2: Map NetSuite data to Shopify format (Placeholder for mapping logic)
-    shopify_ready_data = netsuite_data  
+    # Step 2: Map NetSuite data to Shopify format
+    shopify_ready_data = netsuite_mapping.map_to_shopify(netsuite_data)
     if shopify_ready_data.empty:
         logging.warning("Mapping to Shopify format failed. No data to upload.")
         return
+    shopify_ready_data = optimize_dtypes(shopify_ready_data, 'Shopify products')
 
-    # Step 3: Upload mapped data to Shopify
-    success = shopify_adapter.upload_products(shopify_ready_data)
+    # Step 3: Quarantine invalid products, checking the mapped Shopify columns
+    shopify_ready_data = _reject_invalid(shopify_ready_data)
+
+    # Step 4: Upload mapped data to Shopify, skipping unchanged products if requested
+    detector = ChangeDetector('netsuite_to_shopify') if changed_only else None
+    shopify_ready_data, pending = _skip_unchanged(shopify_ready_data, detector)
+    if shopify_ready_data.empty:
+        logging.info("No new or changed products to upload to Shopify.")
+        success = True
+    else:
+        success = shopify_adapter.upload_products(shopify_ready_data)
     if success:
+        if pending:
+            detector.commit(pending[1])
+        if delta:
+            _commit_delta(state, netsuite_data, run_started)
         logging.info("Data successfully synchronized from NetSuite to Shopify.")
     else:
         logging.error("Data upload to Shopify failed.")
 
 
-def sync_netsuite_to_zoey():
+def sync_netsuite_to_zoey(chunk_size=None, delta=False, concurrency=None, changed_only=False):
     """
     Synchronizes product data from NetSuite to Zoey.
+
+    Parameters:
+        chunk_size (int): If set, stream NetSuite products in chunks of about this many rows and
+            map and export each chunk on its own, keeping memory bounded for large catalogs.
+        delta (bool): If True, fetch only items modified since the last successful run, and merge
+            them into the cached snapshot and advance the stored watermark once the export
+            succeeds. Takes precedence over `chunk_size`.
+        concurrency (int): If set, export with this many workers, keep going past failed products
+            and save them to ZOEY_FAILED_EXPORT_FILE to be re-driven later.
+        changed_only (bool): If True, export only products whose mapped content changed since
+            the last successful export.
     """
     logging.info("Starting NetSuite to Zoey synchronization...")
+    detector = ChangeDetector('netsuite_to_zoey') if changed_only else None
+
+    if chunk_size and not delta:
+        _sync_netsuite_to_zoey_in_chunks(chunk_size, concurrency, detector)
+        return
 
     # Step 1: Fetch data from NetSuite
-    netsuite_data = netsuite_adapter.fetch_netsuite_products()
+    if delta:
+        state = SyncState('netsuite_to_zoey')
+        netsuite_data, run_started = _fetch_netsuite_delta(state)
+        if netsuite_data is None:
+            return
+        if netsuite_data.empty:
+            logging.info("No NetSuite items changed since the last run. Nothing to synchronize.")
+            state.save_watermark(run_started)
+            return
+    else:
+        netsuite_data = netsuite_adapter.fetch_netsuite_products()
+
     if netsuite_data.empty:
         logging.warning("No data fetched from NetSuite. Synchronization aborted.")
         return
+    netsuite_data = optimize_dtypes(netsuite_data, 'NetSuite products')
 
     # Step 2: Map NetSuite data to Zoey format
-    zoey_ready_data = zoey_mapping.map_output_to_zoey_csv(netsuite_data)
+    zoey_ready_data = zoey_mapping.map_output_to_zoey_csv(netsuite_data, lazy=True)
     if zoey_ready_data.empty:
         logging.warning("Mapping to Zoey format failed. No data to export.")
         return
+    zoey_ready_data = optimize_dtypes(zoey_ready_data, 'Zoey products')
+
+    # Step 3: Quarantine invalid products
+    zoey_ready_data = _reject_invalid(zoey_ready_data)
 
-    # Step 3: Export mapped data to Zoey
-    success = zoey_adapter.export_to_zoey(zoey_ready_data)
+    # Step 4: Export mapped data to Zoey
+    success = _export_to_zoey(zoey_ready_data, concurrency, detector)
     if success:
+        if delta:
+            _commit_delta(state, netsuite_data, run_started)
         logging.info("Data successfully synchronized from NetSuite to Zoey.")
     else:
         logging.error("Data export to Zoey failed.")
 
 
-def sync_shopify_to_zoey():
+def _sync_netsuite_to_zoey_in_chunks(chunk_size, concurrency=None, detector=None):
+    """
+    Fetches, maps and exports NetSuite products one chunk at a time.
+    """
+    chunks = 0
+    failed_chunks = []
+    quarantined_chunks = []
+    index = _zoey_index()
+    try:
+        for netsuite_chunk in netsuite_adapter.iter_netsuite_product_chunks(chunk_size=chunk_size):
+            chunks += 1
+
+            netsuite_chunk = optimize_dtypes(netsuite_chunk, f'NetSuite chunk {chunks}')
+            zoey_ready_chunk = zoey_mapping.map_output_to_zoey_csv(netsuite_chunk, lazy=True)
+            if zoey_ready_chunk.empty:
+                logging.warning(f"Mapping chunk {chunks} to Zoey format failed. No data to export.")
+                continue
+            zoey_ready_chunk = optimize_dtypes(zoey_ready_chunk, f'Zoey chunk {chunks}')
+            # Duplicate SKUs are only detected within a chunk
+            zoey_ready_chunk = _reject_invalid(zoey_ready_chunk, quarantined_chunks)
+
+            success, failed_rows = _export_zoey_products(zoey_ready_chunk, index, concurrency, detector)
+            if failed_rows is not None:
+                failed_chunks.append(failed_rows)
+            elif not success:
+                logging.error(f"Data export to Zoey failed on chunk {chunks}.")
+                return
+    except Exception as err:
+        logging.error(f"Data synchronization from NetSuite to Zoey stopped after {chunks} chunks: {err}")
+        return
+    finally:
+        if quarantined_chunks:
+            save_quarantine(pd.concat(quarantined_chunks, ignore_index=True))
+        if failed_chunks:
+            failed_df = pd.concat(failed_chunks, ignore_index=True)
+            failed_df.to_csv(ZOEY_FAILED_EXPORT_FILE, index=False)
+            logging.info(f"Saved {len(failed_df)} failed Zoey products to {ZOEY_FAILED_EXPORT_FILE}.")
+
+    if chunks == 0:
+        logging.warning("No data fetched from NetSuite. Synchronization aborted.")
+        return
+
+    if failed_chunks:
+        logging.error(f"Data export to Zoey finished with failed products. Re-drive them from {ZOEY_FAILED_EXPORT_FILE}.")
+        return
+
+    logging.info(f"Data successfully synchronized from NetSuite to Zoey in {chunks} chunks.")
+
+
+def sync_shopify_to_zoey(concurrency=None, changed_only=False, source='file'):
     """
     Synchronizes product data from Shopify to Zoey.
+
+    Parameters:
+        concurrency (int): If set, export with this many workers, keep going past failed products
+            and save them to ZOEY_FAILED_EXPORT_FILE to be re-driven later.
+        changed_only (bool): If True, export only products whose mapped content changed since
+            the last successful export.
+        source (str): 'file' reads the Shopify Excel export, 'api' runs a bulk query against the store.
     """
     logging.info("Starting Shopify to Zoey synchronization...")
 
     # Step 1: Fetch data from Shopify
-    shopify_data = shopify_adapter.fetch_shopify_data(file='Test Shopify Sheet.xlsx')
+    if source == 'api':
+        shopify_data = shopify_adapter.fetch_shopify_data_from_api()
+    else:
+        shopify_data = shopify_adapter.fetch_shopify_data(file='Test Shopify Sheet.xlsx')
     if shopify_data.empty:
         logging.warning("No data fetched from Shopify. Synchronization aborted.")
         return
+    shopify_data = optimize_dtypes(shopify_data, 'Shopify products')
 
     # Step 2: Map Shopify data to Zoey format
-    zoey_ready_data = zoey_mapping.map_output_to_zoey_csv(shopify_data)
+    zoey_ready_data = zoey_mapping.map_output_to_zoey_csv(shopify_data, lazy=True)
     if zoey_ready_data.empty:
         logging.warning("Mapping to Zoey format failed. No data to export.")
         return
+    zoey_ready_data = optimize_dtypes(zoey_ready_data, 'Zoey products')
+
+    # Step 3: Quarantine invalid products
+    zoey_ready_data = _reject_invalid(zoey_ready_data)
 
-    # Step 3: Export mapped data to Zoey
-    success = zoey_adapter.export_to_zoey(zoey_ready_data)
+    # Step 4: Export mapped data to Zoey
+    detector = ChangeDetector('shopify_to_zoey') if changed_only else None
+    success = _export_to_zoey(zoey_ready_data, concurrency, detector)
     if success:
         logging.info("Data successfully synchronized from Shopify to Zoey.")
     else:
         logging.error("Data export to Zoey failed.")
+
+
+def export_zoey_import_csv(source='netsuite', output_file=None, chunk_size=10000, shopify_source='file'):
+    """
+    Writes a Zoey CSV import file from NetSuite or Shopify products, mapping and writing one
+    chunk at a time instead of building the whole mapped catalog in memory.
+
+    Parameters:
+        source (str): 'netsuite' or 'shopify'.
+        output_file (str): Path of the CSV file. Defaults to ZOEY_IMPORT_FILE.
+        chunk_size (int): Products fetched, mapped and written per chunk.
+        shopify_source (str): For Shopify, 'file' streams the Excel export, 'api' streams a
+            bulk query result.
+
+    Returns:
+        int: Number of products written, or None if the export failed.
+    """
+    output_file = output_file or ZOEY_IMPORT_FILE
+    logging.info(f"Writing the Zoey import file {output_file} from {source} products...")
+
+    # Step 1: Stream the source products
+    if source == 'netsuite':
+        chunks = netsuite_adapter.iter_netsuite_product_chunks(chunk_size=chunk_size)
+    elif source == 'shopify' and shopify_source == 'api':
+        chunks = shopify_adapter.iter_shopify_api_chunks(chunk_size=chunk_size)
+    elif source == 'shopify':
+        chunks = shopify_adapter.iter_shopify_data_chunks(file='Test Shopify Sheet.xlsx', chunk_size=chunk_size)
+    else:
+        logging.error(f"Unsupported source for the Zoey import file: {source}.")
+        return None
+
+    # Step 2: Map and write each chunk in Zoey's column order
+    try:
+        rows = zoey_mapping.write_zoey_csv_from_chunks(chunks, output_file)
+    except Exception as err:
+        logging.error(f"Writing the Zoey import file failed: {err}")
+        return None
+
+    if rows == 0:
+        logging.warning(f"No products fetched from {source}. The Zoey import file has no rows.")
+    return rows
+
+
+def redrive_zoey_failures(failed_file=None, concurrency=None):
+    """
+    Exports again the products saved by a concurrent Zoey export that had failures.
+    Products that fail again are written back to the file; it is removed once all succeed.
+
+    Parameters:
+        failed_file (str): File written by the failed export. Defaults to ZOEY_FAILED_EXPORT_FILE.
+        concurrency (int): Number of products exported at the same time. Defaults to ZOEY_EXPORT_CONCURRENCY.
+
+    Returns:
+        bool: True if every saved product was exported.
+    """
+    failed_file = failed_file or ZOEY_FAILED_EXPORT_FILE
+    if not os.path.exists(failed_file):
+        logging.info(f"No failed Zoey products to re-drive ({failed_file} not found).")
+        return True
+
+    sku_dtypes = {column: str for column in zoey_adapter.ZOEY_SKU_COLUMNS}
+    failed_df = pd.read_csv(failed_file, dtype=sku_dtypes).drop(columns=['export_error'], errors='ignore')
+    logging.info(f"Re-driving {len(failed_df)} failed Zoey products from {failed_file}...")
+
+    result = zoey_adapter.export_to_zoey_concurrent(
+        failed_df, concurrency=concurrency or zoey_adapter.ZOEY_EXPORT_CONCURRENCY, index=_zoey_index()
+    )
+    if result.success:
+        os.remove(failed_file)
+        logging.info("All failed Zoey products were exported.")
+    else:
+        result.save_failed_products(failed_df, failed_file)
+        logging.error(f"{len(result.failed)} Zoey products failed again.")
+    return result.success
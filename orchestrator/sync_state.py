@@ -0,0 +1,120 @@
+# orchestrator/sync_state.py
+
+import json
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+import pandas as pd
+
+# Directory holding watermarks and cached snapshots between sync runs
+SYNC_STATE_DIR = os.getenv('SYNC_STATE_DIR', '.sync_state')
+
+# Safety margin subtracted from the watermark to tolerate clock skew between hosts
+DELTA_OVERLAP = timedelta(minutes=int(os.getenv('NETSUITE_DELTA_OVERLAP_MINUTES', '15')))
+
+# Columns identifying a NetSuite item in the snapshot, in order of preference
+SNAPSHOT_KEY_COLUMNS = ['id', 'internalid', 'variant sku', 'sku', 'itemid']
+
+
+class SyncState:
+    """
+    Persists the high-water mark and the locally cached catalog snapshot of one sync job
+    (e.g. 'netsuite_to_zoey') so later runs can fetch only what changed since the last success.
+    """
+
+    def __init__(self, name, state_dir=SYNC_STATE_DIR):
+        self.name = name
+        self.state_dir = state_dir
+        self.watermark_file = os.path.join(state_dir, f"{name}.watermark.json")
+        self.snapshot_file = os.path.join(state_dir, f"{name}.snapshot.pkl")
+
+    def load_watermark(self):
+        """
+        Returns the start time of the last successful run, or None if there was none.
+
+        Returns:
+            datetime: Timezone-aware UTC watermark, or None.
+        """
+        if not os.path.exists(self.watermark_file):
+            return None
+        with open(self.watermark_file, 'r', encoding='utf-8') as f:
+            return datetime.fromisoformat(json.load(f)['watermark'])
+
+    def modified_since(self):
+        """
+        Returns the lower bound for the next delta fetch (watermark minus the overlap), or None
+        if a full fetch is required.
+        """
+        watermark = self.load_watermark()
+        return watermark - DELTA_OVERLAP if watermark else None
+
+    def save_watermark(self, watermark):
+        """
+        Stores the high-water mark. Call only after the run has been exported successfully.
+
+        Parameters:
+            watermark (datetime): Time the successful run started.
+        """
+        os.makedirs(self.state_dir, exist_ok=True)
+        if watermark.tzinfo is None:
+            watermark = watermark.replace(tzinfo=timezone.utc)
+        tmp_file = f"{self.watermark_file}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({'watermark': watermark.astimezone(timezone.utc).isoformat()}, f)
+        os.replace(tmp_file, self.watermark_file)
+        logging.info(f"Saved {self.name} watermark: {watermark.isoformat()}")
+
+    def load_snapshot(self):
+        """
+        Returns the cached catalog snapshot, or an empty DataFrame if none exists yet.
+        """
+        if not os.path.exists(self.snapshot_file):
+            return pd.DataFrame()
+        return pd.read_pickle(self.snapshot_file)
+
+    def merge_snapshot(self, delta_df, replace=False):
+        """
+        Merges changed rows into the cached snapshot, replacing existing rows with the same key,
+        and saves the result. Call only after the run has been exported successfully.
+
+        Rows are matched on the first of SNAPSHOT_KEY_COLUMNS present in `delta_df`, compared as
+        stripped strings. Rows with a blank key cannot be matched later and are left out; of rows
+        sharing a key, the last one is kept.
+
+        Parameters:
+            delta_df (pandas.DataFrame): Rows fetched in this run.
+            replace (bool): If True, `delta_df` is the full catalog and replaces the snapshot.
+
+        Returns:
+            pandas.DataFrame: The updated snapshot.
+        """
+        key = next((column for column in SNAPSHOT_KEY_COLUMNS if column in delta_df.columns), None)
+        if key is None:
+            logging.warning(f"None of {SNAPSHOT_KEY_COLUMNS} found in the fetched rows. "
+                            f"The {self.name} snapshot is left unchanged.")
+            return self.load_snapshot()
+
+        delta_keys = delta_df[key].astype(object).where(delta_df[key].notna(), '').astype(str).str.strip()
+        usable = (delta_keys != '') & ~delta_keys.duplicated(keep='last')
+        blank = int((delta_keys == '').sum())
+        if blank:
+            logging.warning(f"{blank} fetched rows have no '{key}' and are not added to the {self.name} snapshot.")
+        delta_df = delta_df[usable.to_numpy()]
+
+        snapshot = pd.DataFrame() if replace else self.load_snapshot()
+        if snapshot.empty:
+            merged = delta_df.reset_index(drop=True)
+        elif key not in snapshot.columns:
+            logging.warning(f"The {self.name} snapshot has no '{key}' column. Replacing it with the fetched rows.")
+            merged = delta_df.reset_index(drop=True)
+        else:
+            snapshot_keys = snapshot[key].astype(object).where(snapshot[key].notna(), '').astype(str).str.strip()
+            unchanged = snapshot[~snapshot_keys.isin(delta_keys[usable]).to_numpy()]
+            merged = pd.concat([unchanged, delta_df], ignore_index=True)
+
+        os.makedirs(self.state_dir, exist_ok=True)
+        tmp_file = f"{self.snapshot_file}.tmp"
+        merged.to_pickle(tmp_file)
+        os.replace(tmp_file, self.snapshot_file)
+        logging.info(f"Merged {len(delta_df)} changed rows into the {self.name} snapshot ({len(merged)} rows).")
+        return merged
@@ -0,0 +1,43 @@
+# tests/stub_server.py
+
+import json
+from urllib.parse import urlsplit, parse_qs
+from http.server import BaseHTTPRequestHandler
+
+
+class JSONStubHandler(BaseHTTPRequestHandler):
+    """
+    Base handler for local API stubs. Subclasses implement `handle_json(method, path, query, body)`
+    and return (status, payload). Serve it with `benchmarks.stub_server.start_stub_server`.
+    """
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def _dispatch(self, method):
+        parts = urlsplit(self.path)
+        query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        length = int(self.headers.get('Content-Length', 0))
+        raw_body = self.rfile.read(length) if length else b''
+        body = json.loads(raw_body) if raw_body else None
+        status, payload = self.handle_json(method, parts.path, query, body)
+        encoded = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(encoded)))
+        self.end_headers()
+        self.wfile.write(encoded)
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def do_PUT(self):
+        self._dispatch('PUT')
+
+    def handle_json(self, method, path, query, body):
+        raise NotImplementedError
+
+    def log_message(self, format, *args):
+        pass
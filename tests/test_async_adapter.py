@@ -0,0 +1,70 @@
+# tests/test_async_adapter.py
+
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import patch, MagicMock
+from tenacity import wait_none
+from adapters.async_adapter import AsyncRequestEngine, make_requests
+from adapters.common_adapter import APIConnectionError, RETRY_POLICY
+
+class TestAsyncAdapter(unittest.TestCase):
+    def test_make_requests_limits_concurrency_per_host(self):
+        # Arrange: Track how many requests are in flight per host
+        in_flight = {}
+        peak = {}
+        lock = threading.Lock()
+
+        def fake_send_request(method, url, headers=None, params=None, data=None):
+            host = url.split('/')[2]
+            with lock:
+                in_flight[host] = in_flight.get(host, 0) + 1
+                peak[host] = max(peak.get(host, 0), in_flight[host])
+            time.sleep(0.02)
+            with lock:
+                in_flight[host] -= 1
+            return MagicMock(status_code=200, url=url)
+
+        specs = [{'method': 'GET', 'url': f"https://api.zoey.com/v1/products/{i}"} for i in range(12)]
+        specs += [{'method': 'GET', 'url': f"https://other.example.com/items/{i}"} for i in range(12)]
+
+        # Act: Send all requests with a limit of 3 per host
+        with patch('adapters.async_adapter.send_request', side_effect=fake_send_request):
+            responses = make_requests(specs, concurrency_per_host=3)
+
+        # Assert: Responses come back in request order and the per-host limit holds
+        self.assertEqual([r.url for r in responses], [spec['url'] for spec in specs])
+        self.assertLessEqual(peak['api.zoey.com'], 3)
+        self.assertLessEqual(peak['other.example.com'], 3)
+
+    @patch.dict(RETRY_POLICY, wait=wait_none())
+    def test_request_retries_connection_errors_then_raises(self):
+        engine = AsyncRequestEngine(concurrency_per_host=2)
+
+        # Arrange: Every attempt fails with a connection error
+        with patch('adapters.async_adapter.send_request', side_effect=APIConnectionError("down")) as mock_send:
+            # Act & Assert: The mapped error is re-raised after the retry budget is used up
+            with self.assertRaises(APIConnectionError) as raised:
+                asyncio.run(engine.request("GET", "https://api.zoey.com/v1/products"))
+
+        self.assertEqual(mock_send.call_count, 3, "Should attempt the request three times.")
+        self.assertEqual(raised.exception.attempts, 3)
+        engine.close()
+
+    @patch.dict(RETRY_POLICY, wait=wait_none())
+    def test_request_records_attempts_on_the_response(self):
+        engine = AsyncRequestEngine(concurrency_per_host=2)
+        response = MagicMock(status_code=200)
+
+        # Arrange: The first attempt fails, the second succeeds
+        with patch('adapters.async_adapter.send_request', side_effect=[APIConnectionError("down"), response]):
+            result = asyncio.run(engine.request("GET", "https://api.zoey.com/v1/products"))
+
+        # Assert: Same bookkeeping as `make_request`
+        self.assertIs(result, response)
+        self.assertEqual(result.attempts, 2)
+        engine.close()
+
+if __name__ == '__main__':
+    unittest.main()
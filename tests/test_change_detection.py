@@ -0,0 +1,79 @@
+# tests/test_change_detection.py
+
+import tempfile
+import unittest
+import pandas as pd
+from orchestrator.change_detection import ChangeDetector
+
+class TestChangeDetector(unittest.TestCase):
+    def test_only_new_or_changed_rows_pass_after_commit(self):
+        with tempfile.TemporaryDirectory() as state_dir:
+            detector = ChangeDetector('netsuite_to_zoey', state_dir=state_dir)
+            catalog = pd.DataFrame({'sku': ['A', 'B', 'C'], 'price': [1.0, 2.0, 3.0]})
+
+            # Assert: Without stored hashes every row is new
+            changed, pending = detector.filter_changed(catalog, 'sku')
+            self.assertEqual(changed['sku'].tolist(), ['A', 'B', 'C'])
+            detector.commit(pending)
+
+            # Act: Change B and add D
+            catalog.loc[1, 'price'] = 2.5
+            catalog = pd.concat([catalog, pd.DataFrame({'sku': ['D'], 'price': [4.0]})], ignore_index=True)
+            changed, pending = detector.filter_changed(catalog, 'sku')
+
+            # Assert: Only the changed and the new row are exported
+            self.assertEqual(changed['sku'].tolist(), ['B', 'D'])
+
+            # Act: Only B was exported successfully
+            detector.commit(pending, keys=['B'])
+
+            # Assert: D is still pending on the next run
+            changed, _ = detector.filter_changed(catalog, 'sku')
+            self.assertEqual(changed['sku'].tolist(), ['D'])
+
+    def test_changed_columns_invalidate_stored_hashes(self):
+        with tempfile.TemporaryDirectory() as state_dir:
+            detector = ChangeDetector('netsuite_to_zoey', state_dir=state_dir)
+            catalog = pd.DataFrame({'sku': ['A', 'B'], 'price': [1.0, 2.0]})
+            detector.commit(detector.filter_changed(catalog, 'sku')[1])
+
+            # Act: The mapping gains a column with the same value for every row
+            changed, _ = detector.filter_changed(catalog.assign(status=1), 'sku')
+
+            # Assert: Every row is sent again
+            self.assertEqual(len(changed), 2)
+
+    def test_blank_and_duplicate_keys_are_always_exported(self):
+        with tempfile.TemporaryDirectory() as state_dir:
+            detector = ChangeDetector('netsuite_to_zoey', state_dir=state_dir)
+            catalog = pd.DataFrame({'sku': ['A', '', None, 'B', 'B'], 'price': [1.0, 2.0, 3.0, 4.0, 5.0]})
+
+            # Act: Export everything once
+            changed, pending = detector.filter_changed(catalog, 'sku')
+            detector.commit(pending)
+
+            # Assert: Only the unique key was stored; the other rows are sent again unchanged
+            self.assertEqual(pending[1].index.tolist(), ['A'])
+            changed, _ = detector.filter_changed(catalog, 'sku')
+            self.assertEqual(changed['price'].tolist(), [2.0, 3.0, 4.0, 5.0])
+
+    def test_layout_change_resets_hashes_once_per_run(self):
+        with tempfile.TemporaryDirectory() as state_dir:
+            # Arrange: A previous run stored hashes for another layout
+            old = pd.DataFrame({'sku': ['A'], 'price': [1.0]})
+            previous_run = ChangeDetector('netsuite_to_zoey', state_dir=state_dir)
+            previous_run.commit(previous_run.filter_changed(old, 'sku')[1])
+
+            # Act: This run exports two chunks of the new layout, the second with other column types
+            detector = ChangeDetector('netsuite_to_zoey', state_dir=state_dir)
+            first = pd.DataFrame({'sku': ['B', 'C'], 'price': [1.0, 2.0], 'status': [1, 1]})
+            second = pd.DataFrame({'sku': ['D'], 'price': [3.0], 'status': ['enabled']})
+            detector.commit(detector.filter_changed(first, 'sku')[1])
+            detector.commit(detector.filter_changed(second, 'sku')[1])
+
+            # Assert: The first chunk's hashes survive the second chunk's commit
+            next_run = ChangeDetector('netsuite_to_zoey', state_dir=state_dir)
+            self.assertTrue(next_run.filter_changed(first, 'sku')[0].empty)
+
+if __name__ == '__main__':
+    unittest.main()
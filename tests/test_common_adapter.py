@@ -0,0 +1,218 @@
+# tests/test_common_adapter.py
+
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch, MagicMock
+import requests
+from adapters.common_adapter import (
+    SessionManager, CircuitBreaker, RetryBudget, CircuitOpenError, APIConnectionError, make_request,
+    CONNECT_TIMEOUT, READ_TIMEOUT, DeadlineExceededError, LatencyTracker, job_deadline, request_timeout,
+    HostConcurrencyLimiter,
+)
+
+class TestSessionManager(unittest.TestCase):
+    def test_get_session_reuses_session_per_host(self):
+        manager = SessionManager(pool_size=4)
+
+        first = manager.get_session("https://api.zoey.com/v1/products")
+        second = manager.get_session("https://API.zoey.com/v1/products/1")
+        other_host = manager.get_session("https://example.suitetalk.api.netsuite.com/services/rest/record/v1/item")
+
+        # Assert: One session per host, shared across paths
+        self.assertIs(first, second, "Requests to the same host should share one session.")
+        self.assertIsNot(first, other_host, "Different hosts should get separate sessions.")
+        self.assertEqual(first.get_adapter("https://api.zoey.com")._pool_maxsize, 4)
+
+        manager.close_all()
+
+    @patch('adapters.common_adapter.get_session')
+    def test_make_request_uses_pooled_session(self, mock_get_session):
+        # Arrange: Mock pooled session returning a successful response
+        mock_response = MagicMock(status_code=200)
+        mock_get_session.return_value.request.return_value = mock_response
+
+        # Act: Call make_request
+        response = make_request("GET", "https://api.zoey.com/v1/products", params={'page': 1})
+
+        # Assert: The request went through the session for that host
+        mock_get_session.assert_called_once_with("https://api.zoey.com/v1/products")
+        mock_get_session.return_value.request.assert_called_once_with(
+            "GET", "https://api.zoey.com/v1/products", headers=None, params={'page': 1}, json=None,
+            timeout=(CONNECT_TIMEOUT, READ_TIMEOUT)
+        )
+        self.assertIs(response, mock_response)
+
+    @patch('adapters.common_adapter.get_session')
+    def test_send_request_caps_requests_in_flight_per_host(self, mock_get_session):
+        # Arrange: Track the requests on the wire per host, as separate worker pools would send them
+        in_flight, peak = {}, {}
+        lock = threading.Lock()
+
+        def fake_request(method, url, **kwargs):
+            host = url.split('/')[2]
+            with lock:
+                in_flight[host] = in_flight.get(host, 0) + 1
+                peak[host] = max(peak.get(host, 0), in_flight[host])
+            time.sleep(0.02)
+            with lock:
+                in_flight[host] -= 1
+            return MagicMock(status_code=200)
+
+        mock_get_session.return_value.request.side_effect = fake_request
+        urls = [f"https://api.zoey.com/v1/products/{i}" for i in range(12)]
+        urls += [f"https://other.example.com/items/{i}" for i in range(12)]
+
+        # Act: Two pools of 12 workers share the limit of 3 per host
+        with patch('adapters.common_adapter.host_limiter', HostConcurrencyLimiter(limit=3)):
+            with ThreadPoolExecutor(max_workers=12) as first, ThreadPoolExecutor(max_workers=12) as second:
+                futures = [pool.submit(make_request, "GET", url) for url in urls for pool in (first, second)]
+                for future in futures:
+                    future.result()
+
+        # Assert: The limit holds across pools, per host
+        self.assertEqual(peak, {'api.zoey.com': 3, 'other.example.com': 3})
+
+    def test_waiting_for_a_request_slot_stops_at_the_deadline(self):
+        limiter = HostConcurrencyLimiter(limit=1)
+        with limiter.slot("https://api.zoey.com/v1/products"):
+            with job_deadline(0.05):
+                with self.assertRaises(DeadlineExceededError):
+                    with limiter.slot("https://api.zoey.com/v1/products/1"):
+                        pass
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def test_circuit_opens_after_failures_and_closes_after_probe(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0)
+        url = "https://api.zoey.com/v1/products"
+
+        # Act: Two consecutive failures open the circuit
+        breaker.record_failure(url)
+        breaker.record_failure(url)
+        self.assertEqual(breaker.states(), {"https://api.zoey.com": 'open'})
+
+        # Assert: After the reset timeout one probe is let through, concurrent requests fail fast
+        breaker.before_request(url)
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_request(url)
+
+        # Act / Assert: A successful probe closes the circuit
+        breaker.record_success(url)
+        breaker.before_request(url)
+        self.assertEqual(breaker.states(), {"https://api.zoey.com": 'closed'})
+
+    @patch('adapters.common_adapter.get_session')
+    def test_probe_cut_off_by_the_deadline_is_released(self, mock_get_session):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        url = "https://api.zoey.com/v1/products"
+        mock_get_session.return_value.request.return_value = MagicMock(status_code=200)
+        breaker.record_failure(url)
+
+        with patch('adapters.common_adapter.circuit_breaker', breaker):
+            # Act: The half-open probe is not sent because the job deadline has passed
+            with job_deadline(0):
+                with self.assertRaises(DeadlineExceededError):
+                    make_request("GET", url)
+
+            # Assert: The next request probes the host and closes the circuit
+            make_request("GET", url)
+        self.assertEqual(breaker.states(), {"https://api.zoey.com": 'closed'})
+
+    def test_retry_budget_caps_retries(self):
+        budget = RetryBudget(ratio=0.5, min_retries=2)
+        url = "https://api.zoey.com/v1/products"
+
+        # Assert: Two banked retries, then retries are earned by new requests only
+        self.assertTrue(budget.try_spend(url))
+        self.assertTrue(budget.try_spend(url))
+        self.assertFalse(budget.try_spend(url))
+        budget.record_request(url)
+        budget.record_request(url)
+        self.assertTrue(budget.try_spend(url))
+        self.assertEqual(budget.metrics()["https://api.zoey.com"]['denied'], 1)
+
+    @patch('adapters.common_adapter.retry_budget', RetryBudget(ratio=0, min_retries=10))
+    @patch('adapters.common_adapter.circuit_breaker', CircuitBreaker(failure_threshold=2, reset_timeout=60))
+    @patch('adapters.common_adapter._wait_after_errors', lambda retry_state: 0)
+    @patch('adapters.common_adapter.get_session')
+    def test_make_request_fails_fast_once_circuit_is_open(self, mock_get_session):
+        # Arrange: The host refuses every connection
+        mock_get_session.return_value.request.side_effect = requests.exceptions.ConnectionError("refused")
+        url = "https://down.example.com/v1/products"
+
+        # Act: The first call opens the circuit on its second attempt
+        with self.assertRaises(APIConnectionError):
+            make_request("GET", url)
+
+        # Assert: Later calls fail immediately without touching the network
+        with self.assertRaises(CircuitOpenError) as raised:
+            make_request("GET", url)
+        self.assertEqual(mock_get_session.return_value.request.call_count, 2)
+        self.assertEqual(raised.exception.attempts, 1)
+
+
+class TestDeadlinesAndHedging(unittest.TestCase):
+    def test_job_deadline_shortens_request_timeouts(self):
+        self.assertEqual(request_timeout(), (CONNECT_TIMEOUT, READ_TIMEOUT))
+
+        with job_deadline(2):
+            connect, read = request_timeout()
+            self.assertLessEqual(connect, min(CONNECT_TIMEOUT, 2))
+            self.assertLessEqual(read, 2)
+
+            # A nested deadline can only shorten the outer one
+            with job_deadline(60):
+                self.assertLessEqual(request_timeout()[1], 2)
+
+        self.assertEqual(request_timeout(), (CONNECT_TIMEOUT, READ_TIMEOUT))
+
+    @patch('adapters.common_adapter.get_session')
+    def test_make_request_stops_at_the_deadline(self, mock_get_session):
+        # Arrange: The host always times out
+        mock_get_session.return_value.request.side_effect = requests.exceptions.Timeout("slow")
+
+        # Act: The deadline runs out before the retries would
+        with job_deadline(0.05):
+            time.sleep(0.06)
+            with self.assertRaises(DeadlineExceededError):
+                make_request("GET", "https://slow.example.com/v1/products")
+
+        # Assert: Nothing was sent once the deadline had passed
+        mock_get_session.return_value.request.assert_not_called()
+
+    @patch('adapters.common_adapter.HEDGE_ENABLED', True)
+    @patch('adapters.common_adapter.get_session')
+    def test_slow_get_is_hedged(self, mock_get_session):
+        url = "https://hedge.example.com/v1/products"
+        tracker = LatencyTracker()
+        for _ in range(20):
+            tracker.record(url, 0.01)
+
+        # Arrange: The first request stalls, the duplicate answers at once
+        fast_response = MagicMock(status_code=200)
+        calls = []
+
+        def fake_request(method, request_url, **kwargs):
+            calls.append(time.monotonic())
+            if len(calls) == 1:
+                time.sleep(0.5)
+                return MagicMock(status_code=200)
+            return fast_response
+
+        mock_get_session.return_value.request.side_effect = fake_request
+
+        # Act
+        with patch('adapters.common_adapter.latency_tracker', tracker):
+            started = time.monotonic()
+            response = make_request("GET", url, hedge=True)
+            elapsed = time.monotonic() - started
+
+        # Assert: The hedged duplicate's response was returned without waiting for the first
+        self.assertIs(response, fast_response)
+        self.assertEqual(len(calls), 2)
+        self.assertLess(elapsed, 0.4)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+# tests/test_common_mapping.py
+
+import unittest
+from unittest.mock import patch
+import numpy as np
+import pandas as pd
+from data_mapping.common_mapping import clean_html, clean_html_series, optimize_dtypes, fill_missing_values
+from orchestrator.change_detection import schema_hash
+
+class TestCleanHtml(unittest.TestCase):
+    def test_clean_html_series_handles_breaks_entities_and_whitespace(self):
+        # Arrange: Descriptions with paragraphs, entities, extra whitespace and missing values
+        series = pd.Series([
+            '<p>Soft&nbsp;&amp; warm</p><p>Machine   washable<br/>Imported</p>',
+            '&lt;b&gt;not a tag&lt;/b&gt;',
+            None,
+            np.nan,
+        ], index=[10, 11, 12, 13])
+
+        # Act: Clean the column
+        result = clean_html_series(series)
+
+        # Assert: Line-break tags become newlines, entities are decoded and the index is kept
+        self.assertEqual(result.tolist(), ['Soft & warm\nMachine washable\nImported', '<b>not a tag</b>', '', ''])
+        self.assertEqual(result.index.tolist(), [10, 11, 12, 13])
+        self.assertEqual(clean_html(series[10]), result[10], "Scalar and vectorized cleaning should agree.")
+
+    def test_clean_html_series_cleans_each_distinct_value_once(self):
+        # Arrange: Variants sharing two product bodies
+        series = pd.Series(['<p>Body A</p>', '<p>Body B</p>'] * 500)
+
+        # Act: Count how often entities are decoded (once per distinct value)
+        with patch('data_mapping.common_mapping.html.unescape', side_effect=lambda text: text) as mock_unescape:
+            result = clean_html_series(series)
+
+        # Assert: Two distinct values, cleaned once each, broadcast to all rows
+        self.assertEqual(mock_unescape.call_count, 2)
+        self.assertEqual(result.value_counts().to_dict(), {'Body A': 500, 'Body B': 500})
+
+
+class TestOptimizeDtypes(unittest.TestCase):
+    def test_optimize_dtypes_shrinks_columns_without_changing_values(self):
+        # Arrange: Mapped products with repeated flags, a low-cardinality vendor and unique SKUs
+        rows = 1000
+        df = pd.DataFrame({
+            'sku': pd.Series([f"SKU{i:05d}" for i in range(rows)], dtype=object),
+            'Vendor': pd.Series(['Acme', 'Globex'] * (rows // 2), dtype=object),
+            'tax_class_id': 2,
+            'status': 1,
+            'qty': np.arange(rows),
+            'price': np.full(rows, 19.99),
+            'weight': np.full(rows, 0.5),
+        })
+
+        # Act
+        optimized = optimize_dtypes(df.copy())
+
+        # Assert: Smaller types, same values, and less memory
+        self.assertIsInstance(optimized['Vendor'].dtype, pd.CategoricalDtype)
+        self.assertIsInstance(optimized['tax_class_id'].dtype, pd.CategoricalDtype)
+        self.assertEqual(optimized['status'].dtype, np.int8)
+        self.assertEqual(optimized['qty'].dtype, np.int32)
+        self.assertEqual(optimized['price'].dtype, np.float64, "Prices must not lose precision.")
+        self.assertEqual(optimized['weight'].dtype, np.float64)
+        self.assertNotIsInstance(optimized['sku'].dtype, pd.CategoricalDtype)
+        self.assertEqual(optimized.astype(object).values.tolist(), df.astype(object).values.tolist())
+        self.assertLess(optimized.memory_usage(deep=True).sum(), df.memory_usage(deep=True).sum() / 2)
+
+    def test_chunks_with_different_values_get_the_same_schema(self):
+        # Arrange: One chunk with repeated names and small quantities, one with unique names and large ones
+        small = pd.DataFrame({
+            'sku': pd.Series(['A1', 'A2', 'A3', 'A4'], dtype=object),
+            'name': pd.Series(['Hat'] * 4, dtype=object),
+            'vendor': pd.Series(['Acme'] * 4, dtype=object),
+            'status': [1, 1, 1, 1],
+            'qty': [0, 1, 2, 3],
+            'weight': [0.5, 0.5, 1.0, 1.0],
+        })
+        large = pd.DataFrame({
+            'sku': pd.Series(['B1', 'B2', 'B3', 'B4'], dtype=object),
+            'name': pd.Series(['Hat', 'Shoe', 'Shirt', 'Sock'], dtype=object),
+            'vendor': pd.Series(['Acme', 'Globex', 'Initech', 'Umbrella'], dtype=object),
+            'status': [1, 2, 1, 2],
+            'qty': [0, 40000, 100000, 5],
+            'weight': [0.1, 12.345, 1.0, 3.3],
+        })
+
+        # Act
+        first, second = optimize_dtypes(small), optimize_dtypes(large)
+
+        # Assert: Change detection sees one layout across the chunks
+        self.assertEqual(schema_hash(first), schema_hash(second))
+        self.assertEqual(first.dtypes.astype(str).tolist(), second.dtypes.astype(str).tolist())
+
+    def test_fill_missing_values_fills_optimized_columns(self):
+        df = optimize_dtypes(pd.DataFrame({
+            'vendor': ['Acme', None, 'Acme', 'Acme'],
+            'weight': [0.5, None, 1.0, 2.0],
+        }))
+
+        filled = fill_missing_values(df)
+
+        self.assertEqual(filled['vendor'].tolist(), ['Acme', '', 'Acme', 'Acme'])
+        self.assertEqual(filled['weight'].tolist(), [0.5, 0.0, 1.0, 2.0])
+
+if __name__ == '__main__':
+    unittest.main()
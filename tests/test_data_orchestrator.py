@@ -4,7 +4,14 @@ import unittest
 from unittest.mock import patch, MagicMock
 import pandas as pd
 import logging
-from orchestrator.data_orchestrator import sync_netsuite_to_shopify
+import os
+import tempfile
+from adapters.netsuite_adapter import NetSuiteAPIError
+from adapters.zoey_index import ZoeyProductIndex
+from orchestrator.change_detection import ChangeDetector
+from orchestrator.sync_state import SyncState
+from adapters import shopify_adapter
+from orchestrator.data_orchestrator import sync_netsuite_to_shopify, sync_netsuite_to_zoey, redrive_zoey_failures, export_zoey_import_csv
 
 class TestDataOrchestrator(unittest.TestCase):
     @patch('orchestrator.data_orchestrator.shopify_adapter.upload_products')
@@ -109,5 +116,245 @@ class TestDataOrchestrator(unittest.TestCase):
         # Assert: Verify error log is captured
         mock_logging.error.assert_called_once_with("Data upload to Shopify failed.")
 
+    @patch('orchestrator.data_orchestrator.save_quarantine')
+    @patch('orchestrator.data_orchestrator.shopify_adapter.upload_products')
+    @patch('orchestrator.data_orchestrator.netsuite_adapter.fetch_netsuite_products')
+    def test_sync_netsuite_to_shopify_validates_mapped_products(self, mock_fetch_netsuite, mock_upload_products, mock_save_quarantine):
+        """
+        Test that validation runs on the mapped Shopify columns, not on the raw NetSuite fields.
+        """
+        # Arrange: Raw NetSuite items, one with a zero price
+        mock_fetch_netsuite.return_value = pd.DataFrame([
+            {'title': 'Product A', 'variant sku': 'SKU-A', 'variant price': 10.99, 'inventory_qty': 5},
+            {'title': 'Product B', 'variant sku': 'SKU-B', 'variant price': 0.0, 'inventory_qty': 3},
+        ])
+        mock_upload_products.return_value = True
+
+        # Act: Map with the real NetSuite to Shopify mapping
+        sync_netsuite_to_shopify()
+
+        # Assert: Only the valid product is uploaded, in the Shopify layout
+        uploaded = mock_upload_products.call_args[0][0]
+        self.assertEqual(uploaded['Variant SKU'].tolist(), ['SKU-A'])
+        self.assertEqual(uploaded['Handle'].tolist(), ['product-a'])
+        quarantined = mock_save_quarantine.call_args[0][0]
+        self.assertEqual(quarantined['Variant SKU'].tolist(), ['SKU-B'])
+        self.assertEqual(quarantined['quarantine_reason'].tolist(), ['missing or non-positive price'])
+
+    @patch('orchestrator.data_orchestrator.shopify_adapter.upload_products')
+    @patch('orchestrator.data_orchestrator.netsuite_adapter.fetch_netsuite_products')
+    def test_delta_sync_merges_snapshot_after_successful_upload(self, mock_fetch_netsuite, mock_upload_products):
+        """
+        Test that a delta run merges the changed items into the cached snapshot only once the
+        upload succeeded, and that an empty delta still advances the watermark.
+        """
+        full_catalog = pd.DataFrame({
+            'id': ['1', '2'], 'title': ['Product A', 'Product B'],
+            'variant sku': ['SKU-A', 'SKU-B'], 'variant price': [10.0, 20.0],
+        })
+        changed = pd.DataFrame({'id': ['2'], 'title': ['Product B v2'], 'variant sku': ['SKU-B'], 'variant price': [25.0]})
+
+        with tempfile.TemporaryDirectory() as state_dir:
+            state = SyncState('netsuite_to_shopify', state_dir=state_dir)
+            with patch('orchestrator.data_orchestrator.SyncState', lambda name: state):
+                # Act: First run fetches the full catalog
+                mock_fetch_netsuite.return_value = full_catalog
+                mock_upload_products.return_value = True
+                sync_netsuite_to_shopify(delta=True)
+                first_watermark = state.load_watermark()
+
+                # Act: A delta whose upload fails leaves the snapshot and watermark alone
+                mock_fetch_netsuite.return_value = changed
+                mock_upload_products.return_value = False
+                sync_netsuite_to_shopify(delta=True)
+                self.assertEqual(state.load_snapshot()['title'].tolist(), ['Product A', 'Product B'])
+                self.assertEqual(state.load_watermark(), first_watermark)
+
+                # Act: The same delta uploaded successfully is merged
+                mock_upload_products.return_value = True
+                sync_netsuite_to_shopify(delta=True)
+                second_watermark = state.load_watermark()
+
+                # Act: A successful fetch without changes advances the watermark
+                mock_upload_products.reset_mock()
+                mock_fetch_netsuite.return_value = pd.DataFrame()
+                sync_netsuite_to_shopify(delta=True)
+                third_watermark = state.load_watermark()
+
+                # Act: A failed fetch does not
+                mock_fetch_netsuite.side_effect = NetSuiteAPIError("NetSuite is down")
+                sync_netsuite_to_shopify(delta=True)
+
+            # Assert
+            self.assertEqual(mock_fetch_netsuite.call_args.kwargs['modified_since'], state.modified_since())
+            self.assertTrue(mock_fetch_netsuite.call_args.kwargs['raise_errors'])
+            self.assertEqual(dict(zip(state.load_snapshot()['id'], state.load_snapshot()['title'])),
+                             {'1': 'Product A', '2': 'Product B v2'})
+            self.assertGreater(second_watermark, first_watermark)
+            self.assertGreater(third_watermark, second_watermark)
+            self.assertEqual(state.load_watermark(), third_watermark)
+            mock_upload_products.assert_not_called()
+
+    @patch('orchestrator.data_orchestrator.zoey_adapter.export_to_zoey')
+    @patch('orchestrator.data_orchestrator.zoey_mapping.map_output_to_zoey_csv')
+    @patch('orchestrator.data_orchestrator.netsuite_adapter.fetch_netsuite_products')
+    @patch('orchestrator.data_orchestrator.netsuite_adapter.iter_netsuite_product_chunks')
+    def test_sync_netsuite_to_zoey_in_chunks(self, mock_iter_chunks, mock_fetch_netsuite, mock_map_to_zoey, mock_export_to_zoey):
+        """
+        Test that chunked synchronization maps and exports each NetSuite chunk separately.
+        """
+        # Arrange: Two NetSuite chunks, each mapped to its own Zoey frame
+        chunks = [pd.DataFrame([{'title': 'Product A'}]), pd.DataFrame([{'title': 'Product B'}])]
+        mock_iter_chunks.return_value = iter(chunks)
+        mock_map_to_zoey.side_effect = lambda df, lazy=False: df.rename(columns={'title': 'name'})
+        mock_export_to_zoey.return_value = True
+
+        # Act: Call the orchestrator function in chunked mode
+        sync_netsuite_to_zoey(chunk_size=1000)
+
+        # Assert: The full fetch is skipped and every chunk is exported
+        mock_fetch_netsuite.assert_not_called()
+        mock_iter_chunks.assert_called_once_with(chunk_size=1000)
+        self.assertEqual(mock_export_to_zoey.call_count, 2)
+        self.assertEqual(mock_export_to_zoey.call_args_list[1][0][0]['name'].tolist(), ['Product B'])
+
+    @patch('orchestrator.data_orchestrator._zoey_index')
+    @patch('orchestrator.data_orchestrator.zoey_adapter.export_to_zoey')
+    @patch('orchestrator.data_orchestrator.zoey_mapping.map_output_to_zoey_csv')
+    @patch('orchestrator.data_orchestrator.netsuite_adapter.fetch_netsuite_products')
+    def test_sync_netsuite_to_zoey_changed_only(self, mock_fetch_netsuite, mock_map_to_zoey, mock_export_to_zoey, mock_zoey_index):
+        """
+        Test that a second run with change detection exports only the products that changed.
+        """
+        # Arrange: Mapping is the identity and every export succeeds
+        mock_map_to_zoey.side_effect = lambda df, lazy=False: df
+        mock_export_to_zoey.return_value = True
+
+        with tempfile.TemporaryDirectory() as state_dir:
+            with patch('orchestrator.data_orchestrator.ChangeDetector', lambda name: ChangeDetector(name, state_dir=state_dir)):
+                # Act: First run exports the whole catalog
+                mock_fetch_netsuite.return_value = pd.DataFrame({'sku': ['A', 'B'], 'price': [1.0, 2.0]})
+                sync_netsuite_to_zoey(changed_only=True)
+
+                # Act: Second run with only B changed
+                mock_fetch_netsuite.return_value = pd.DataFrame({'sku': ['A', 'B'], 'price': [1.0, 2.5]})
+                sync_netsuite_to_zoey(changed_only=True)
+
+        # Assert: Only B is exported the second time
+        self.assertEqual(mock_export_to_zoey.call_count, 2)
+        self.assertEqual(mock_export_to_zoey.call_args_list[0][0][0]['sku'].tolist(), ['A', 'B'])
+        self.assertEqual(mock_export_to_zoey.call_args_list[1][0][0]['sku'].tolist(), ['B'])
+
+    @patch('orchestrator.data_orchestrator.shopify_adapter.upload_products')
+    @patch('orchestrator.data_orchestrator.netsuite_adapter.fetch_netsuite_products')
+    def test_sync_netsuite_to_shopify_changed_only_keys_variants_by_sku(self, mock_fetch_netsuite, mock_upload_products):
+        """
+        Test that variants sharing a title (and so a Handle) are told apart by their SKU.
+        """
+        # Arrange: Two variants of the same product, mapped with the real Shopify mapping
+        mock_fetch_netsuite.return_value = pd.DataFrame({
+            'title': ['Tee', 'Tee'], 'variant sku': ['TEE-S', 'TEE-M'], 'variant price': [10.0, 10.0],
+        })
+        mock_upload_products.return_value = True
+
+        with tempfile.TemporaryDirectory() as state_dir:
+            with patch('orchestrator.data_orchestrator.ChangeDetector', lambda name: ChangeDetector(name, state_dir=state_dir)):
+                # Act: Two runs with unchanged products
+                sync_netsuite_to_shopify(changed_only=True)
+                with self.assertNoLogs(level=logging.WARNING):
+                    sync_netsuite_to_shopify(changed_only=True)
+
+        # Assert: Both variants were uploaded once and skipped on the second run
+        mock_upload_products.assert_called_once()
+        self.assertEqual(mock_upload_products.call_args[0][0]['Variant SKU'].tolist(), ['TEE-S', 'TEE-M'])
+
+    @patch.dict(os.environ, {'ZOEY_API_KEY': 'test-key'})
+    @patch('orchestrator.data_orchestrator.zoey_mapping.fetch_data_from_zoey', return_value=pd.DataFrame())
+    @patch('orchestrator.data_orchestrator.netsuite_adapter.fetch_netsuite_products')
+    @patch('adapters.zoey_adapter.make_request')
+    def test_concurrent_zoey_sync_saves_failed_products_for_redrive(self, mock_make_request, mock_fetch_netsuite, _):
+        """
+        Test the concurrent NetSuite to Zoey sync end to end through the real Zoey CSV mapping and
+        exporter: a product rejected by Zoey is saved with its error and re-driven by SKU.
+        """
+        # Arrange: Zoey rejects SKU002 with a server error
+        mock_fetch_netsuite.return_value = pd.DataFrame({
+            'sku': ['SKU001', 'SKU002', 'SKU003'],
+            'title': ['Product A', 'Product B', 'Product C'],
+            'variant_price': [10.0, 20.0, 30.0],
+        })
+
+        def zoey_response(method, url, headers=None, data=None):
+            sku = data['variants'][0]['sku']
+            if sku == 'SKU002':
+                return MagicMock(status_code=500, text='Internal Server Error')
+            return MagicMock(status_code=201, json=MagicMock(return_value={'id': f"id-{sku}"}))
+
+        mock_make_request.side_effect = zoey_response
+
+        with tempfile.TemporaryDirectory() as state_dir:
+            failed_file = os.path.join(state_dir, 'failed.csv')
+            index = ZoeyProductIndex(os.path.join(state_dir, 'index.sqlite'))
+            with patch('orchestrator.data_orchestrator.zoey_product_index', index), \
+                    patch('orchestrator.data_orchestrator.ZOEY_FAILED_EXPORT_FILE', failed_file):
+                # Act: Export with two workers
+                sync_netsuite_to_zoey(concurrency=2)
+                saved = pd.read_csv(failed_file, dtype={'sku': str})
+
+                # Assert: Every payload carried its SKU and only the rejected product was saved
+                sent_skus = sorted(call.kwargs['data']['variants'][0]['sku'] for call in mock_make_request.call_args_list)
+                self.assertEqual(sent_skus, ['SKU001', 'SKU002', 'SKU003'])
+                self.assertEqual(saved['sku'].tolist(), ['SKU002'])
+                self.assertEqual(saved['name'].tolist(), ['Product B'])
+                self.assertEqual(saved['export_error'].tolist(), ['500 - Internal Server Error'])
+                self.assertEqual(index.lookup(['SKU001', 'SKU003']), {'SKU001': 'id-SKU001', 'SKU003': 'id-SKU003'})
+
+                # Act: Zoey accepts the product on the re-drive
+                mock_make_request.reset_mock(side_effect=True)
+                mock_make_request.return_value = MagicMock(status_code=201, json=MagicMock(return_value={'id': 'id-SKU002'}))
+                self.assertTrue(redrive_zoey_failures(concurrency=2))
+
+            # Assert: Only the failed product was sent again and the file is gone
+            mock_make_request.assert_called_once()
+            self.assertEqual(mock_make_request.call_args.kwargs['data']['variants'][0]['sku'], 'SKU002')
+            self.assertFalse(os.path.exists(failed_file))
+            index.close()
+
+    @patch('orchestrator.data_orchestrator.shopify_adapter.fetch_shopify_data')
+    def test_export_zoey_import_csv_streams_the_shopify_file(self, mock_fetch_shopify_data):
+        """
+        Test that the Shopify file source is read and written in chunks, not loaded as one frame.
+        """
+        stream = shopify_adapter.iter_shopify_data_chunks
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            # Arrange: A five-product Shopify export
+            workbook = os.path.join(tmp_dir, 'shopify.xlsx')
+            pd.DataFrame({
+                'Handle': [f'product-{i}' for i in range(5)],
+                'Title': [f'Product {i}' for i in range(5)],
+                'Body (HTML)': ['<p>Desc</p>'] * 5,
+                'Variant SKU': [f'SKU{i}' for i in range(5)],
+                'Variant Price': [10.0 + i for i in range(5)],
+            }).to_excel(workbook, index=False)
+            chunk_sizes = []
+
+            def read_chunks(file, chunk_size):
+                for chunk in stream(workbook, chunk_size=chunk_size):
+                    chunk_sizes.append(len(chunk))
+                    yield chunk
+
+            output_file = os.path.join(tmp_dir, 'zoey_import.csv')
+            with patch('orchestrator.data_orchestrator.shopify_adapter.iter_shopify_data_chunks', side_effect=read_chunks):
+                # Act
+                rows = export_zoey_import_csv(source='shopify', output_file=output_file, chunk_size=2)
+            written = pd.read_csv(output_file)
+
+        # Assert: Three chunks were streamed into one import file
+        self.assertEqual(rows, 5)
+        self.assertEqual(chunk_sizes, [2, 2, 1])
+        self.assertEqual(written['sku'].tolist(), [f'SKU{i}' for i in range(5)])
+        self.assertEqual(written['description'].tolist(), ['Desc'] * 5)
+        mock_fetch_shopify_data.assert_not_called()
+
 if __name__ == '__main__':
     unittest.main()
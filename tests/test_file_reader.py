@@ -0,0 +1,97 @@
+# tests/test_file_reader.py
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+import pandas as pd
+from adapters import file_reader
+from adapters.file_reader import FileCache, iter_excel_chunks
+from adapters.shopify_adapter import iter_shopify_data_chunks
+
+class TestFileCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache = FileCache(cache_dir=os.path.join(self.tmp_dir.name, 'cache'))
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _write_csv(self, name, rows):
+        path = os.path.join(self.tmp_dir.name, name)
+        pd.DataFrame({'Variant SKU': [f'SKU{i:03d}' for i in range(rows)], 'Variant Price': [1.5] * rows}).to_csv(path, index=False)
+        return path
+
+    def test_read_is_served_from_cache_until_content_changes(self):
+        path = self._write_csv('products.csv', 3)
+
+        with patch('adapters.file_reader._read_source', wraps=file_reader._read_source) as mock_read_source:
+            # Act: Read twice, then touch the file without changing its content
+            first = self.cache.read(path)
+            second = self.cache.read(path)
+            os.utime(path, (0, 0))
+            touched = self.cache.read(path)
+
+            # Assert: Only the first read parsed the file
+            self.assertEqual(mock_read_source.call_count, 1)
+            pd.testing.assert_frame_equal(first, second)
+            pd.testing.assert_frame_equal(first, touched)
+
+            # Act: Change the content
+            self._write_csv('products.csv', 4)
+            changed = self.cache.read(path)
+
+            # Assert: New content is parsed again
+            self.assertEqual(mock_read_source.call_count, 2)
+            self.assertEqual(len(changed), 4)
+
+    def test_old_entries_are_evicted_when_cache_is_full(self):
+        # Arrange: A budget that only fits one entry
+        first_path = self._write_csv('first.csv', 200)
+        second_path = self._write_csv('second.csv', 200)
+        self.cache.read(first_path)
+        self.cache.max_bytes = self.cache._load_index().popitem()[1]['bytes']
+
+        # Act: Cache a second file
+        self.cache.read(second_path)
+
+        # Assert: Only the most recently used entry is kept
+        index = self.cache._load_index()
+        self.assertEqual([entry['path'] for entry in index.values()], [os.path.abspath(second_path)])
+
+
+class TestIterExcelChunks(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, 'products.xlsx')
+        pd.DataFrame({
+            'Variant SKU': [f'SKU{i:03d}' for i in range(5)],
+            'Title': [f'Product {i}' for i in range(5)],
+            'Unused Column': ['x'] * 5,
+            'Variant Price': [1.0, 2.0, None, 4.0, 5.0],
+        }).to_excel(self.path, index=False)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_iter_excel_chunks_reads_selected_columns_in_chunks(self):
+        # Act: Stream two columns in chunks of two rows
+        chunks = list(iter_excel_chunks(self.path, columns=['Title', 'Variant SKU'], chunk_size=2))
+
+        # Assert: Only the requested columns, in the requested order, split into bounded chunks
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 2, 1])
+        self.assertEqual(chunks[0].columns.tolist(), ['Title', 'Variant SKU'])
+        self.assertEqual(chunks[2]['Variant SKU'].tolist(), ['SKU004'])
+
+    def test_iter_shopify_data_chunks_cleans_each_chunk(self):
+        # Act: Stream the Shopify adapter view of the file
+        chunks = list(iter_shopify_data_chunks(self.path, chunk_size=3))
+
+        # Assert: Column names are normalized, unused columns skipped, prices filled
+        self.assertEqual(len(chunks), 2)
+        self.assertNotIn('unused_column', chunks[0].columns)
+        self.assertEqual(chunks[0]['variant_price'].tolist(), [1.0, 2.0, 0.0])
+        self.assertEqual(chunks[1]['variant_sku'].tolist(), ['SKU003', 'SKU004'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+# tests/test_mapping_spec.py
+
+import json
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from adapters.zoey_adapter import build_zoey_payloads
+from data_mapping.mapping_spec import FieldSpec, LazyFrame, compile_mapping
+from data_mapping.netsuite_mapping import map_to_shopify
+from data_mapping.zoey_mapping import map_output_to_zoey_csv
+
+class TestMappingSpec(unittest.TestCase):
+    def test_plan_reads_sources_positionally_and_broadcasts_defaults(self):
+        # Arrange: A spec with a transform, a filled column, a missing source and a constant
+        plan = compile_mapping([
+            FieldSpec('name', 'title', transform=lambda titles: titles.str.upper()),
+            FieldSpec('price', 'price', default=0.0, fillna=True),
+            FieldSpec('brand', 'brand', default='Unknown'),
+            FieldSpec('status', default=1),
+        ])
+        source = pd.DataFrame({'title': ['a', 'b', 'c'], 'price': [1.5, np.nan, 3.0]}, index=[7, 3, 9])
+
+        # Act
+        result = plan(source)
+
+        # Assert: Every row is filled and the source index is kept
+        self.assertEqual(result.columns.tolist(), ['name', 'price', 'brand', 'status'])
+        self.assertEqual(result.index.tolist(), [7, 3, 9])
+        self.assertEqual(result['name'].tolist(), ['A', 'B', 'C'])
+        self.assertEqual(result['price'].tolist(), [1.5, 0.0, 3.0])
+        self.assertEqual(result['brand'].tolist(), ['Unknown'] * 3)
+        self.assertEqual(result['status'].tolist(), [1, 1, 1])
+
+    def test_source_candidates_read_the_first_present_column(self):
+        plan = compile_mapping([FieldSpec('sku', ('sku', 'variant_sku'))])
+
+        # Assert: Shopify and NetSuite frames normalize the SKU to 'variant_sku'
+        self.assertEqual(plan(pd.DataFrame({'variant_sku': ['A', 'B']}))['sku'].tolist(), ['A', 'B'])
+        self.assertEqual(plan(pd.DataFrame({'sku': ['C'], 'variant_sku': ['D']}))['sku'].tolist(), ['C'])
+        self.assertEqual(plan(pd.DataFrame({'title': ['E']}))['sku'].tolist(), [''])
+
+    def test_duplicate_output_columns_are_rejected(self):
+        with self.assertRaises(ValueError):
+            compile_mapping([FieldSpec('sku', 'sku'), FieldSpec('sku', 'variant sku')])
+
+    def test_map_to_shopify_fills_defaults_for_missing_columns(self):
+        # Arrange: NetSuite items without 'type' or 'vendor' columns
+        netsuite_df = pd.DataFrame({
+            'title': ['Blue Tee/Shirt', 'Red Hat'],
+            'variant sku': ['SKU1', 'SKU2'],
+            'variant price': [19.99, None],
+        })
+
+        # Act
+        shopify_df = map_to_shopify(netsuite_df)
+
+        # Assert: Defaults cover every row instead of only the first
+        self.assertEqual(shopify_df['Handle'].tolist(), ['blue-tee-shirt', 'red-hat'])
+        self.assertEqual(shopify_df['Type'].tolist(), ['Product', 'Product'])
+        self.assertEqual(shopify_df['Vendor'].tolist(), ['Unknown', 'Unknown'])
+        self.assertEqual(shopify_df['Published'].tolist(), [True, True])
+        self.assertEqual(shopify_df['Variant Price'].tolist(), [19.99, 0.0])
+
+
+class TestLazyFrame(unittest.TestCase):
+    def setUp(self):
+        self.source = pd.DataFrame({
+            'sku': ['SKU1', 'SKU2', 'SKU3'],
+            'title': ['Blue Tee', 'Red Hat', 'Green Sock'],
+            'variant_price': [19.99, 5.0, 2.5],
+        })
+
+    def test_lazy_zoey_mapping_keeps_defaults_scalar(self):
+        lazy = map_output_to_zoey_csv(self.source.copy(), lazy=True)
+
+        # Assert: Default columns are not materialized, but read like regular columns
+        self.assertIsInstance(lazy, LazyFrame)
+        self.assertEqual(lazy.constants['status'], 1)
+        self.assertNotIn('status', lazy.data.columns)
+        self.assertEqual(lazy['visibility'].tolist(), [4, 4, 4])
+        pd.testing.assert_frame_equal(lazy.to_frame(), map_output_to_zoey_csv(self.source.copy()))
+
+    def test_lazy_writers_match_the_materialized_output(self):
+        lazy = map_output_to_zoey_csv(self.source.copy(), lazy=True)
+        expected = lazy.to_frame()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            lazy_csv, frame_csv = os.path.join(tmp, 'lazy.csv'), os.path.join(tmp, 'frame.csv')
+            lazy.to_csv(lazy_csv, index=False, chunk_size=2)
+            expected.to_csv(frame_csv, index=False)
+            with open(lazy_csv) as lazy_file, open(frame_csv) as frame_file:
+                self.assertEqual(lazy_file.read(), frame_file.read())
+
+            lazy_json = os.path.join(tmp, 'lazy.json')
+            lazy.to_json(lazy_json, chunk_size=2)
+            with open(lazy_json) as json_file:
+                records = [json.loads(line) for line in json_file]
+        self.assertEqual([record['sku'] for record in records], ['SKU1', 'SKU2', 'SKU3'])
+        self.assertEqual({record['tax_class_id'] for record in records}, {2})
+
+    def test_zoey_payloads_from_lazy_frame(self):
+        # Arrange: NetSuite-style Zoey columns with constant 'Published' and 'Vendor'
+        plan = compile_mapping([
+            FieldSpec('Title', 'title'),
+            FieldSpec('SKU', 'sku'),
+            FieldSpec('Vendor', 'vendor', default='Unknown'),
+            FieldSpec('Published', default=True),
+        ])
+
+        # Act / Assert: Constants are repeated into every payload, same as a regular frame
+        lazy = plan(self.source, lazy=True)
+        self.assertEqual(build_zoey_payloads(lazy), build_zoey_payloads(plan(self.source)))
+        self.assertEqual(build_zoey_payloads(lazy)[2]['vendor'], 'Unknown')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,10 +1,16 @@
 # tests/test_netsuite_adapter.py
 
+import os
+import tempfile
 import unittest
+from datetime import datetime
 from unittest.mock import patch, MagicMock
 import pandas as pd
-from adapters.netsuite_adapter import fetch_netsuite_products
+from adapters.netsuite_adapter import fetch_netsuite_products, iter_netsuite_product_chunks, fetch_netsuite_products_suiteql
+from benchmarks.stub_server import start_stub_server
+from tests.stub_server import JSONStubHandler
 import requests
+from adapters.common_adapter import APIConnectionError
 
 class TestNetSuiteAdapter(unittest.TestCase):
     @patch('adapters.netsuite_adapter.make_request')  # Mock `make_request` from `common_adapter`
@@ -86,5 +92,153 @@ class TestNetSuiteAdapter(unittest.TestCase):
         # Assert: Check that an empty DataFrame is returned
         self.assertTrue(result_df.empty, "The resulting DataFrame should be empty when access token is missing.")
 
+    @patch('adapters.netsuite_adapter.make_request')
+    @patch('adapters.netsuite_adapter.os.getenv')
+    def test_fetch_netsuite_products_parallel_reassembles_pages_in_order(self, mock_getenv, mock_make_request):
+        # Arrange: Mock environment variable
+        mock_getenv.return_value = 'valid_access_token'
+
+        # Mock a 2500-item catalog served in pages of 1000 (limit/offset paging)
+        def fake_page(method, url, headers=None, params=None, **kwargs):
+            offset, limit = params['offset'], params['limit']
+            response = MagicMock(status_code=200)
+            response.json.return_value = {
+                'items': [{'variant sku': f'SKU{i:05d}'} for i in range(offset, min(offset + limit, 2500))],
+                'totalResults': 2500,
+                'hasMore': offset + limit < 2500,
+            }
+            return response
+
+        mock_make_request.side_effect = fake_page
+
+        # Act: Fetch with parallel pagination
+        result_df = fetch_netsuite_products(parallel=True, max_in_flight=2)
+
+        # Assert: One request per page, no trailing empty page, items in offset order
+        self.assertEqual(mock_make_request.call_count, 3, "Should request exactly the three pages reported by totalResults.")
+        self.assertEqual(len(result_df), 2500)
+        self.assertEqual(result_df['variant sku'].tolist(), [f'SKU{i:05d}' for i in range(2500)])
+
+    @patch('adapters.netsuite_adapter.make_request')
+    @patch('adapters.netsuite_adapter.os.getenv')
+    def test_fetch_netsuite_products_resumes_from_checkpoint(self, mock_getenv, mock_make_request):
+        # Arrange: Mock environment variable
+        mock_getenv.return_value = 'valid_access_token'
+
+        def page_response(items):
+            response = MagicMock(status_code=200)
+            response.json.return_value = {'items': items}
+            return response
+
+        first_page = [{'variant sku': 'SKU001'}]
+        second_page = [{'variant sku': 'SKU002'}]
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            checkpoint_dir = os.path.join(tmp_dir, 'checkpoint')
+
+            # Act: First run fails on the second page after the first page was fetched
+            mock_make_request.side_effect = [page_response(first_page), APIConnectionError("Failed to establish a new connection.")]
+            failed_df = fetch_netsuite_products(checkpoint_dir=checkpoint_dir)
+
+            # Assert: The run fails but keeps the fetched page on disk
+            self.assertTrue(failed_df.empty)
+            self.assertTrue(os.path.exists(os.path.join(checkpoint_dir, 'page_0000000000.json')))
+
+            # Act: Second run resumes at the failed offset
+            mock_make_request.reset_mock()
+            mock_make_request.side_effect = [page_response(second_page), page_response([])]
+            result_df = fetch_netsuite_products(checkpoint_dir=checkpoint_dir)
+
+            # Assert: Only the failed offset and the end-of-pagination page were requested
+            requested_offsets = [call.kwargs['params']['offset'] for call in mock_make_request.call_args_list]
+            self.assertEqual(requested_offsets, [1000, 2000])
+            self.assertEqual(result_df['variant sku'].tolist(), ['SKU001', 'SKU002'])
+            self.assertFalse(os.path.exists(checkpoint_dir), "The checkpoint should be removed after a complete fetch.")
+
+    @patch('adapters.netsuite_adapter.PAGE_SIZE', 2)
+    @patch('adapters.netsuite_adapter.make_request')
+    @patch('adapters.netsuite_adapter.os.getenv')
+    def test_iter_netsuite_product_chunks_groups_pages(self, mock_getenv, mock_make_request):
+        # Arrange: Mock environment variable
+        mock_getenv.return_value = 'valid_access_token'
+
+        # Mock five items served two per page, followed by an empty page
+        items = [{'variant sku': f'SKU00{i}', 'variant price': str(i)} for i in range(5)]
+        def fake_page(method, url, headers=None, params=None, **kwargs):
+            response = MagicMock(status_code=200)
+            response.json.return_value = {'items': items[params['offset']:params['offset'] + params['limit']]}
+            return response
+        mock_make_request.side_effect = fake_page
+
+        # Act: Stream chunks of at least four rows
+        chunks = list(iter_netsuite_product_chunks(chunk_size=4))
+
+        # Assert: Two pages form the first chunk, the remainder forms the last one
+        self.assertEqual([len(chunk) for chunk in chunks], [4, 1])
+        self.assertEqual(chunks[0]['variant price'].dtype, 'float64', "Numeric fields should be typed in every chunk.")
+        self.assertEqual(chunks[1]['variant sku'].tolist(), ['SKU004'])
+
+    @patch('adapters.netsuite_adapter.make_request')
+    @patch('adapters.netsuite_adapter.os.getenv')
+    def test_fetch_netsuite_products_modified_since_filters_query(self, mock_getenv, mock_make_request):
+        # Arrange: Mock environment variable and a single empty page
+        mock_getenv.return_value = 'valid_access_token'
+        empty_response = MagicMock(status_code=200)
+        empty_response.json.return_value = {'items': []}
+        mock_make_request.return_value = empty_response
+
+        # Act: Fetch only items modified since a watermark
+        fetch_netsuite_products(modified_since=datetime(2024, 5, 1, 14, 30))
+
+        # Assert: The lastModifiedDate filter is sent as the record query
+        params = mock_make_request.call_args.kwargs['params']
+        self.assertEqual(params['q'], 'lastModifiedDate ON_OR_AFTER "05/01/2024 02:30 PM"')
+
+
+class SuiteQLStubHandler(JSONStubHandler):
+    """Serves a 2500-item catalog in SuiteQL result-set shape."""
+    statements = []
+
+    def handle_json(self, method, path, query, body):
+        if method != 'POST' or path != '/services/rest/query/v1/suiteql' or self.headers.get('Prefer') != 'transient':
+            return 400, {'error': 'bad request'}
+        self.statements.append(body['q'])
+        offset, limit = int(query['offset']), int(query['limit'])
+        rows = [
+            {'links': [], 'variant_sku': f'SKU{i:05d}', 'title': f'Product {i}', 'variant_price': f'{i}.50', 'inventory_qty': '3'}
+            for i in range(offset, min(offset + limit, 2500))
+        ]
+        return 200, {'links': [], 'count': len(rows), 'hasMore': offset + limit < 2500, 'items': rows, 'offset': offset, 'totalResults': 2500}
+
+
+class TestNetSuiteSuiteQL(unittest.TestCase):
+    def setUp(self):
+        SuiteQLStubHandler.statements = []
+        self.server, self.base_url = start_stub_server(SuiteQLStubHandler)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    @patch.dict(os.environ, {'NETSUITE_ACCESS_TOKEN': 'valid_access_token'})
+    def test_fetch_netsuite_products_suiteql_pages_projected_columns(self):
+        columns = {
+            'variant sku': 'item.itemid',
+            'title': 'item.displayname',
+            'variant price': 'item.baseprice',
+            'inventory_qty': 'item.totalquantityonhand',
+        }
+
+        # Act: Fetch through the SuiteQL stub with parallel paging
+        result_df = fetch_netsuite_products_suiteql(api_url=f"{self.base_url}/services/rest/query/v1/suiteql", columns=columns, parallel=True)
+
+        # Assert: Only the projected columns are selected and returned under the mapping's names
+        self.assertEqual(len(SuiteQLStubHandler.statements), 3, "Should request three pages of 1000 rows.")
+        self.assertTrue(SuiteQLStubHandler.statements[0].startswith("SELECT item.itemid AS variant_sku, item.displayname AS title"))
+        self.assertEqual(result_df.columns.tolist(), list(columns))
+        self.assertEqual(len(result_df), 2500)
+        self.assertEqual(result_df['variant sku'].iloc[-1], 'SKU02499')
+        self.assertEqual(result_df['variant price'].iloc[1], 1.5)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,113 @@
+# tests/test_rate_limiter.py
+
+import time
+import unittest
+from adapters.common_adapter import make_request, get_rate_limit_metrics, job_deadline, RateLimiter, DeadlineExceededError
+from adapters.rate_limiter import TokenBucket, DECREASE_FACTOR, HEADROOM
+from benchmarks.stub_server import start_stub_server
+from tests.stub_server import JSONStubHandler
+
+
+class RateLimitedStubHandler(JSONStubHandler):
+    """Answers the first request with 429 and a Retry-After, then succeeds."""
+    requests = 0
+
+    def handle_json(self, method, path, query, body):
+        RateLimitedStubHandler.requests += 1
+        if RateLimitedStubHandler.requests == 1:
+            return 429, {'error': 'rate limited'}
+        return 200, {'ok': True}
+
+    def send_response(self, code, message=None):
+        super().send_response(code, message)
+        if code == 429:
+            self.send_header('Retry-After', '0.3')
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_throttling_cuts_rate_and_success_raises_it(self):
+        bucket = TokenBucket(rate=10.0, min_rate=0.5)
+
+        # Act: The host answers 429
+        bucket.observe(429, {'Retry-After': '0'})
+
+        # Assert: Multiplicative decrease, counted as throttled
+        self.assertAlmostEqual(bucket.rate, 10.0 * DECREASE_FACTOR)
+        self.assertEqual(bucket.metrics()['throttled'], 1)
+
+        # Act / Assert: Successful responses raise the rate additively
+        bucket.observe(200, {})
+        self.assertGreater(bucket.rate, 10.0 * DECREASE_FACTOR)
+
+    def test_quota_headers_set_rate_just_under_the_limit(self):
+        bucket = TokenBucket()
+
+        # Act: 20 calls left in a window resetting in 10 seconds
+        bucket.observe(200, {'X-RateLimit-Remaining': '20', 'X-RateLimit-Reset': '10'})
+
+        # Assert: 2 requests/s with headroom
+        self.assertAlmostEqual(bucket.rate, 2.0 * HEADROOM)
+
+    def test_acquire_paces_requests_to_the_rate(self):
+        bucket = TokenBucket(rate=20.0)
+
+        # Act: Five requests at 20 requests/s, starting with one token
+        started = time.monotonic()
+        for _ in range(5):
+            bucket.acquire()
+
+        # Assert: About 4 / 20 seconds were spent waiting
+        self.assertGreaterEqual(time.monotonic() - started, 0.15)
+
+    def test_acquire_gives_up_when_the_wait_exceeds_max_wait(self):
+        bucket = TokenBucket()
+
+        # Arrange: The host asked for a 60 second pause
+        bucket.observe(429, {'Retry-After': '60'})
+
+        # Act / Assert: Fails at once instead of sleeping
+        started = time.monotonic()
+        with self.assertRaises(TimeoutError):
+            bucket.acquire(max_wait=1)
+        self.assertLess(time.monotonic() - started, 0.5)
+
+    def test_rate_limiter_stops_waiting_at_the_job_deadline(self):
+        limiter = RateLimiter()
+        url = "https://api.zoey.com/v1/products"
+        limiter.bucket(url).observe(429, {'Retry-After': '60'})
+
+        # Act / Assert: A long Retry-After does not hold the worker past the deadline
+        started = time.monotonic()
+        with job_deadline(0.1):
+            with self.assertRaises(DeadlineExceededError):
+                limiter.acquire(url)
+        self.assertLess(time.monotonic() - started, 0.5)
+
+        # Assert: Buckets are keyed like sessions, per scheme and host
+        self.assertIs(limiter.bucket("https://API.zoey.com/v1/products/1"), limiter.bucket(url))
+
+
+class TestRateLimitedRequests(unittest.TestCase):
+    def setUp(self):
+        RateLimitedStubHandler.requests = 0
+        self.server, self.base_url = start_stub_server(RateLimitedStubHandler)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_make_request_retries_429_after_retry_after(self):
+        # Act: The first attempt is rate limited
+        started = time.monotonic()
+        response = make_request("GET", f"{self.base_url}/v1/products")
+
+        # Assert: Retried once after the Retry-After pause, and reported in the metrics
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.attempts, 2)
+        self.assertGreaterEqual(time.monotonic() - started, 0.25)
+        metrics = get_rate_limit_metrics()[self.base_url]
+        self.assertEqual(metrics['throttled'], 1)
+        self.assertEqual(metrics['requests'], 2)
+
+if __name__ == '__main__':
+    unittest.main()
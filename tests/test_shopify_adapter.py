@@ -1,10 +1,15 @@
 # tests/test_shopify_adapter.py
 
+import json
+import os
 import unittest
 from unittest.mock import patch, MagicMock
 import pandas as pd
-from adapters.shopify_adapter import fetch_shopify_data
+from adapters.shopify_adapter import fetch_shopify_data, upload_products, iter_shopify_api_chunks, SHOPIFY_THROTTLE_ATTEMPTS
 from data_mapping.common_mapping import clean_html
+from data_mapping.zoey_mapping import map_output_to_zoey_csv
+from benchmarks.stub_server import start_stub_server
+from tests.stub_server import JSONStubHandler
 
 class TestShopifyAdapter(unittest.TestCase):
 
@@ -17,7 +22,7 @@ class TestShopifyAdapter(unittest.TestCase):
             'variant_price': [10.99, 15.99, None],
             'variant_sku': ['SKU001', 'SKU002', 'SKU003'],
             'title': ['Product A', 'Product B', 'Product C'],
-            'body_(html)': ['<p>Desc A</p>', '<p>Desc B</p>', None],
+            'body_html': ['<p>Desc A</p>', '<p>Desc B</p>', None],
             'variant_inventory_qty': [100, 200, 300]
         }
         mock_df = pd.DataFrame(mock_data)
@@ -47,8 +52,8 @@ class TestShopifyAdapter(unittest.TestCase):
         self.assertIn('variant_sku', result_df.columns, "The 'variant_sku' column should be present after normalization.")
         self.assertEqual(result_df.loc[0, 'variant_price'], 10.99, "Variant Price should be correctly parsed.")
         self.assertEqual(result_df.loc[2, 'variant_price'], 0.0, "Missing Variant Price should be filled with 0.")
-        self.assertEqual(result_df.loc[0, 'body_(html)'], 'Desc A', "HTML tags should be removed from the description.")
-        self.assertEqual(result_df.loc[2, 'body_(html)'], '', "Missing Description should be filled with an empty string.")
+        self.assertEqual(result_df.loc[0, 'body_html'], 'Desc A', "HTML tags should be removed from the description.")
+        self.assertEqual(result_df.loc[2, 'body_html'], '', "Missing Description should be filled with an empty string.")
 
     @patch('adapters.shopify_adapter.pd.read_excel')
     def test_fetch_shopify_data_file_not_found(self, mock_read_excel):
@@ -82,5 +87,178 @@ class TestShopifyAdapter(unittest.TestCase):
         # Assert: Check if the correct error message is logged
         self.assertIn("An error occurred while processing 'Test Shopify Sheet.xlsx': General Error", log.output[0])
 
+
+# Bulk query result: each product line is followed by its variant and image lines
+SHOPIFY_BULK_LINES = [
+    {'id': 'gid://shopify/Product/1', 'handle': 'product-a', 'title': 'Product A', 'descriptionHtml': '<p>Desc A</p>', 'vendor': 'Vendor A', 'productType': 'Type A', 'tags': ['a', 'b']},
+    {'id': 'gid://shopify/ProductVariant/11', 'sku': 'SKU001', 'price': '10.99', 'inventoryQuantity': 5, 'barcode': None, '__parentId': 'gid://shopify/Product/1'},
+    {'id': 'gid://shopify/ProductImage/12', 'url': 'https://cdn.example.com/a.jpg', '__parentId': 'gid://shopify/Product/1'},
+    {'id': 'gid://shopify/ProductVariant/13', 'sku': 'SKU002', 'price': '12.50', 'inventoryQuantity': 0, 'barcode': '123', '__parentId': 'gid://shopify/Product/1'},
+    {'id': 'gid://shopify/Product/2', 'handle': 'product-b', 'title': 'Product B', 'descriptionHtml': '', 'vendor': '', 'productType': '', 'tags': []},
+    {'id': 'gid://shopify/ProductVariant/21', 'sku': 'SKU003', 'price': '7.00', 'inventoryQuantity': 1, 'barcode': None, '__parentId': 'gid://shopify/Product/2'},
+]
+
+
+class ShopifyStubHandler(JSONStubHandler):
+    """
+    Serves the Admin GraphQL calls used by `upload_products`, the staged upload target and the
+    bulk operation result file. The first productSet call is throttled.
+    """
+    calls = []
+    staged_lines = []
+    throttled = False
+
+    def do_POST(self):
+        if self.path == '/staged-upload':
+            # Multipart upload of the JSONL file; keep the product lines for the result file
+            body = self.rfile.read(int(self.headers['Content-Length'])).decode('utf-8')
+            ShopifyStubHandler.staged_lines = [line for line in body.splitlines() if line.startswith('{"input"')]
+            self._send(204, b'')
+            return
+        super().do_POST()
+
+    def do_GET(self):
+        if self.path == '/products.jsonl':
+            self._send(200, '\n'.join(json.dumps(line) for line in SHOPIFY_BULK_LINES).encode('utf-8'))
+            return
+        if self.path == '/results.jsonl':
+            lines = [
+                json.dumps({'data': {'productSet': {'product': {'id': f'gid://shopify/Product/{i}'}, 'userErrors': []}}, '__lineNumber': i})
+                for i, _ in enumerate(ShopifyStubHandler.staged_lines)
+            ]
+            self._send(200, '\n'.join(lines).encode('utf-8'))
+            return
+        super().do_GET()
+
+    def _send(self, status, payload):
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def handle_json(self, method, path, query, body):
+        if path != '/admin/api/2024-10/graphql.json' or self.headers.get('X-Shopify-Access-Token') != 'shpat_test':
+            return 401, {'errors': 'unauthorized'}
+        query_text = body['query']
+        name = query_text.split('{')[0].split('(')[0].split()[-1]
+        self.calls.append(name)
+        base_url = f"http://{self.headers['Host']}"
+
+        if name == 'stagedUploadsCreate':
+            return 200, {'data': {'stagedUploadsCreate': {'userErrors': [], 'stagedTargets': [{
+                'url': f"{base_url}/staged-upload", 'resourceUrl': None,
+                'parameters': [{'name': 'key', 'value': 'tmp/bulk/products.jsonl'}],
+            }]}}}
+        if name == 'bulkOperationRunMutation':
+            assert body['variables']['stagedUploadPath'] == 'tmp/bulk/products.jsonl'
+            return 200, {'data': {'bulkOperationRunMutation': {'userErrors': [], 'bulkOperation': {'id': 'gid://shopify/BulkOperation/1', 'status': 'CREATED'}}}}
+        if name == 'bulkOperationRunQuery':
+            assert 'products' in body['variables']['query']
+            return 200, {'data': {'bulkOperationRunQuery': {'userErrors': [], 'bulkOperation': {'id': 'gid://shopify/BulkOperation/2', 'status': 'CREATED'}}}}
+        if name == 'query':
+            status = 'COMPLETED' if self.calls.count('query') > 1 else 'RUNNING'
+            result_file = '/products.jsonl' if 'type: QUERY' in query_text else '/results.jsonl'
+            return 200, {'data': {'currentBulkOperation': {
+                'id': 'gid://shopify/BulkOperation/1', 'status': status, 'errorCode': None,
+                'objectCount': str(len(ShopifyStubHandler.staged_lines)), 'url': f"{base_url}{result_file}" if status == 'COMPLETED' else None,
+            }}}
+        if name == 'productSet':
+            cost = {'requestedQueryCost': 10, 'throttleStatus': {'maximumAvailable': 1000, 'currentlyAvailable': 990, 'restoreRate': 1000}}
+            if not ShopifyStubHandler.throttled:
+                ShopifyStubHandler.throttled = True
+                cost['throttleStatus']['currentlyAvailable'] = 0
+                return 200, {'errors': [{'message': 'Throttled', 'extensions': {'code': 'THROTTLED'}}], 'extensions': {'cost': cost}}
+            user_errors = [{'field': ['title'], 'message': "Title can't be blank"}] if not body['variables']['input'].get('title') else []
+            return 200, {'data': {'productSet': {'product': {'id': 'gid://shopify/Product/1'}, 'userErrors': user_errors}}, 'extensions': {'cost': cost}}
+        return 400, {'errors': [{'message': f'unexpected operation {name}'}]}
+
+
+@patch.dict(os.environ, {'SHOPIFY_ACCESS_TOKEN': 'shpat_test', 'SHOPIFY_API_VERSION': '2024-10'})
+class TestShopifyUpload(unittest.TestCase):
+    def setUp(self):
+        ShopifyStubHandler.calls = []
+        ShopifyStubHandler.staged_lines = []
+        ShopifyStubHandler.throttled = False
+        self.server, self.store_url = start_stub_server(ShopifyStubHandler)
+        self.products = pd.DataFrame({
+            'title': ['Product A', 'Product B', 'Product C'],
+            'body_(html)': ['Desc A', 'Desc B', ''],
+            'variant_sku': ['SKU001', 'SKU002', 'SKU003'],
+            'variant_price': [10.99, 15.99, 0.0],
+            'tags': ['a, b', '', None],
+        })
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_upload_products_bulk_operation(self):
+        # Act: Three products with a bulk threshold of two
+        success = upload_products(self.products, store_url=self.store_url, bulk_threshold=2, poll_interval=0.01)
+
+        # Assert: Staged, ran and polled a single bulk operation with one JSONL line per product
+        self.assertTrue(success)
+        self.assertEqual(ShopifyStubHandler.calls, ['stagedUploadsCreate', 'bulkOperationRunMutation', 'query', 'query'])
+        first = json.loads(ShopifyStubHandler.staged_lines[0])['input']
+        self.assertEqual(len(ShopifyStubHandler.staged_lines), 3)
+        self.assertEqual(first['title'], 'Product A')
+        self.assertEqual(first['tags'], ['a', 'b'])
+        self.assertEqual(first['variants'][0]['inventoryItem'], {'sku': 'SKU001'})
+        self.assertEqual(first['variants'][0]['price'], '10.99')
+
+    def test_upload_products_concurrent_mutations(self):
+        # Act: Below the bulk threshold, products are sent as individual mutations
+        success = upload_products(self.products, store_url=self.store_url, bulk_threshold=10, concurrency=2)
+
+        # Assert: Every product was sent, the throttled call was retried
+        self.assertTrue(success)
+        self.assertEqual(ShopifyStubHandler.calls, ['productSet'] * 4)
+
+    def test_upload_products_reports_rejected_products(self):
+        # Arrange: A product without a title is rejected by Shopify
+        products = self.products.assign(title=['Product A', None, 'Product C'])
+
+        # Act / Assert: The upload is reported as failed
+        self.assertFalse(upload_products(products, store_url=self.store_url, bulk_threshold=10))
+
+    @patch('adapters.shopify_adapter._throttle_backoff', lambda retry_state: 0)
+    @patch('adapters.shopify_adapter._graphql')
+    def test_throttled_upload_gives_up_after_the_attempt_cap(self, mock_graphql):
+        # Arrange: Shopify keeps throttling and reports no throttle status
+        mock_graphql.return_value = {'errors': [{'message': 'Throttled', 'extensions': {'code': 'THROTTLED'}}]}
+
+        # Act
+        success = upload_products(self.products.head(1), store_url=self.store_url, bulk_threshold=10)
+
+        # Assert: The product is retried a bounded number of times and reported as failed
+        self.assertFalse(success)
+        self.assertEqual(mock_graphql.call_count, SHOPIFY_THROTTLE_ATTEMPTS)
+
+    def test_iter_shopify_api_chunks_reassembles_children(self):
+        # Act: Run the bulk query and stream the result in chunks of two rows
+        chunks = list(iter_shopify_api_chunks(store_url=self.store_url, chunk_size=2, poll_interval=0.01))
+
+        # Assert: One row per variant with its product's fields, in the Excel path's columns
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 1])
+        products = pd.concat(chunks, ignore_index=True)
+        self.assertEqual(products['variant_sku'].tolist(), ['SKU001', 'SKU002', 'SKU003'])
+        self.assertEqual(products['title'].tolist(), ['Product A', 'Product A', 'Product B'])
+        self.assertEqual(products['body_html'].tolist(), ['Desc A', 'Desc A', ''])
+        self.assertEqual(products['variant_price'].tolist(), [10.99, 12.5, 7.0])
+        self.assertEqual(products['image_src'].tolist(), ['https://cdn.example.com/a.jpg'] * 2 + [''])
+        self.assertEqual(ShopifyStubHandler.calls, ['bulkOperationRunQuery', 'query', 'query'])
+
+    def test_bulk_query_rows_map_to_zoey(self):
+        # Arrange: Stream the catalog from the bulk query
+        chunks = list(iter_shopify_api_chunks(store_url=self.store_url, chunk_size=2, poll_interval=0.01))
+
+        # Act: Map the rows the way the Shopify to Zoey sync does
+        zoey_products = map_output_to_zoey_csv(pd.concat(chunks, ignore_index=True))
+
+        # Assert: One description column is read, and every variant is mapped
+        self.assertEqual(zoey_products['sku'].tolist(), ['SKU001', 'SKU002', 'SKU003'])
+        self.assertEqual(zoey_products['description'].tolist(), ['Desc A', 'Desc A', ''])
+        self.assertEqual(zoey_products['name'].tolist(), ['Product A', 'Product A', 'Product B'])
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,61 @@
+# tests/test_sync_state.py
+
+import tempfile
+import unittest
+from datetime import datetime, timezone
+import pandas as pd
+from orchestrator.sync_state import SyncState, DELTA_OVERLAP
+
+class TestSyncState(unittest.TestCase):
+    def test_watermark_round_trip(self):
+        with tempfile.TemporaryDirectory() as state_dir:
+            state = SyncState('netsuite_to_zoey', state_dir=state_dir)
+
+            # Assert: No watermark means a full fetch
+            self.assertIsNone(state.modified_since())
+
+            # Act: Store the start time of a successful run
+            run_started = datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc)
+            state.save_watermark(run_started)
+
+            # Assert: The next delta starts at the watermark minus the overlap
+            self.assertEqual(state.load_watermark(), run_started)
+            self.assertEqual(state.modified_since(), run_started - DELTA_OVERLAP)
+
+    def test_merge_snapshot_replaces_changed_rows(self):
+        with tempfile.TemporaryDirectory() as state_dir:
+            state = SyncState('netsuite_to_zoey', state_dir=state_dir)
+
+            # Arrange: Initial full snapshot
+            state.merge_snapshot(pd.DataFrame({'id': ['1', '2'], 'title': ['Product A', 'Product B']}))
+
+            # Act: Merge a delta changing product 2 and adding product 3
+            delta = pd.DataFrame({'id': ['2', '3'], 'title': ['Product B v2', 'Product C']})
+            merged = state.merge_snapshot(delta)
+
+            # Assert: The snapshot holds one row per product with the latest values, also after reload
+            expected = {'1': 'Product A', '2': 'Product B v2', '3': 'Product C'}
+            self.assertEqual(dict(zip(merged['id'], merged['title'])), expected)
+            reloaded = state.load_snapshot()
+            self.assertEqual(dict(zip(reloaded['id'], reloaded['title'])), expected)
+
+    def test_merge_snapshot_skips_unusable_keys(self):
+        with tempfile.TemporaryDirectory() as state_dir:
+            state = SyncState('netsuite_to_zoey', state_dir=state_dir)
+            state.merge_snapshot(pd.DataFrame({'variant sku': ['SKU1', 'SKU2'], 'title': ['A', 'B']}))
+
+            # Act: A delta keyed by SKU with a blank SKU and a SKU listed twice
+            merged = state.merge_snapshot(pd.DataFrame({
+                'variant sku': [' SKU2', None, 'SKU3', 'SKU3'],
+                'title': ['B v2', 'No SKU', 'C', 'C v2'],
+            }))
+
+            # Assert: Rows are matched on the stripped SKU, the blank one is left out, the last duplicate wins
+            self.assertEqual(merged['title'].tolist(), ['A', 'B v2', 'C v2'])
+
+            # Act / Assert: Rows without any key column leave the snapshot as it is
+            unchanged = state.merge_snapshot(pd.DataFrame({'title': ['Orphan']}))
+            self.assertEqual(unchanged['title'].tolist(), ['A', 'B v2', 'C v2'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+# tests/test_validation.py
+
+import unittest
+import numpy as np
+import pandas as pd
+from data_mapping.validation import REASON_COLUMN, invalid_gtins, validate_products
+
+class TestValidation(unittest.TestCase):
+    def test_invalid_gtins_checks_length_and_check_digit(self):
+        # Arrange: EAN-13, UPC-A, EAN-8 and GTIN-14 with correct and wrong check digits
+        barcodes = pd.Series([
+            '4006381333931', '4006381333932', '036000291452', '96385074', '10012345678902',
+            '', None, '12345', 'ABC1234567890',
+        ])
+
+        # Act / Assert: Empty barcodes pass, malformed ones fail
+        self.assertEqual(invalid_gtins(barcodes).tolist(),
+                         [False, True, False, False, False, False, False, True, True])
+
+    def test_numeric_barcodes_keep_their_check_digit(self):
+        # UPC-A 036000291452 read from Excel as a float loses its leading zero
+        barcodes = pd.Series([36000291452.0, 36000291453.0, np.nan])
+        self.assertEqual(invalid_gtins(barcodes).tolist(), [False, True, False])
+
+    def test_validate_products_quarantines_failing_rows_with_reasons(self):
+        # Arrange: Mapped Zoey products breaking each rule once
+        products = pd.DataFrame({
+            'sku': ['A', 'B', 'B', 'C', 'D', 'E'],
+            'name': ['Tee', 'Hat', 'Cap', ' ', 'Sock', 'Scarf'],
+            'price': [10.0, 5.0, 6.0, 3.0, 0.0, 12.0],
+            'barcode': ['4006381333931', '', '', '', '', '4006381333932'],
+        })
+
+        # Act
+        valid, quarantined = validate_products(products)
+
+        # Assert: Only A is valid; every rejected row says why
+        self.assertEqual(valid['sku'].tolist(), ['A'])
+        self.assertEqual(dict(zip(quarantined['name'], quarantined[REASON_COLUMN])), {
+            'Hat': 'duplicate SKU',
+            'Cap': 'duplicate SKU',
+            ' ': 'empty title',
+            'Sock': 'missing or non-positive price',
+            'Scarf': 'invalid GTIN/EAN barcode check digit',
+        })
+
+    def test_rules_without_their_column_are_skipped(self):
+        products = pd.DataFrame({'sku': ['A', 'B']})
+
+        valid, quarantined = validate_products(products)
+
+        self.assertEqual(len(valid), 2)
+        self.assertTrue(quarantined.empty)
+
+if __name__ == '__main__':
+    unittest.main()
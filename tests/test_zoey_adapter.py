@@ -3,7 +3,13 @@
 import unittest
 from unittest.mock import patch, MagicMock
 import pandas as pd
-from adapters.zoey_adapter import export_to_zoey  # Updated import
+import json
+import os
+import tempfile
+from adapters.common_adapter import APIConnectionError
+from adapters.zoey_adapter import export_to_zoey, export_to_zoey_concurrent, iter_zoey_batches  # Updated import
+from adapters.zoey_index import ZoeyProductIndex
+from data_mapping.zoey_mapping import map_output_to_zoey_csv
 
 class TestZoeyAdapter(unittest.TestCase):  # Renamed class to match the file
     @patch('adapters.zoey_adapter.make_request')  # Updated `make_request` reference
@@ -179,5 +185,165 @@ class TestZoeyAdapter(unittest.TestCase):  # Renamed class to match the file
         # Assert: Function should return False due to HTTP error
         self.assertFalse(success, "Export to Zoey should return False on HTTP error.")
 
+    @patch('adapters.zoey_adapter.make_request')
+    @patch('adapters.zoey_adapter.os.getenv')
+    def test_export_to_zoey_batched(self, mock_getenv, mock_make_request):
+        # Arrange: Mock environment variable and five products with numpy-typed columns
+        mock_getenv.return_value = 'valid_zoey_api_key'
+        df = pd.DataFrame({
+            'Title': [f'Product {i}' for i in range(5)],
+            'SKU': [f'SKU00{i}' for i in range(5)],
+            'Price': [10.0, None, 12.0, 13.0, 14.0],
+            'Inventory Quantity': [1, 2, 3, 4, 5],
+        })
+        mock_make_request.return_value = MagicMock(status_code=200)
+
+        # Act: Export in bulk requests of up to two products
+        success = export_to_zoey(df, batch_size=2)
+
+        # Assert: Three bulk requests to the bulk endpoint, with JSON-serializable payloads
+        self.assertTrue(success)
+        self.assertEqual(mock_make_request.call_count, 3)
+        first_call = mock_make_request.call_args_list[0]
+        self.assertEqual(first_call.args[1], "https://api.zoey.com/v1/products/bulk")
+        products = first_call.kwargs['data']['products']
+        self.assertEqual([p['variants'][0]['sku'] for p in products], ['SKU000', 'SKU001'])
+        self.assertEqual(products[1]['variants'][0]['price'], 0.0, "Missing prices should fall back to the default.")
+        json.dumps(first_call.kwargs['data'])
+
+    def test_iter_zoey_batches_caps_payload_bytes(self):
+        # Arrange: Ten payloads of roughly 100 bytes each
+        payloads = [{'title': 'x' * 80, 'sku': f'SKU{i}'} for i in range(10)]
+
+        # Act: Batch with a high count cap but a 350-byte size cap
+        batches = list(iter_zoey_batches(payloads, max_products=100, max_bytes=350))
+
+        # Assert: Every batch stays under the byte cap and no product is lost
+        self.assertEqual(sum(len(batch) for batch in batches), 10)
+        for batch in batches:
+            self.assertLessEqual(len(json.dumps(batch)), 350)
+
+    @patch('adapters.zoey_adapter.make_request')
+    @patch('adapters.zoey_adapter.os.getenv')
+    def test_export_to_zoey_concurrent_continues_past_failures(self, mock_getenv, mock_make_request):
+        # Arrange: Five products; SKU001 gets a 400 and SKU003 fails after all retries
+        mock_getenv.return_value = 'valid_zoey_api_key'
+        df = pd.DataFrame({
+            'Title': [f'Product {i}' for i in range(5)],
+            'SKU': [f'SKU00{i}' for i in range(5)],
+            'Price': [10.0, 11.0, 12.0, 13.0, 14.0],
+        })
+
+        def respond(method, url, headers=None, data=None):
+            sku = data['variants'][0]['sku']
+            if sku == 'SKU001':
+                return MagicMock(status_code=400, text='Bad Request', attempts=1)
+            if sku == 'SKU003':
+                err = APIConnectionError("Failed to establish a new connection.")
+                err.attempts = 3
+                raise err
+            return MagicMock(status_code=201, attempts=2 if sku == 'SKU004' else 1)
+        mock_make_request.side_effect = respond
+
+        # Act: Export with a pool of workers
+        result = export_to_zoey_concurrent(df, concurrency=3)
+
+        # Assert: Every product was attempted and the outcome is reported per row
+        self.assertEqual(mock_make_request.call_count, 5)
+        self.assertFalse(result.success)
+        self.assertEqual(result.skus, df['SKU'].tolist())
+        self.assertEqual(sorted(result.succeeded), [0, 2, 4])
+        self.assertEqual(sorted(result.failed), [1, 3])
+        self.assertIn('400', result.failed[1])
+        self.assertEqual(result.retries[3], 2)
+        self.assertEqual(result.retries[4], 1)
+        self.assertEqual(set(result.latencies), set(range(5)))
+
+        # Failed rows can be saved and loaded again for a re-drive
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            failed_file = os.path.join(tmp_dir, 'failed.csv')
+            self.assertEqual(result.save_failed_products(df, failed_file), 2)
+            saved = pd.read_csv(failed_file)
+        self.assertEqual(saved['SKU'].tolist(), ['SKU001', 'SKU003'])
+        self.assertIn('export_error', saved.columns)
+
+    @patch('adapters.zoey_adapter.make_request')
+    @patch('adapters.zoey_adapter.os.getenv')
+    def test_failed_products_are_told_apart_without_a_sku(self, mock_getenv, mock_make_request):
+        # Arrange: Two products without a SKU; Zoey rejects only the second one
+        mock_getenv.return_value = 'valid_zoey_api_key'
+        df = pd.DataFrame({'Title': ['Product A', 'Product B'], 'SKU': ['', '']})
+        mock_make_request.side_effect = lambda method, url, headers=None, data=None: (
+            MagicMock(status_code=400, text='Bad Request') if data['title'] == 'Product B' else MagicMock(status_code=201)
+        )
+
+        # Act
+        result = export_to_zoey_concurrent(df, concurrency=1)
+
+        # Assert: Only the rejected product is kept for the re-drive
+        self.assertEqual(result.succeeded, [0])
+        self.assertEqual(list(result.failed), [1])
+        failed = result.failed_products(df, with_errors=True)
+        self.assertEqual(failed['Title'].tolist(), ['Product B'])
+        self.assertEqual(failed['export_error'].tolist(), ['400 - Bad Request'])
+
+    @patch('adapters.zoey_adapter.make_request')
+    @patch('adapters.zoey_adapter.os.getenv')
+    def test_export_to_zoey_routes_known_skus_to_update(self, mock_getenv, mock_make_request):
+        # Arrange: SKU001 is already in Zoey, SKU002 is new
+        mock_getenv.return_value = 'valid_zoey_api_key'
+        df = pd.DataFrame({'Title': ['Product A', 'Product B'], 'SKU': ['SKU001', 'SKU002']})
+        mock_make_request.side_effect = [
+            MagicMock(status_code=200),
+            MagicMock(status_code=201, json=MagicMock(return_value={'id': 202})),
+        ]
+
+        with tempfile.TemporaryDirectory() as state_dir:
+            index = ZoeyProductIndex(os.path.join(state_dir, 'zoey_index.sqlite'))
+            index.update({'SKU001': 101})
+
+            # Act: Export with the index
+            success = export_to_zoey(df, index=index)
+
+            # Assert: Known SKU updated in place, new SKU created and its ID recorded
+            self.assertTrue(success)
+            calls = [call.args[:2] for call in mock_make_request.call_args_list]
+            self.assertEqual(calls, [
+                ("PUT", "https://api.zoey.com/v1/products/101"),
+                ("POST", "https://api.zoey.com/v1/products"),
+            ])
+            self.assertEqual(index.lookup(['SKU002']), {'SKU002': '202'})
+            index.close()
+
+    @patch('adapters.zoey_adapter.make_request')
+    @patch('adapters.zoey_adapter.os.getenv')
+    def test_mapped_netsuite_products_route_by_sku(self, mock_getenv, mock_make_request):
+        # Arrange: NetSuite items carry the SKU as 'variant sku'; SKU001 is already in Zoey, one item has no SKU
+        mock_getenv.return_value = 'valid_zoey_api_key'
+        netsuite_df = pd.DataFrame({'title': ['Product A', 'Product B'], 'variant sku': ['SKU001', None], 'variant price': [10.0, 20.0]})
+        zoey_df = map_output_to_zoey_csv(netsuite_df, lazy=True)
+        mock_make_request.side_effect = [
+            MagicMock(status_code=200),
+            MagicMock(status_code=201, json=MagicMock(return_value={'id': 202})),
+        ]
+
+        with tempfile.TemporaryDirectory() as state_dir:
+            index = ZoeyProductIndex(os.path.join(state_dir, 'zoey_index.sqlite'))
+            index.update({'SKU001': 101})
+
+            # Act
+            success = export_to_zoey(zoey_df, index=index)
+
+            # Assert: The known SKU is updated, the product without SKU is created and not indexed
+            self.assertTrue(success)
+            calls = [call.args[:2] for call in mock_make_request.call_args_list]
+            self.assertEqual(calls, [
+                ("PUT", "https://api.zoey.com/v1/products/101"),
+                ("POST", "https://api.zoey.com/v1/products"),
+            ])
+            self.assertEqual(mock_make_request.call_args_list[0].kwargs['data']['variants'][0]['sku'], 'SKU001')
+            self.assertEqual(len(index), 1)
+            index.close()
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,34 @@
+# tests/test_zoey_index.py
+
+import os
+import tempfile
+import unittest
+import pandas as pd
+from adapters.zoey_index import ZoeyProductIndex
+
+class TestZoeyProductIndex(unittest.TestCase):
+    def test_seed_update_and_lookup(self):
+        with tempfile.TemporaryDirectory() as state_dir:
+            index = ZoeyProductIndex(os.path.join(state_dir, 'zoey_index.sqlite'))
+
+            # Assert: A missing index answers lookups without creating the file
+            self.assertEqual(index.lookup(['SKU001']), {})
+            self.assertEqual(len(index), 0)
+
+            # Act: Seed from a Zoey listing where the SKU is nested in the variants
+            listing = pd.DataFrame({
+                'id': [101, 102],
+                'variants': [[{'sku': 'SKU001'}], [{'sku': 'SKU002'}]],
+            })
+            self.assertEqual(index.seed(listing), 2)
+            index.update({'SKU003': 103, 'SKU001': 111})
+
+            # Assert: IDs survive reopening the index and later updates win
+            index.close()
+            reopened = ZoeyProductIndex(index.path)
+            self.assertEqual(reopened.lookup(['SKU001', 'SKU003', 'SKU404']), {'SKU001': '111', 'SKU003': '103'})
+            self.assertEqual(len(reopened), 3)
+            reopened.close()
+
+if __name__ == '__main__':
+    unittest.main()
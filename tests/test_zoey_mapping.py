@@ -0,0 +1,106 @@
+# tests/test_zoey_mapping.py
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+import pandas as pd
+from data_mapping.zoey_mapping import (
+    ZOEY_CSV_SPEC, fetch_data_from_zoey, map_output_to_zoey_csv, write_zoey_csv_from_chunks, write_zoey_data_to_csv,
+)
+from benchmarks.stub_server import start_stub_server
+from tests.stub_server import JSONStubHandler
+
+
+class ZoeyListingStubHandler(JSONStubHandler):
+    """Serves a 250-product Zoey listing, paged by 'page' and 'limit'."""
+    pages = []
+
+    def handle_json(self, method, path, query, body):
+        if method != 'GET' or path != '/v1/products':
+            return 400, {'error': 'bad request'}
+        page, limit = int(query['page']), int(query['limit'])
+        self.pages.append(page)
+        products = [
+            {'id': i, 'title': f'Product {i}', 'variants': [{'sku': f'SKU{i:04d}', 'price': i}]}
+            for i in range((page - 1) * limit, min(page * limit, 250))
+        ]
+        return 200, products
+
+
+@patch('data_mapping.zoey_mapping.ZOEY_API_KEY', 'valid_zoey_api_key')
+class TestZoeyListing(unittest.TestCase):
+    def setUp(self):
+        ZoeyListingStubHandler.pages = []
+        self.server, base_url = start_stub_server(ZoeyListingStubHandler)
+        self.api_url = f"{base_url}/v1/products"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_fetch_data_from_zoey_pages_in_parallel(self):
+        # Act: Fetch 100 products per page with three pages in flight
+        zoey_df = fetch_data_from_zoey(api_url=self.api_url, page_size=100, parallel=True, max_in_flight=3)
+
+        # Assert: Every product is returned once, in page order, and the walk stopped at the short page
+        self.assertEqual(len(zoey_df), 250)
+        self.assertEqual(zoey_df['id'].tolist(), list(range(250)))
+        self.assertEqual(zoey_df['variants'].iloc[-1], [{'sku': 'SKU0249', 'price': 249}])
+        self.assertLessEqual(max(ZoeyListingStubHandler.pages), 5)
+
+    def test_write_zoey_data_to_csv_streams_pages(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output_file = os.path.join(tmp_dir, 'zoey_exported_data.csv')
+
+            # Act: Stream the listing to CSV one page at a time
+            rows = write_zoey_data_to_csv(output_file, api_url=self.api_url, page_size=100)
+
+            # Assert: One header and every product, fetched sequentially
+            written = pd.read_csv(output_file)
+        self.assertEqual(rows, 250)
+        self.assertEqual(written['title'].tolist(), [f'Product {i}' for i in range(250)])
+        self.assertEqual(ZoeyListingStubHandler.pages, [1, 2, 3])
+
+
+class TestZoeyImportCsv(unittest.TestCase):
+    @staticmethod
+    def source_chunk(start, rows):
+        return pd.DataFrame({
+            'SKU': [f"SKU{i:04d}" for i in range(start, start + rows)],
+            'Title': [f"Product {i}" for i in range(start, start + rows)],
+            'Body (HTML)': [f"<p>Description {i}</p>" for i in range(start, start + rows)],
+            'Variant Price': [float(i) for i in range(start, start + rows)],
+        })
+
+    def test_write_zoey_csv_from_chunks_matches_the_full_mapping(self):
+        chunks = [self.source_chunk(0, 3), self.source_chunk(3, 0), self.source_chunk(3, 2)]
+        expected = map_output_to_zoey_csv(pd.concat([self.source_chunk(0, 3), self.source_chunk(3, 2)], ignore_index=True))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            output_file = os.path.join(tmp, 'zoey_import.csv')
+
+            # Act: Write the chunks one by one
+            rows = write_zoey_csv_from_chunks(iter(chunks), output_file)
+
+            # Assert: Zoey's column order, one header, same values as mapping everything at once
+            written = pd.read_csv(output_file, keep_default_na=False)
+            self.assertEqual(rows, 5)
+            self.assertEqual(written.columns.tolist(), [field.target for field in ZOEY_CSV_SPEC])
+            self.assertEqual(written['sku'].tolist(), expected['sku'].tolist())
+            self.assertEqual(written['description'].tolist(), expected['description'].tolist())
+            self.assertEqual(written['visibility'].tolist(), [4] * 5)
+
+    def test_write_zoey_csv_from_chunks_keeps_no_partial_file(self):
+        def failing_chunks():
+            yield self.source_chunk(0, 2)
+            raise ConnectionError("source went away")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            output_file = os.path.join(tmp, 'zoey_import.csv')
+            with self.assertRaises(ConnectionError):
+                write_zoey_csv_from_chunks(failing_chunks(), output_file)
+            self.assertEqual(os.listdir(tmp), [])
+
+if __name__ == '__main__':
+    unittest.main()